@@ -0,0 +1,355 @@
+import argparse
+import json
+import logging
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+import routing_alg.routing as routing
+from log_config import get_logger
+from main import rng_streams
+from network import reset_id_managers
+from networks import generated_network
+from routing_alg import wcett_lb_post, wcett_lb_pre
+from routing_alg.wcett_lb import get_metrics
+
+logger = get_logger("benchmark")
+
+SIZES = (25, 100, 400, 1600) # backbone nodes of the topology ladder
+TOPOLOGY_KINDS = ('grid', 'geometric', 'scalefree')
+TICK_NODES = 8 # routers sampled per congestion or update_path tick
+DEFAULT_TOLERANCE = 0.25 # allowed slowdown against the baseline before a case is a regression
+# Report settings that must match the baseline's for the timings to be comparable
+COMPARABLE_META = ('kind', 'seed', 'igw_count', 'tick_nodes', 'repeat')
+
+ROUTING_CLASSES = {
+    'hop': routing.HopCountRouting,
+    'wcett': routing.WCETTRouting,
+    'wcett_lb_post': routing.WCETT_LB_POSTRouting,
+    'wcett_lb_pre': routing.WCETT_LB_PRERouting
+}
+# Periodic per-node functions of the load-balancing algorithms: (congestion check, path update)
+TICK_FUNCTIONS = {
+    'wcett_lb_post': (wcett_lb_post.update_congest_status, wcett_lb_post.update_path),
+    'wcett_lb_pre': (wcett_lb_pre.predict_congestion, wcett_lb_pre.update_path)
+}
+
+def topology_spec(kind, size, igw_count):
+    """
+    Args:
+        kind (str): Generator name, see TOPOLOGY_KINDS
+        size (int): Number of backbone nodes, rounded to a square for grids
+        igw_count (int): Number of gateways
+
+    Returns:
+        str: Topology spec for generated_network.build_topology
+    """
+    if kind == 'grid':
+        side = max(2, round(math.sqrt(size)))
+        return f"grid:{side}x{side},igw={igw_count}"
+    return f"{kind}:{size},igw={igw_count}"
+
+def build_network(spec, seed):
+    """Build a fresh generated network, identical for the same spec and seed"""
+    reset_id_managers()
+    rngs = rng_streams(seed)
+    return generated_network.build_topology(spec, rngs['topology'], rngs['topology'], rngs['link_loss'])
+
+def gateway_ids(nw):
+    return [node_id for node_id, node in nw.nodes.items() if node.type == "IGW"]
+
+class Case:
+    def __init__(self, name, algorithm, kind):
+        """
+        One benchmarked operation.
+
+        Args:
+            name (str): Name of the case in the results, "<algorithm>/<kind>"
+            algorithm (str): Key in ROUTING_CLASSES
+            kind (str): 'tables', 'link_event', 'congestion_tick' or 'update_path_tick'
+        """
+        self.name = name
+        self.algorithm = algorithm
+        self.kind = kind
+
+    def setup(self, spec, seed):
+        """
+        Build the network the case runs on.
+
+        Returns:
+            tuple: (network, routing algorithm instance)
+        """
+        nw = build_network(spec, seed)
+        routing_alg = ROUTING_CLASSES[self.algorithm]()
+        nw.routing_algorithm = routing_alg
+        if self.kind != 'tables':
+            routing_alg.compute_routing_tables(nw, gateway_ids(nw))
+        return nw, routing_alg
+
+    def run(self, nw, routing_alg):
+        """
+        Run the operation once.
+
+        Returns:
+            int: Number of operations done, nodes for ticks, link events, or 1 for a table construction
+        """
+        if self.kind == 'tables':
+            routing_alg.compute_routing_tables(nw, gateway_ids(nw))
+            return 1
+        if self.kind == 'link_event':
+            # Take the first link of a sample of routers down and up again, repairing the routes each time
+            routers = [node for node in nw.nodes.values() if node.type == "MR"][:TICK_NODES]
+            for node in routers:
+                edge = nw.get_edge_between_nodes(node.id, node.neighbors[0])
+                nw.link_down(edge)
+                nw.link_up(edge)
+            return 2 * len(routers)
+
+        congestion_check, update_path = TICK_FUNCTIONS[self.algorithm]
+        routers = [node for node in nw.nodes.values() if node.type == "MR"][:TICK_NODES]
+        # Every tick starts from a new snapshot, as CongestionMonitor.tick does
+        get_metrics(routing_alg, nw).refresh()
+        if self.kind == 'congestion_tick':
+            for node in routers:
+                congestion_check(node, nw, routing_alg)
+        else:
+            for node in routers:
+                # A fresh report from a neighbour makes update_path reconsider every path
+                node.receive_wcett_lb_update(node.neighbors[0], [])
+                for dest_id in list(node.routing_table):
+                    update_path(node, nw, dest_id, routing_alg)
+        return len(routers)
+
+def all_cases():
+    """Return every benchmarked case, table construction and link events for all algorithms and ticks for WCETT-LB"""
+    cases = [Case(f"{algorithm}/tables", algorithm, 'tables') for algorithm in ROUTING_CLASSES]
+    cases += [Case(f"{algorithm}/link_event", algorithm, 'link_event') for algorithm in ROUTING_CLASSES]
+    for algorithm in TICK_FUNCTIONS:
+        cases.append(Case(f"{algorithm}/congestion_tick", algorithm, 'congestion_tick'))
+        cases.append(Case(f"{algorithm}/update_path_tick", algorithm, 'update_path_tick'))
+    return cases
+
+def measure(case, spec, seed, repeat):
+    """
+    Time a case on one topology.
+
+    Table constructions run on a freshly built network every time, since the WCETT-LB
+    penalties depend on the tables already installed. Ticks reuse one network, whose
+    setup includes building the tables. The fastest run is reported. Peak memory is
+    measured in a separate run, tracemalloc slows the code down.
+
+    Returns:
+        dict: nodes, edges, setup_seconds, seconds per run, ops_per_sec and peak_kib
+    """
+    start = time.perf_counter()
+    nw, routing_alg = case.setup(spec, seed)
+    setup_seconds = time.perf_counter() - start
+
+    best = math.inf
+    for i in range(repeat):
+        if i and case.kind == 'tables':
+            nw, routing_alg = case.setup(spec, seed)
+        start = time.perf_counter()
+        ops = case.run(nw, routing_alg)
+        best = min(best, time.perf_counter() - start)
+
+    if case.kind == 'tables':
+        nw, routing_alg = case.setup(spec, seed)
+    tracemalloc.start()
+    case.run(nw, routing_alg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'nodes': len(nw.nodes),
+        'edges': len(nw.edges),
+        'setup_seconds': setup_seconds,
+        'seconds': best,
+        'ops_per_sec': ops / best if best > 0 else math.inf,
+        'peak_kib': peak / 1024
+    }
+
+def scaling_exponent(points):
+    """
+    Least-squares slope of log(seconds) over log(nodes), t ~ nodes^k.
+
+    Args:
+        points (list): (nodes, seconds) pairs
+
+    Returns:
+        float: The exponent k, or None with fewer than two points
+    """
+    points = [(math.log(n), math.log(s)) for n, s in points if n > 0 and s > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+def run_benchmarks(sizes=SIZES, kind='grid', igw_count=2, seed=1, repeat=3, budget=10.0, cases=None):
+    """
+    Run every case over the topology ladder.
+
+    A case stops climbing the ladder once the setup or a run of its next size is
+    expected to take longer than the budget, extrapolated from the exponent seen so far.
+
+    Args:
+        sizes (tuple, optional): Backbone node counts of the ladder. Defaults to SIZES.
+        kind (str, optional): Topology generator. Defaults to 'grid'.
+        igw_count (int, optional): Gateways per topology. Defaults to 2.
+        seed (int, optional): Seed of the generated topologies. Defaults to 1.
+        repeat (int, optional): Timed runs per size, the fastest counts. Defaults to 3.
+        budget (float, optional): Seconds a setup or run may take. Defaults to 10.0.
+        cases (list, optional): Case names to run. Defaults to all cases.
+
+    Returns:
+        dict: JSON-serialisable report with 'meta', 'results' and 'scaling'
+    """
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'kind': kind,
+            'sizes': list(sizes),
+            'igw_count': igw_count,
+            'seed': seed,
+            'repeat': repeat,
+            'tick_nodes': TICK_NODES,
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        'results': {},
+        'scaling': {}
+    }
+    for case in all_cases():
+        if cases and case.name not in cases:
+            continue
+        results = report['results'][case.name] = {}
+        points = []
+        costs = [] # (nodes, seconds of the setup or a run, whichever is longer)
+        for i, size in enumerate(sizes):
+            spec = topology_spec(kind, size, igw_count)
+            if costs:
+                exponent = scaling_exponent(costs[-2:]) if len(costs) >= 2 else 1.0
+                expected = costs[-1][1] * (size / sizes[i - 1]) ** max(exponent or 1.0, 1.0)
+                if expected > budget:
+                    logger.info(f"{case.name}: skipping {spec} and larger, expected {expected:.1f}s > {budget}s budget")
+                    break
+            result = measure(case, spec, seed, repeat)
+            results[str(size)] = result
+            points.append((result['nodes'], result['seconds']))
+            costs.append((result['nodes'], max(result['seconds'], result['setup_seconds'])))
+            logger.info(f"{case.name} {spec}: {result['seconds']*1000:.2f} ms, "
+                        f"{result['ops_per_sec']:.1f} ops/s, peak {result['peak_kib']:.0f} KiB")
+        report['scaling'][case.name] = scaling_exponent(points)
+    return report
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare a report against a stored baseline.
+
+    Only (case, size) pairs present in both are compared, and only if both were
+    run with the same COMPARABLE_META settings.
+
+    Args:
+        report (dict): Output of run_benchmarks
+        baseline (dict): Earlier output of run_benchmarks
+        tolerance (float, optional): Allowed relative increase in seconds or peak memory.
+            Defaults to DEFAULT_TOLERANCE.
+
+    Returns:
+        list: One dict per regression with case, size, metric, baseline, current and ratio
+
+    Raises:
+        ValueError: If the report and the baseline were run with different settings
+    """
+    meta = report.get('meta', {})
+    baseline_meta = baseline.get('meta', {})
+    mismatches = [f"{key} {baseline_meta.get(key)!r} → {meta.get(key)!r}"
+                  for key in COMPARABLE_META if meta.get(key) != baseline_meta.get(key)]
+    if mismatches:
+        raise ValueError(f"Report is not comparable with the baseline: {', '.join(mismatches)}")
+
+    regressions = []
+    for case, results in report['results'].items():
+        for size, result in results.items():
+            old = baseline.get('results', {}).get(case, {}).get(size)
+            if old is None:
+                continue
+            for metric in ('seconds', 'peak_kib'):
+                if old[metric] > 0 and result[metric] > old[metric] * (1 + tolerance):
+                    regressions.append({
+                        'case': case,
+                        'size': size,
+                        'metric': metric,
+                        'baseline': old[metric],
+                        'current': result[metric],
+                        'ratio': result[metric] / old[metric]
+                    })
+    return regressions
+
+def main():
+    """
+    Command line entry point. Exits with status 1 if a regression against the baseline is found.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark routing table construction and WCETT-LB ticks')
+    parser.add_argument('-k', '--kind', choices=TOPOLOGY_KINDS, default='grid',
+                        help='Topology generator of the ladder (default: grid)')
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=list(SIZES),
+                        help=f'Backbone node counts of the ladder (default: {" ".join(map(str, SIZES))})')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='Timed runs per size, the fastest counts (default: 3)')
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help='Seconds a setup or run may take before larger sizes are skipped (default: 10)')
+    parser.add_argument('-c', '--case', action='append', dest='cases',
+                        help='Only run this case, e.g. wcett/tables (repeatable)')
+    parser.add_argument('-s', '--seed', type=int, default=1,
+                        help='Seed of the generated topologies (default: 1)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Write the JSON report to this file (default: stdout)')
+    parser.add_argument('--baseline', default=None,
+                        help='JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed relative slowdown against the baseline (default: {DEFAULT_TOLERANCE})')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s | %(message)s')
+    # The algorithms log every path switch and missing alternative, which would swamp the timings
+    for name in ('lb_post', 'lb_pre', 'network'):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    report = run_benchmarks(args.sizes, args.kind, seed=args.seed, repeat=args.repeat,
+                            budget=args.budget, cases=args.cases)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare(report, baseline, args.tolerance)
+        except ValueError as e:
+            logger.error(f"{e}, rerun with the baseline's settings")
+            sys.exit(2)
+        report['regressions'] = regressions
+        for r in regressions:
+            logger.warning(f"Regression in {r['case']} at {r['size']} nodes: {r['metric']} "
+                           f"{r['baseline']:.4g} → {r['current']:.4g} ({r['ratio']:.2f}x)")
+        if not regressions:
+            logger.info(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Benchmark report saved to {args.output}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
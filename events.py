@@ -0,0 +1,105 @@
+import heapq
+
+class Event:
+    def __init__(self, time, callback, args):
+        """A callback scheduled to run at a point in virtual time
+
+        Args:
+            time (float): Virtual time at which the event fires
+            callback (callable): Function to call when the event fires
+            args (tuple): Positional arguments passed to the callback
+        """
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"Event(time={self.time:.4f}, callback={getattr(self.callback, '__name__', self.callback)})"
+
+    def cancel(self):
+        """Prevent the event from firing. Cancelled events are skipped when popped.
+        """
+        self.cancelled = True
+
+class EventScheduler:
+    def __init__(self, start_time=0.0):
+        """Initialize a discrete-event scheduler with a virtual clock
+
+        Events are kept in a binary heap ordered by (time, sequence number), so
+        events scheduled for the same instant fire in the order they were added.
+
+        Args:
+            start_time (float, optional): Initial value of the virtual clock. Defaults to 0.0.
+        """
+        self._now = start_time
+        self._queue = []
+        self._seq = 0
+        self.events_processed = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def now(self):
+        """Return the current virtual time in seconds
+
+        Returns:
+            float: Current virtual time
+        """
+        return self._now
+
+    def schedule(self, delay, callback, *args):
+        """Schedule a callback to run after a delay in virtual time
+
+        Args:
+            delay (float): Delay in seconds from the current virtual time
+            callback (callable): Function to call when the event fires
+            *args: Positional arguments passed to the callback
+
+        Returns:
+            Event: Handle that can be used to cancel the event
+        """
+        return self.schedule_at(self._now + max(delay, 0.0), callback, *args)
+
+    def schedule_at(self, time, callback, *args):
+        """Schedule a callback to run at an absolute virtual time
+
+        Args:
+            time (float): Virtual time at which the event fires. Times in the past fire immediately.
+            callback (callable): Function to call when the event fires
+            *args: Positional arguments passed to the callback
+
+        Returns:
+            Event: Handle that can be used to cancel the event
+        """
+        event = Event(max(time, self._now), callback, args)
+        heapq.heappush(self._queue, (event.time, self._seq, event))
+        self._seq += 1
+        return event
+
+    def run(self, until=None):
+        """Process events in time order
+
+        Args:
+            until (float, optional): Stop before processing events later than this
+                virtual time and advance the clock to it. Defaults to None (run until
+                no events remain).
+
+        Returns:
+            int: Number of events processed during this call
+        """
+        processed = 0
+        while self._queue:
+            time, _, event = self._queue[0]
+            if until is not None and time > until:
+                break
+            heapq.heappop(self._queue)
+            if event.cancelled:
+                continue
+            self._now = time
+            event.callback(*event.args)
+            processed += 1
+        if until is not None and until > self._now:
+            self._now = until
+        self.events_processed += processed
+        return processed
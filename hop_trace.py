@@ -0,0 +1,260 @@
+import argparse
+import math
+import os
+import re
+import threading
+
+import numpy as np
+
+from log_config import get_logger, setup_logging
+
+logger = get_logger("hop_trace")
+
+MAGIC = b'HOPTRACE'
+VERSION = 1
+# One fixed-width record per hop of a DATA packet, times in network clock seconds, NaN when not reached
+HOP_RECORD = np.dtype([
+    ('packet', '<i8'),
+    ('hop', '<i2'), # index of the hop on the packet's route, 0 for the first
+    ('src', '<i4'),
+    ('dest', '<i4'),
+    ('attempt', '<f8'), # first send attempt
+    ('tx_start', '<f8'), # start of the transmission that got through
+    ('tx_end', '<f8'),
+    ('enqueue', '<f8'), # accepted into the receiver's queue
+    ('dequeue', '<f8'), # taken from the queue for service
+    ('ack', '<f8'), # ACK received by the sender, NaN if it timed out
+    ('done', '<f8'), # sender moved on, after the ACK, its timeout or giving up
+    ('retries', '<u1'), # failed attempts
+    ('losses', '<u1'), # failed attempts lost on the link
+    ('delivered', '?') # False if the hop gave up after MAX_SEND_TRIES
+])
+HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('record_size', '<u4')])
+FLUSH_RECORDS = 4096 # hop records buffered before a bulk write
+STAGES = ('retry', 'transmission', 'queueing', 'ack_wait')
+
+class HopRecord:
+    __slots__ = ('packet', 'hop', 'src', 'dest', 'attempt', 'tx_start', 'tx_end', 'enqueue', 'dequeue',
+                 'ack', 'done', 'retries', 'losses')
+
+    def __init__(self, packet, hop, src, dest, attempt):
+        """Timestamps of one hop of a packet while it is in flight
+
+        Args:
+            packet (int): ID of the packet
+            hop (int): Index of the hop on the packet's route
+            src (int): ID of the sending node
+            dest (int): ID of the receiving node
+            attempt (float): Time of the first send attempt
+        """
+        self.packet = packet
+        self.hop = hop
+        self.src = src
+        self.dest = dest
+        self.attempt = attempt
+        self.tx_start = self.tx_end = self.enqueue = self.dequeue = self.ack = self.done = math.nan
+        self.retries = 0
+        self.losses = 0
+
+    def failed(self, reason):
+        """Count a failed send attempt
+
+        Args:
+            reason (str): Failure reason of the attempt
+        """
+        self.retries += 1
+        if reason == 'packet_loss':
+            self.losses += 1
+
+class HopTrace:
+    def __init__(self, path):
+        """Binary trace file of the hops of every DATA packet of a run
+
+        Records are buffered and written in bulk as HOP_RECORD rows after a
+        HEADER, so the file is read back with numpy.fromfile (see read_trace).
+
+        Args:
+            path (str): File to write
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.records = 0
+        self.file = open(path, 'wb')
+        np.array([(MAGIC, VERSION, HOP_RECORD.itemsize)], dtype=HEADER).tofile(self.file)
+
+    def begin(self, packet, src_id, dest_id, time):
+        """Start tracing a hop, the record travels with the packet until finish()
+
+        Args:
+            packet (Packet): The DATA packet
+            src_id (int): ID of the sending node
+            dest_id (int): ID of the receiving node
+            time (float): Time of the first send attempt
+
+        Returns:
+            HopRecord: The record of the hop
+        """
+        packet.trace = HopRecord(packet.id, len(packet.route_taken) - 1, src_id, dest_id, time)
+        return packet.trace
+
+    def finish(self, packet, time, delivered=True):
+        """Close the current hop of a packet and queue its record for writing
+
+        Args:
+            packet (Packet): The DATA packet
+            time (float): Time the sender moved on
+            delivered (bool, optional): False if the hop gave up. Defaults to True.
+        """
+        hop = packet.trace
+        if hop is None:
+            return
+        packet.trace = None
+        row = (hop.packet, hop.hop, hop.src, hop.dest, hop.attempt, hop.tx_start, hop.tx_end, hop.enqueue,
+               hop.dequeue, hop.ack, time, min(hop.retries, 255), min(hop.losses, 255), delivered)
+        with self.lock:
+            if self.file is None:
+                # Hops still in flight after the run was closed
+                return
+            self.buffer.append(row)
+            if len(self.buffer) >= FLUSH_RECORDS:
+                self.flush()
+
+    def flush(self):
+        """Write the buffered records, the caller holds the lock"""
+        if self.buffer:
+            np.array(self.buffer, dtype=HOP_RECORD).tofile(self.file)
+            self.records += len(self.buffer)
+            self.buffer = []
+
+    def close(self):
+        """Write the remaining records and close the file
+
+        Returns:
+            int: Number of records in the file
+        """
+        with self.lock:
+            if self.file is None:
+                return self.records
+            self.flush()
+            self.file.close()
+            self.file = None
+        logger.info(f"Hop trace: {self.records} hop records saved to {self.path}")
+        return self.records
+
+def read_trace(path):
+    """Load the records of a trace file
+
+    Args:
+        path (str): File written by HopTrace
+
+    Returns:
+        numpy.ndarray: HOP_RECORD rows
+    """
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if not len(header) or header[0]['magic'] != MAGIC:
+        raise ValueError(f"{path} is not a hop trace file")
+    if header[0]['version'] != VERSION or header[0]['record_size'] != HOP_RECORD.itemsize:
+        raise ValueError(f"{path} has hop trace version {header[0]['version']}, expected {VERSION}")
+    return np.fromfile(path, dtype=HOP_RECORD, offset=HEADER.itemsize)
+
+def stage_times(records):
+    """Split the duration of every hop into its stages
+
+    retry: first attempt until the transmission that got through.
+    transmission: putting the packet on the link.
+    queueing: waiting in the receiver's queue.
+    ack_wait: service at the receiver and the ACK back, or waiting out the ACK timeout.
+
+    Args:
+        records (numpy.ndarray): HOP_RECORD rows
+
+    Returns:
+        dict: Stage name -> seconds per hop, 0 where a hop did not reach the stage
+    """
+    records = records[records['delivered']]
+    # Without a dequeue the hop waited from the end of the transmission to its ACK timeout
+    dequeue = np.where(np.isnan(records['dequeue']), records['tx_end'], records['dequeue'])
+    enqueue = np.where(np.isnan(records['enqueue']), dequeue, records['enqueue'])
+    stages = {
+        'retry': records['tx_start'] - records['attempt'],
+        'transmission': records['tx_end'] - records['tx_start'],
+        'queueing': dequeue - enqueue,
+        'ack_wait': records['done'] - dequeue
+    }
+    return {stage: np.nan_to_num(np.maximum(seconds, 0.0)) for stage, seconds in stages.items()}
+
+def breakdown(records):
+    """Summarise where the hops of a run spent their time
+
+    Args:
+        records (numpy.ndarray): HOP_RECORD rows
+
+    Returns:
+        dict: Number of hops, hops that gave up, retries, losses and ACK timeouts,
+            the mean seconds and share of every stage, and the dominant stage
+    """
+    times = stage_times(records)
+    delivered = records[records['delivered']]
+    hops = len(delivered)
+    means = {stage: float(seconds.mean()) if hops else 0.0 for stage, seconds in times.items()}
+    total = sum(means.values())
+    return {
+        'hops': hops,
+        'failed_hops': int(len(records) - hops),
+        'retries': int(records['retries'].sum()),
+        'losses': int(records['losses'].sum()),
+        'ack_timeouts': int(np.isnan(delivered['ack']).sum()),
+        'mean': means,
+        'share': {stage: mean / total if total else 0.0 for stage, mean in means.items()},
+        'dominant': max(means, key=means.get) if total else None
+    }
+
+def aggregate(paths):
+    """Break the hop latency down per algorithm over a set of trace files
+
+    Files named hoptrace_<algorithm>_<load>pps.bin (as saved by sim.py --trace-hops)
+    are grouped by algorithm, other files under their own name.
+
+    Args:
+        paths (list): Trace files
+
+    Returns:
+        dict: Algorithm -> breakdown() of all its hops
+    """
+    groups = {}
+    for path in paths:
+        match = re.match(r'hoptrace_(.+)_[\d.]+pps\.bin$', os.path.basename(path))
+        groups.setdefault(match.group(1) if match else os.path.basename(path), []).append(read_trace(path))
+    return {name: breakdown(np.concatenate(parts)) for name, parts in sorted(groups.items())}
+
+def format_breakdown(results):
+    """Render aggregate() results as a text table"""
+    lines = [f"{'algorithm':<16} {'hops':>8} " + ' '.join(f"{stage + ' ms':>16}" for stage in STAGES)
+             + f" {'retries':>8} {'timeouts':>8}  dominant"]
+    for name, result in results.items():
+        stages = ' '.join(f"{result['mean'][stage]*1000:>9.2f} ({result['share'][stage]:>3.0%})" for stage in STAGES)
+        lines.append(f"{name:<16} {result['hops']:>8} {stages} {result['retries']:>8} "
+                     f"{result['ack_timeouts']:>8}  {result['dominant']}")
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-hop latency breakdown of hop trace files')
+    parser.add_argument('paths', nargs='+',
+                        help='Trace files, or results directories holding hoptrace_*.bin files')
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.startswith('hoptrace_') and name.endswith('.bin')))
+        else:
+            paths.append(path)
+    if not paths:
+        parser.error("no hop trace files found")
+    logger.info(f"Hop latency breakdown (mean per delivered hop):\n{format_breakdown(aggregate(paths))}")
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,181 @@
+import math
+
+PERCENTILES = (50, 95, 99)
+
+class LatencyHistogram:
+    """
+    Mergeable log-bucket latency histogram (HDR-style).
+
+    Bucket widths grow geometrically, buckets_per_octave buckets per doubling, so
+    every percentile is reported with a bounded relative error while memory stays
+    constant regardless of how many values are recorded. Histograms with the same
+    configuration can be merged, e.g. the results of parallel simulation runs.
+    """
+    def __init__(self, min_value=1e-4, max_value=1e4, buckets_per_octave=32):
+        """
+        Args:
+            min_value (float, optional): Smallest resolved value in seconds. Defaults to 1e-4.
+            max_value (float, optional): Largest resolved value in seconds. Defaults to 1e4.
+            buckets_per_octave (int, optional): Buckets per doubling of the value. Defaults to 32.
+        """
+        self.min_value = min_value
+        self.max_value = max_value
+        self.buckets_per_octave = buckets_per_octave
+        # One underflow bucket below min_value and one overflow bucket above max_value
+        self.bucket_count = math.ceil(math.log2(max_value / min_value) * buckets_per_octave) + 2
+        self.counts = [0] * self.bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def config(self):
+        """Return the (min_value, max_value, buckets_per_octave) configuration"""
+        return (self.min_value, self.max_value, self.buckets_per_octave)
+
+    def bucket_index(self, value):
+        """
+        Args:
+            value (float): A latency in seconds
+
+        Returns:
+            int: Index of the bucket counting the value
+        """
+        if value < self.min_value:
+            return 0
+        index = int(math.log2(value / self.min_value) * self.buckets_per_octave) + 1
+        return min(index, self.bucket_count - 1)
+
+    def bucket_bounds(self, index):
+        """
+        Args:
+            index (int): Index of a bucket
+
+        Returns:
+            tuple: (lower, upper) bound of the bucket in seconds
+        """
+        if index == 0:
+            return 0.0, self.min_value
+        lower = self.min_value * 2 ** ((index - 1) / self.buckets_per_octave)
+        if index == self.bucket_count - 1:
+            return lower, math.inf
+        return lower, self.min_value * 2 ** (index / self.buckets_per_octave)
+
+    def record(self, value):
+        """
+        Args:
+            value (float): A latency in seconds
+        """
+        self.counts[self.bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Add the counts of another histogram to this one.
+
+        Args:
+            other (LatencyHistogram): Histogram with the same configuration
+
+        Returns:
+            LatencyHistogram: This histogram
+        """
+        if other.config() != self.config():
+            raise ValueError(f"Cannot merge histograms with configuration {other.config()} into {self.config()}")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def mean(self):
+        """Return the exact mean of the recorded values"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            float: Approximate value below which percent of the recorded values fall,
+                or 0.0 if the histogram is empty
+        """
+        if not self.count:
+            return 0.0
+        if percent >= 100:
+            return self.max
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                lower, upper = self.bucket_bounds(index)
+                # Geometric middle of the bucket, kept within the exact extremes
+                value = math.sqrt(lower * upper) if lower > 0 and upper < math.inf else lower
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self, percentiles=PERCENTILES):
+        """
+        Returns:
+            dict: count, mean, min, max and a 'p<N>' entry for every requested percentile
+        """
+        summary = {
+            'count': self.count,
+            'mean': self.mean(),
+            'min': self.min or 0.0,
+            'max': self.max or 0.0
+        }
+        for percent in percentiles:
+            summary[f'p{percent}'] = self.percentile(percent)
+        return summary
+
+    def nonzero_buckets(self):
+        """
+        Returns:
+            list: (lower, upper, count) of every non-empty bucket in increasing order
+        """
+        return [self.bucket_bounds(index) + (count,) for index, count in enumerate(self.counts) if count]
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON-serialisable form with only the non-empty buckets
+        """
+        return {
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'buckets_per_octave': self.buckets_per_octave,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': {str(index): count for index, count in enumerate(self.counts) if count}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Args:
+            data (dict): Output of to_dict
+
+        Returns:
+            LatencyHistogram: The restored histogram
+        """
+        histogram = cls(data['min_value'], data['max_value'], data['buckets_per_octave'])
+        for index, count in data['buckets'].items():
+            histogram.counts[int(index)] = count
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
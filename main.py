@@ -1,15 +1,76 @@
+import math
+import os
 import time
 import random as rnd
 import threading
+import queue
 import argparse
 
 import routing_alg.routing as routing
 from log_config import get_logger, setup_logging
-from networks import complex_network, advanced_network
+from networks import complex_network, advanced_network, generated_network, topology_file
 from network import reset_id_managers
+from events import EventScheduler
+from packet_table import PacketTable
+from telemetry import Telemetry, bottlenecks
+from profiler import profiler
+from hop_trace import HopTrace, read_trace, breakdown
 
 logger = get_logger("main")
 
+INJECTOR_DRAIN_TIMEOUT = 10.0 # seconds in-flight packets get to finish after the run
+RNG_STREAMS = ('topology', 'link_loss', 'traffic') # independent random streams of a seeded simulation
+
+def rng_streams(seed=None):
+    """
+    Derive an independent random stream for every simulation component from one seed.
+    
+    Args:
+        seed (int, optional): Seed of the simulation. Defaults to None.
+    
+    Returns:
+        dict: Mapping of stream name to random.Random. Without a seed every stream is
+            the global random module, as before seeding existed.
+    """
+    if seed is None:
+        return {name: rnd for name in RNG_STREAMS}
+    return {name: rnd.Random(f"{seed}/{name}") for name in RNG_STREAMS}
+
+def topology_arg(value):
+    """
+    Parse the --topology argument.
+    
+    Args:
+        value (str): 0, 1, a synthetic topology spec such as "grid:100x100,igw=4"
+            or a .json or .csv topology file
+    
+    Returns:
+        int or str: The built-in topology number, the validated spec or the file path
+    """
+    if value in ('0', '1'):
+        return int(value)
+    if topology_file.is_topology_file(value):
+        if not os.path.isfile(value):
+            raise argparse.ArgumentTypeError(f"no such topology file: {value}")
+        return value
+    try:
+        generated_network.parse_spec(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+def topology_name(topology):
+    """
+    Args:
+        topology (int or str): Built-in topology number, synthetic topology spec or topology file
+    
+    Returns:
+        str: Name of the topology used in logs and plot titles
+    """
+    if topology_file.is_topology_file(topology):
+        return os.path.splitext(os.path.basename(topology))[0]
+    return {0: "small", 1: "big"}.get(topology, str(topology))
+
 class MeshNetworkSimulator:
     """
     Mesh Network Simulator for evaluating routing algorithms in wireless mesh networks.
@@ -17,24 +78,54 @@ class MeshNetworkSimulator:
     This class provides functionality to simulate network traffic using different routing
     algorithms and network topologies.
     """
-    def __init__(self, topology_type=0):
+    def __init__(self, topology_type=0, event_driven=False, seed=None, telemetry_interval=None, trace_path=None,
+                 topology_cache_dir=None):
         """
         Initialize the simulator with a specified network topology.
 
         Args:
-            topology_type (int, optional): The network topology to use. 
-                0 = complex network, 1 = advanced network. Defaults to 0.
+            topology_type (int or str, optional): The network topology to use. 
+                0 = complex network, 1 = advanced network, a synthetic topology spec
+                such as "geometric:10000,igw=8" (see networks/generated_network.py) or a
+                .json or .csv topology file (see networks/topology_file.py). Defaults to 0.
+            event_driven (bool, optional): Run traffic on a discrete-event virtual clock
+                instead of threads and real-time sleeps. Defaults to False.
+            seed (int, optional): Seed for the topology channel, link loss and traffic
+                random streams. Identical seeds give identical event-driven runs. Defaults to None.
+            telemetry_interval (float, optional): Seconds between telemetry samples of the node
+                queues and edge traffic, None to disable telemetry. Defaults to None.
+            trace_path (str, optional): Binary file the per-hop timestamps of every DATA packet
+                are written to, None to disable hop tracing. Defaults to None.
+            topology_cache_dir (str, optional): Directory of the compiled topology files, see
+                topology_file.compile_topology. Defaults to None (next to the topology file).
         """
         reset_id_managers()
+        self.event_driven = event_driven
+        self.seed = seed
+        rngs = rng_streams(seed)
+        self.traffic_rng = rngs['traffic']
+        self.injection_stats = None
+        self.latency_histogram = None
+        self.packets = None # PacketTable of the last run
+        self.total_packets = 0 # packets injected in the last run, the filled rows of packets
+        self.run_start = 0.0 # network clock time the last run started
         
         if topology_type == 0:
-            self.network = complex_network.initialize_network()
-            self.topology_name = "small"
+            self.network = complex_network.initialize_network(rngs['topology'], rngs['link_loss'])
         elif topology_type == 1:
-            self.topology_name = "big"
-            self.network = advanced_network.initialize_network()
+            self.network = advanced_network.initialize_network(rngs['topology'], rngs['link_loss'])
+        elif topology_file.is_topology_file(topology_type):
+            self.network = topology_file.load_topology(topology_type, rngs['topology'], rngs['link_loss'],
+                                                       cache_dir=topology_cache_dir)
+        elif isinstance(topology_type, str):
+            # The layout and the channels share the topology stream
+            self.network = generated_network.build_topology(topology_type, rngs['topology'], rngs['topology'],
+                                                            rngs['link_loss'])
         else:
-            raise ValueError("Invalid topology type. Must be 0 (small) or 1 (big)")
+            raise ValueError("Invalid topology type. Must be 0 (small), 1 (big), a synthetic topology spec or a topology file")
+        self.topology_name = topology_name(topology_type)
+        self.telemetry = Telemetry(self.network, telemetry_interval) if telemetry_interval else None
+        self.network.hop_trace = HopTrace(trace_path) if trace_path else None
         
     def simulate_traffic(self, duration, load):
         """
@@ -45,16 +136,18 @@ class MeshNetworkSimulator:
         Returns:
             tuple: Tuple containing (error_rate, throughput, avg_trans_time, all_trans_time)
         """
+        if self.event_driven:
+            return self.simulate_traffic_events(duration, load)
+        
         self.network.start_network()
+        if self.telemetry:
+            self.telemetry.start()
         
-        total_packets = 0
-        packets_sent = 0
-        total_bytes = 0
-        total_tx = 0.0
-        packet_results = {}
-        all_tx = []
+        # Arrivals are scheduled strictly before the end of the run, plus one for rounding
+        packets = PacketTable(math.ceil(duration * load) + 1)
         
         start_time = time.time()
+        self.run_start = start_time
         
         c_nodes = [node_id for node_id, node in self.network.nodes.items() 
             if node.type == "C"]
@@ -63,106 +156,249 @@ class MeshNetworkSimulator:
         
         total_nodes = len(self.network.nodes)
         
-        def send_packet_thread(packet_id, src_id, dest_id):
-            """
-            Thread function to send a packet through the network.
-
-            Args:
-                packet_id (_type_): _description_
-                src_id (_type_): _description_
-                dest_id (_type_): _description_
-            """
-            result = self.network.send_packet_graph(src_id, dest_id)
-            packet_results[packet_id] = result
-        
-        threads = []
-        active_threads = []
-
-        # Max Thread calculation
+        # Pool size calculation
         estimated_packet_lifetime = 2.0
         base_threads = int(load * estimated_packet_lifetime)
         client_threads = 3 * len(c_nodes)
         topology_factor = int(total_nodes * 0.8)
 
-        max_concurrent_threads = base_threads + client_threads + topology_factor
-        max_concurrent_threads = min(max_concurrent_threads, 512)
+        pool_size = base_threads + client_threads + topology_factor
+        pool_size = min(pool_size, 512)
 
-        logger.info(f"Using maximum {max_concurrent_threads} concurrent threads")
+        logger.info(f"Using {pool_size} injector threads")
         
-        cleanup = 5
+        # Scheduled arrival times waiting for a free injector, bounded so memory stays constant
+        arrivals = queue.Queue(maxsize=pool_size)
+        injecting_done = threading.Event()
+        drain_expired = threading.Event()
+        stats_lock = threading.Lock()
+        stats = {'injected': 0, 'lag_total': 0.0, 'lag_max': 0.0, 'last_start': start_time}
+        
+        def injector():
+            """
+            Worker thread taking scheduled arrivals off the queue and sending a packet for each.
+            """
+            while True:
+                try:
+                    scheduled_time, src_id, dest_id = arrivals.get(timeout=0.1)
+                except queue.Empty:
+                    if injecting_done.is_set():
+                        return
+                    continue
+                if drain_expired.is_set():
+                    continue
+                
+                started = time.time()
+                lag = started - scheduled_time
+                with stats_lock:
+                    stats['injected'] += 1
+                    packet_id = stats['injected']
+                    stats['lag_total'] += lag
+                    stats['lag_max'] = max(stats['lag_max'], lag)
+                    stats['last_start'] = max(stats['last_start'], started)
+                
+                result = self.network.send_packet_graph(src_id, dest_id)
+                packets.record(packet_id - 1, src_id, dest_id, result, started)
+        
+        workers = [threading.Thread(target=injector, daemon=True) for _ in range(pool_size)]
+        for worker in workers:
+            worker.start()
         
         packet_interval = 1.0 / load
-        next_packet_time = start_time
+        end_time = start_time + duration
+        scheduled = 0
         
         try:
-            while time.time() - start_time < duration:
-                current_time = time.time()
-                if total_packets % cleanup == 0:
-                    active_threads = [t for t in active_threads if t.is_alive()]
-            
-                if len(active_threads) >= max_concurrent_threads:
-                    time.sleep(0.01)
-                    active_threads = [t for t in active_threads if t.is_alive()]
-                    continue
-                
-                if current_time < next_packet_time:
-                    sleep_time = min(next_packet_time - current_time, 0.01)
+            while True:
+                # Absolute arrival times, so sleep overshoot does not accumulate
+                next_packet_time = start_time + scheduled * packet_interval
+                if next_packet_time >= end_time:
+                    break
+                sleep_time = next_packet_time - time.time()
+                if sleep_time > 0:
                     time.sleep(sleep_time)
-                    continue
-            
-                src_id = rnd.choice(c_nodes)
-                dest_id = rnd.choice(igw_nodes)
-                total_packets += 1
-                
-                t = threading.Thread(
-                    target=send_packet_thread,
-                    args=(total_packets, src_id, dest_id)
-                )
-                t.daemon = True
-                t.start()
-                active_threads.append(t)
-                threads.append(t)
                 
-                next_packet_time += packet_interval
+                # Drawn here rather than in the injectors so the traffic does not depend on thread timing
+                src_id = self.traffic_rng.choice(c_nodes)
+                dest_id = self.traffic_rng.choice(igw_nodes)
+                try:
+                    arrivals.put((next_packet_time, src_id, dest_id), timeout=max(end_time - time.time(), 0.001))
+                except queue.Full:
+                    # Every injector stayed busy until the end of the run
+                    break
+                scheduled += 1
                 
-                if total_packets % 200 == 0:
+                if scheduled % 200 == 0:
                     elapsed = time.time() - start_time
-                    logger.info(f"Progress: {total_packets} packets, {elapsed:.1f}s elapsed")
+                    logger.info(f"Progress: {scheduled} packets, {elapsed:.1f}s elapsed")
 
         except KeyboardInterrupt:
             logger.info("Simulation interrupted")
         finally:
-            logger.info("Waiting for threads to complete...")
-            for t in threads:
-                t.join(timeout=0.5)
-            
-            for result in list(packet_results.values()):
-                if result.get('success'):
-                    packets_sent += 1
-                    packet = result.get('packet')
-                    total_bytes += packet.size
-                    
-                    if packet.delivered_time and packet.created_time:
-                        tx = packet.delivered_time - packet.created_time
-                        total_tx += tx
-                        all_tx.append(tx)
+            logger.info("Waiting for injectors to complete...")
+            injecting_done.set()
+            deadline = time.time() + INJECTOR_DRAIN_TIMEOUT
+            for worker in workers:
+                worker.join(timeout=max(deadline - time.time(), 0))
+            # Arrivals still queued after the deadline are never sent
+            drain_expired.set()
+            if self.telemetry:
+                self.telemetry.stop()
             
             elapsed = time.time() - start_time
-            error_rate = ((total_packets - packets_sent) / total_packets)*100
-            
-            # Throughput in Kbps (kilobits per second)
-            throughput = (total_bytes * 8 / 1000) / elapsed if elapsed > 0 else 0
-            avg_tx = (total_tx / packets_sent) if packets_sent > 0 else 0
-            
-            logger.info('=== Simulation Results ===')
-            logger.info(f'Duration: {elapsed:.1f} seconds')
-            logger.info(f'Total packets: {total_packets}')
-            logger.info(f'Successful packets: {packets_sent}')
-            logger.info(f'Error rate: {error_rate:.1f}%')
-            logger.info(f'Throughput: {throughput:.1f} Kbps')
-            logger.info(f'Average Transmission Time: {avg_tx:.2f} seconds')
-            
-            return error_rate, throughput, avg_tx, all_tx
+            with stats_lock:
+                total_packets = stats['injected']
+                injection_span = max(duration, stats['last_start'] - start_time + packet_interval)
+                mean_lag = stats['lag_total'] / total_packets if total_packets else 0.0
+                self.injection_stats = self.offered_load_stats(load, total_packets, injection_span,
+                                                               mean_lag, stats['lag_max'])
+            return self.summarize_results(total_packets, packets, elapsed)
+    
+    def offered_load_stats(self, load, total_packets, injection_span, mean_lag=0.0, max_lag=0.0):
+        """
+        Compare the load actually offered to the network with the configured load.
+        
+        Args:
+            load (float): Configured load in packets per second.
+            total_packets (int): Number of packets injected into the network.
+            injection_span (float): Seconds over which the packets were injected.
+            mean_lag (float, optional): Mean delay between scheduled and actual injection. Defaults to 0.0.
+            max_lag (float, optional): Largest delay between scheduled and actual injection. Defaults to 0.0.
+        
+        Returns:
+            dict: Offered load, its drift from the configured load in percent and the injection lags
+        """
+        offered_load = total_packets / injection_span if injection_span > 0 else 0.0
+        drift = (offered_load - load) / load * 100 if load else 0.0
+        
+        logger.info(f'Offered load: {offered_load:.2f} pkt/s (configured {load} pkt/s, drift {drift:+.1f}%)')
+        logger.info(f'Injection lag: mean {mean_lag*1000:.1f} ms, max {max_lag*1000:.1f} ms')
+        
+        return {
+            'configured_load': load,
+            'offered_load': offered_load,
+            'drift': drift,
+            'mean_lag': mean_lag,
+            'max_lag': max_lag
+        }
+    
+    def simulate_traffic_events(self, duration, load):
+        """
+        Simulate traffic on a discrete-event virtual clock. Node service, edge transmission,
+        ACK waits and WCETT-LB monitor ticks are events, so no real time is spent waiting.
+        
+        Args:
+            duration (int): Duration of simulation in virtual seconds.
+            load (int): packets per second.
+        
+        Returns:
+            tuple: Tuple containing (error_rate, throughput, avg_trans_time, all_trans_time)
+        """
+        scheduler = EventScheduler()
+        self.network.attach_scheduler(scheduler)
+        self.run_start = scheduler.now()
+        
+        packets = PacketTable(math.ceil(duration * load) + 1)
+        finish_time = [0.0]
+        
+        c_nodes = [node_id for node_id, node in self.network.nodes.items() 
+            if node.type == "C"]
+        igw_nodes = [node_id for node_id, node in self.network.nodes.items() 
+            if node.type == "IGW"]
+        
+        def on_complete(packet_id, src_id, dest_id, result, injected):
+            packets.record(packet_id - 1, src_id, dest_id, result, injected)
+            finish_time[0] = scheduler.now()
+        
+        def send_packet_event(packet_id):
+            src_id = self.traffic_rng.choice(c_nodes)
+            dest_id = self.traffic_rng.choice(igw_nodes)
+            injected = scheduler.now()
+            self.network.send_packet_event(src_id, dest_id,
+                                           lambda result: on_complete(packet_id, src_id, dest_id, result, injected))
+            if packet_id % 200 == 0:
+                logger.info(f"Progress: {packet_id} packets, {scheduler.now():.1f}s elapsed")
+        
+        packet_interval = 1.0 / load
+        total_packets = 0
+        while total_packets * packet_interval < duration:
+            total_packets += 1
+            scheduler.schedule_at((total_packets - 1) * packet_interval, send_packet_event, total_packets)
+        scheduler.schedule_at(0, self.network.event_monitor, duration)
+        if self.telemetry:
+            scheduler.schedule_at(0, self.telemetry.event_sample, duration)
+        
+        wall_start = time.time()
+        scheduler.run()
+        if self.telemetry:
+            # Final sample once every packet completed
+            self.telemetry.sample()
+        logger.info(f"Processed {scheduler.events_processed} events in {time.time() - wall_start:.2f}s wall time")
+        
+        elapsed = max(duration, finish_time[0])
+        self.injection_stats = self.offered_load_stats(load, total_packets, total_packets * packet_interval)
+        return self.summarize_results(total_packets, packets, elapsed)
+    
+    def summarize_results(self, total_packets, packets, elapsed):
+        """
+        Compute and log the simulation metrics from the per-packet results.
+        
+        Args:
+            total_packets (int): Number of packets injected into the network.
+            packets (PacketTable): Columnar results of the injected packets.
+            elapsed (float): Duration of the run in seconds.
+        
+        Returns:
+            tuple: Tuple containing (error_rate, throughput, avg_trans_time, all_trans_time)
+        """
+        error_rate, throughput, avg_tx, all_tx = packets.metrics(total_packets, elapsed)
+        packets_sent = int(packets.success.sum())
+        self.latency_histogram = packets.latency
+        self.packets = packets
+        self.total_packets = total_packets
+        
+        logger.info('=== Simulation Results ===')
+        logger.info(f'Duration: {elapsed:.1f} seconds')
+        logger.info(f'Total packets: {total_packets}')
+        logger.info(f'Successful packets: {packets_sent}')
+        logger.info(f'Error rate: {error_rate:.1f}%')
+        logger.info(f'Throughput: {throughput:.1f} Kbps')
+        logger.info(f'Average Transmission Time: {avg_tx:.2f} seconds')
+        latency = packets.latency.summary()
+        logger.info(f"Transmission Time percentiles: p50 {latency['p50']:.2f}s, "
+                    f"p95 {latency['p95']:.2f}s, p99 {latency['p99']:.2f}s")
+        
+        counters = self.network.packet_counters()
+        logger.info(f"Hops: {counters['sent']} sent, {counters['received']} received, "
+                    f"{counters['acked']} ACKed, {counters['acks_received']} ACKs received")
+        drops = ', '.join(f'{reason}: {count}' for reason, count in sorted(counters['dropped'].items()))
+        logger.info(f"Dropped attempts: {drops or 'none'}")
+        
+        ack = self.network.ack_report()
+        logger.info(f"Per-hop ACK latency: mean {ack['mean_latency']*1000:.1f} ms, "
+                    f"max {ack['max_latency']*1000:.1f} ms ({ack['acked']} ACKed, {ack['timeouts']} timed out)")
+        
+        monitor = self.network.monitor.report()
+        logger.info(f"Congestion monitor: {monitor['ticks']} ticks of {monitor['nodes_per_tick']:.0f} nodes, "
+                    f"CPU mean {monitor['mean_cpu']*1000:.1f} ms, max {monitor['max_cpu']*1000:.1f} ms per tick")
+        
+        if self.telemetry:
+            for node in bottlenecks(self.telemetry.series()):
+                logger.info(f"Bottleneck: {node['type']} {node['node_id']}, queue mean {node['mean_queue']:.1f} "
+                            f"max {node['max_queue']}, {node['drops']} drops, congested {node['congested']:.0%}")
+        
+        hop_trace = self.network.hop_trace
+        if hop_trace:
+            hop_trace.close()
+            hops = breakdown(read_trace(hop_trace.path))
+            stages = ', '.join(f"{stage} {seconds*1000:.1f} ms" for stage, seconds in hops['mean'].items())
+            logger.info(f"Per-hop latency ({hops['hops']} hops): {stages}, dominated by {hops['dominant']}")
+        
+        lb_metrics = getattr(self.network.routing_algorithm, 'lb_metrics', None)
+        if lb_metrics:
+            logger.info(f'WCETT-LB metric cache: {lb_metrics.report()}')
+        
+        return error_rate, throughput, avg_tx, all_tx
     
     def hop_count_sim(self):
         """
@@ -178,16 +414,13 @@ class MeshNetworkSimulator:
             logger.error("NO IGW in network")
             return False
         
-        self.network.routing_algorithm = None
         hop_count_alg = routing.HopCountRouting()
+        self.network.routing_algorithm = hop_count_alg
 
+        hop_count_alg.compute_routing_tables(self.network, igw_nodes)
+        
         logger.info("Hop count initial next hop:")
-        for node_id, node in self.network.nodes.items():
-            for igw_id in igw_nodes:
-                next_hop = hop_count_alg.compute_routing_tb(self.network, node_id, igw_id)
-                if next_hop is not None:
-                    node.routing_table[igw_id] = next_hop
-                    logger.info(f"{node.id} → {igw_id}: {node.routing_table[igw_id]}")
+        self.log_routing_tables(igw_nodes)
         
         logger.info(f"Hop count routing tables created for {len(self.network.nodes)} nodes")
         return True
@@ -206,16 +439,13 @@ class MeshNetworkSimulator:
             logger.error("NO IGW in network")
             return False
         
-        self.network.routing_algorithm = None
         wcett_alg = routing.WCETTRouting()
+        self.network.routing_algorithm = wcett_alg
+        
+        wcett_alg.compute_routing_tables(self.network, igw_nodes)
         
         logger.info("WCETT initial next hop:")
-        for node_id, node in self.network.nodes.items():
-            for igw_id in igw_nodes:
-                next_hop = wcett_alg.compute_routing_tb(self.network, node_id, igw_id)
-                if next_hop is not None:
-                    node.routing_table[igw_id] = next_hop
-                    logger.info(f"{node.id} → {igw_id}: {node.routing_table[igw_id]}")
+        self.log_routing_tables(igw_nodes)
         
         logger.info(f"WCETT routing tables created for {len(self.network.nodes)} nodes")
         return True
@@ -237,12 +467,7 @@ class MeshNetworkSimulator:
         wcett_lb_post_algorithm = routing.WCETT_LB_POSTRouting()
         self.network.routing_algorithm = wcett_lb_post_algorithm
         
-        for node_id, node in self.network.nodes.items():
-            node.routing_table = {}  # Clear existing routing table
-            for igw_id in igw_nodes:
-                next_hop = wcett_lb_post_algorithm.compute_routing_tb(self.network, node_id, igw_id)
-                if next_hop is not None:
-                    node.routing_table[igw_id] = next_hop
+        wcett_lb_post_algorithm.compute_routing_tables(self.network, igw_nodes)
         
         logger.info(f"WCETT-LB Post routing tables created for {len(self.network.nodes)} nodes")
         
@@ -270,13 +495,8 @@ class MeshNetworkSimulator:
         wcett_lb_pre_algorithm = routing.WCETT_LB_PRERouting()
         self.network.routing_algorithm = wcett_lb_pre_algorithm
         
-        for node_id, node in self.network.nodes.items():
-            node.routing_table = {}  # Clear existing routing table
-            for igw_id in igw_nodes:
-                next_hop = wcett_lb_pre_algorithm.compute_routing_tb(self.network, node_id, igw_id)
-                if next_hop is not None:
-                    node.routing_table[igw_id] = next_hop
-                    
+        wcett_lb_pre_algorithm.compute_routing_tables(self.network, igw_nodes)
+        
         logger.info(f"WCETT-LB Pre routing tables created for {len(self.network.nodes)} nodes")
         
         if hasattr(wcett_lb_pre_algorithm, 'path_cache'):
@@ -286,6 +506,18 @@ class MeshNetworkSimulator:
                     logger.info(f"{src} → {dest}: {path}")
         return True
 
+    def log_routing_tables(self, igw_nodes):
+        """
+        Log the next hop of every node towards each IGW.
+        
+        Args:
+            igw_nodes (list): node_ids of the IGW nodes.
+        """
+        for node_id, node in self.network.nodes.items():
+            for igw_id in igw_nodes:
+                if igw_id in node.routing_table:
+                    logger.info(f"{node_id} → {igw_id}: {node.routing_table[igw_id]}")
+
 def main():
     """
     Main entry point of the program.
@@ -293,15 +525,26 @@ def main():
     """
     parser = argparse.ArgumentParser(description='Wireless Mesh Network Simulator')
     
-    parser.add_argument('-t', '--topology', type=int, choices=[0, 1], default=0,
-                        help='Network topology: 0=small, 1=big (default: 0)')
+    parser.add_argument('-t', '--topology', type=topology_arg, default=0,
+                        help='Network topology: 0=small, 1=big, a synthetic spec such as '
+                             'grid:30x30,igw=4 or a .json/.csv topology file (default: 0)')
     parser.add_argument('-d', '--duration', type=int, default=120,
                         help='Simulation duration in seconds (default: 120)')
     parser.add_argument('-l', '--load', type=float, default=20,
                         help='Network load in packets per second (default: 20)')
+    parser.add_argument('-e', '--event-driven', action='store_true',
+                        help='Run on a discrete-event virtual clock instead of real time')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='Seed for reproducible topology channels, link losses and traffic')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time the routing and forwarding hot paths and save profile.txt (ranked report) '
+                             'and profile.folded (collapsed stacks)')
     args = parser.parse_args()
     
-    sim = MeshNetworkSimulator(args.topology)
+    if args.profile:
+        profiler.instrument()
+    
+    sim = MeshNetworkSimulator(args.topology, event_driven=args.event_driven, seed=args.seed)
     
     while True:
         print("\nSelect an option:")
@@ -346,6 +589,9 @@ def main():
             break
         else:
             logger.error("Invalid choice.")
+    
+    if args.profile:
+        profiler.dump("profile")
 
 if __name__ == "__main__":
     setup_logging()
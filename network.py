@@ -1,12 +1,17 @@
+import math
 import threading
 import time
 import queue
 import random as rnd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from packet import Packet
 import routing_alg.wcett_lb_post as wcett_lb_post
 import routing_alg.wcett_lb_pre as wcett_lb_pre
 import routing_alg.routing as routing
+from routing_alg.incremental import repair_routes
+from routing_alg.wcett_lb import get_metrics
 from log_config import get_logger
 
 logger = get_logger("network")
@@ -21,6 +26,11 @@ BUFFER_SIZE = { # message queue maximum length
 } 
 QUEUE_PROCESS_TIME = 0.05  # time for node to process packet. Adjust to fill up queue. ≈ 20 pkt/s to fill up
 PACKET_SIZE = 1024 # Standardized packet size for DATA packets
+ACK_TIMEOUT = 0.5 # seconds a hop waits for an ACK before moving on
+MAX_SEND_TRIES = 3 # attempts per hop before the packet is dropped
+MONITOR_INTERVAL = 1.0 # seconds between congestion monitor ticks
+MONITOR_WORKERS = 1 # threads ticking the nodes of one monitor level, 1 ticks them in the monitor thread
+STATS_HISTORY = 64 # recent packet events kept per node
 
 def node_id_manager():
     """Generate and return a unique ID for a new node.
@@ -63,6 +73,143 @@ def reset_id_managers():
     EDGE_ID_COUNTER = 0
     PACKET_ID_COUNTER = 0
 
+class RoutingTable(dict):
+    def __init__(self, node, entries=None):
+        """Routing table of a node mapping destination IDs to next hop IDs.
+        
+        Every write is reported to the node's network so its next-hop index stays in sync.
+
+        Args:
+            node (Node): The node owning the table
+            entries (dict, optional): Initial entries. Defaults to None.
+        """
+        super().__init__()
+        self.node = node
+        if entries:
+            self.update(entries)
+    
+    def __setitem__(self, dest_id, next_hop):
+        network = self.node.network
+        if dest_id in self:
+            network.unlink_next_hop(self.node.id, dict.__getitem__(self, dest_id))
+        super().__setitem__(dest_id, next_hop)
+        network.link_next_hop(self.node.id, next_hop)
+    
+    def __delitem__(self, dest_id):
+        next_hop = dict.__getitem__(self, dest_id)
+        super().__delitem__(dest_id)
+        self.node.network.unlink_next_hop(self.node.id, next_hop)
+    
+    def pop(self, dest_id, *default):
+        if dest_id not in self:
+            return super().pop(dest_id, *default)
+        next_hop = dict.__getitem__(self, dest_id)
+        del self[dest_id]
+        return next_hop
+    
+    def popitem(self):
+        dest_id, next_hop = super().popitem()
+        self.node.network.unlink_next_hop(self.node.id, next_hop)
+        return dest_id, next_hop
+    
+    def setdefault(self, dest_id, default=None):
+        if dest_id not in self:
+            self[dest_id] = default
+        return dict.__getitem__(self, dest_id)
+    
+    def update(self, *args, **kwargs):
+        for dest_id, next_hop in dict(*args, **kwargs).items():
+            self[dest_id] = next_hop
+    
+    def clear(self):
+        for dest_id in list(self):
+            del self[dest_id]
+
+class NodeStats:
+    def __init__(self, history=STATS_HISTORY):
+        """Bounded packet bookkeeping of a node
+
+        Exact counters for the whole run plus a ring buffer of the most recent
+        events, so memory stays constant regardless of run length.
+
+        Args:
+            history (int, optional): Number of recent events to keep. Defaults to STATS_HISTORY.
+        """
+        self.lock = threading.Lock()
+        self.received = 0 # DATA packets taken from the queue
+        self.acks_received = 0
+        self.sent = 0 # DATA packets handed to the next hop
+        self.acked = 0 # DATA packets this node acknowledged
+        self.dropped = {} # reason -> count
+        self.dropped_total = 0 # sum of dropped, read by telemetry without copying the dict
+        self.recent = deque(maxlen=history) # (time, event, packet id, detail)
+    
+    def record_received(self, packet, time):
+        """Count a packet taken from the node's queue
+
+        Args:
+            packet (Packet): The received packet
+            time (float): Network clock time of the event
+        """
+        with self.lock:
+            if packet.type == 'ACK':
+                self.acks_received += 1
+                self.recent.append((time, 'ack_received', packet.ack_for, packet.src_id))
+            else:
+                self.received += 1
+                self.recent.append((time, 'received', packet.id, packet.src_id))
+    
+    def record_sent(self, packet, next_hop_id, time):
+        """Count a packet handed to the next hop
+
+        Args:
+            packet (Packet): The sent packet
+            next_hop_id (int): ID of the node the packet was sent to
+            time (float): Network clock time of the event
+        """
+        with self.lock:
+            self.sent += 1
+            self.recent.append((time, 'sent', packet.id, next_hop_id))
+    
+    def record_acked(self, packet, time):
+        """Count a packet acknowledged by this node
+
+        Args:
+            packet (Packet): The acknowledged DATA packet
+            time (float): Network clock time of the event
+        """
+        with self.lock:
+            self.acked += 1
+            self.recent.append((time, 'acked', packet.id, packet.src_id))
+    
+    def record_dropped(self, packet, reason, time):
+        """Count a failed attempt to send or accept a packet
+
+        Args:
+            packet (Packet): The dropped packet
+            reason (str): Reason of the drop, e.g. 'buffer_full' or 'packet_loss'
+            time (float): Network clock time of the event
+        """
+        with self.lock:
+            self.dropped[reason] = self.dropped.get(reason, 0) + 1
+            self.dropped_total += 1
+            self.recent.append((time, 'dropped', packet.id, reason))
+    
+    def counters(self):
+        """Return a copy of the counters
+
+        Returns:
+            dict: received, acks_received, sent, acked and dropped (reason -> count)
+        """
+        with self.lock:
+            return {
+                'received': self.received,
+                'acks_received': self.acks_received,
+                'sent': self.sent,
+                'acked': self.acked,
+                'dropped': dict(self.dropped)
+            }
+
 class Node:
     def __init__(self, node_id, type, network):
         """Initialize a new network node
@@ -75,22 +222,37 @@ class Node:
         self.id = node_id
         self.type = type
         self.neighbors = []
-        self.routing_table = {}
+        self._routing_table = RoutingTable(self) # next hop ID for each destination ID
         self.load = 0
         self.congest_status = False
         buffer_size = BUFFER_SIZE.get(type, 75)
         self.queue = queue.Queue(maxsize=buffer_size)
-        self.received_packets = []
-        self.sent_packets = {}
-        self.dropped_packets = []
+        self.stats = NodeStats()
         self.running = False
         self.network = network
+        self.busy = False # discrete-event mode: a packet is being serviced
+        self.blocked_puts = deque() # discrete-event mode: ACKs waiting for a free buffer slot
         
     def __repr__(self):
         return f"Node(id={self.id}, type={self.type})"
+    
+    @property
+    def routing_table(self):
+        """RoutingTable: Next hop ID for each destination ID"""
+        return self._routing_table
+    
+    @routing_table.setter
+    def routing_table(self, entries):
+        entries = dict(entries)
+        if not hasattr(self, '_routing_table'):
+            self._routing_table = RoutingTable(self)
+        self._routing_table.clear()
+        self._routing_table.update(entries)
 
     def start_running(self):
         """Starts processing thread
+
+        Congestion monitoring is not per node, the network's CongestionMonitor ticks all nodes.
         """
         if self.running:
             return {'success': False, 'reason': 'already_running'}
@@ -100,10 +262,6 @@ class Node:
         self.thread.daemon = True
         self.thread.start()
         
-        self.congest_thread = threading.Thread(target=self.monitor_congestion)
-        self.congest_thread.daemon = True
-        self.congest_thread.start()
-        
         return {'success': True}
     
     def stop_running(self):
@@ -112,50 +270,42 @@ class Node:
         self.running = False
         if hasattr(self, 'thread') and self.thread.is_alive():
             self.thread.join(timeout=2.0)
-        if hasattr(self, 'congest_thread') and self.congest_thread.is_alive():
-            self.congest_thread.join(timeout=2.0)
     
-    def monitor_congestion(self):
-        """Monitor and manage node congestion status.
+    def monitor_tick(self):
+        """Run a single congestion monitoring step for this node.
+        
+        Updates the congestion status (WCETT-LB Post) or prediction (WCETT-LB Pre),
+        records the current load and re-evaluates the path to every destination.
         """
-        while self.running:
-            try:
-                routing_algorithm = self.network.routing_algorithm
-                
-                if routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_PRERouting):
-                    wcett_lb_pre.predict_congestion(self, self.network, routing_algorithm)
-                elif routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_POSTRouting):
-                    wcett_lb_post.update_congest_status(self, self.network, routing_algorithm)
-                
-                self.load = self.queue.qsize()
-
-                for dest_id in self.routing_table.keys():
-                    if routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_POSTRouting):
-                        wcett_lb_post.update_path(self, self.network, dest_id, routing_algorithm)
-                    elif routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_PRERouting):
-                        wcett_lb_pre.update_path(self, self.network, dest_id, routing_algorithm)
-                time.sleep(1)
-            except Exception as e:
-                if self.running:
-                    logger.error(f"Error monitoring congestion at Node {self.id}: {e}")
+        routing_algorithm = self.network.routing_algorithm
+        
+        if routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_PRERouting):
+            wcett_lb_pre.predict_congestion(self, self.network, routing_algorithm)
+        elif routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_POSTRouting):
+            wcett_lb_post.update_congest_status(self, self.network, routing_algorithm)
+        
+        self.load = self.queue.qsize()
+
+        for dest_id in self.routing_table.keys():
+            if routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_POSTRouting):
+                wcett_lb_post.update_path(self, self.network, dest_id, routing_algorithm)
+            elif routing_algorithm and isinstance(routing_algorithm, routing.WCETT_LB_PRERouting):
+                wcett_lb_pre.update_path(self, self.network, dest_id, routing_algorithm)
         
     def process_packets(self):
         """Process packets from the node's queue.
         """
         while self.running:
             try:
-                message = self.queue.get(timeout=1)
-                packet = message['packet']
-                src = message['sender']
-                self.received_packets.append(packet)
+                packet, src = self.queue.get(timeout=1)
+                self.stats.record_received(packet, self.network.clock())
+                self.trace_dequeue(packet)
                 
                 if packet.type == 'ACK':
-                    logger.debug(f"Node {self.id} received ACK from {packet.src_id} for packet to {packet.dest_id}")
+                    logger.debug(f"Node {self.id} received ACK from {packet.src_id} for packet {packet.ack_for}")
+                    self.network.ack_arrived(self, packet)
                 
-                if self.type == "IGW":
-                    time.sleep(QUEUE_PROCESS_TIME * 0.01)  # IGWs are alot faster but not instant
-                else:
-                    time.sleep(QUEUE_PROCESS_TIME)
+                time.sleep(self.service_time())
                 if packet.type == 'DATA':
                     self.send_ack(packet, src)
                 self.queue.task_done()
@@ -165,6 +315,83 @@ class Node:
                 if self.running:
                     logger.error(f'Error processing packet at Node {self.id}: {e}')
     
+    def trace_dequeue(self, packet):
+        """Stamp the dequeue time on the hop record of a packet taken from the queue.
+
+        The sender may have timed out and started the next hop, whose record is not ours.
+
+        Args:
+            packet (Packet): The packet taken from the queue
+        """
+        hop = packet.trace
+        if hop is not None and hop.dest == self.id:
+            hop.dequeue = self.network.clock()
+    
+    def service_time(self):
+        """Return the time this node spends processing one queued packet.
+
+        Returns:
+            float: Processing time in seconds
+        """
+        if self.type == "IGW":
+            return QUEUE_PROCESS_TIME * 0.01  # IGWs are alot faster but not instant
+        return QUEUE_PROCESS_TIME
+    
+    def event_kick(self):
+        """Start servicing the next queued packet if the node is idle (discrete-event mode).
+        """
+        if self.busy or self.queue.empty():
+            return
+        message = self.queue.get_nowait()
+        self.busy = True
+        self.admit_blocked_put()
+        
+        packet = message[0]
+        self.stats.record_received(packet, self.network.clock())
+        self.trace_dequeue(packet)
+        if packet.type == 'ACK':
+            logger.debug(f"Node {self.id} received ACK from {packet.src_id} for packet {packet.ack_for}")
+            self.network.ack_arrived(self, packet)
+        self.network.scheduler.schedule(self.service_time(), self.event_service_done, message)
+    
+    def event_service_done(self, message):
+        """Finish servicing a packet and acknowledge it to the sender (discrete-event mode).
+        
+        The ACK is placed in the sender's queue. If that queue is full the node stays
+        busy until a slot frees up, like the blocking put in the threaded mode.
+
+        Args:
+            message (tuple): The (packet, sender) queue entry that was serviced
+        """
+        packet, sender = message
+        if packet.type == 'DATA':
+            ack = packet.create_ack(packet_id_manager(), self.id)
+            self.stats.record_acked(packet, self.network.clock())
+            entry = (ack, self)
+            try:
+                sender.queue.put_nowait(entry)
+            except queue.Full:
+                sender.blocked_puts.append((entry, self))
+                return
+            sender.event_kick()
+        self.event_resume()
+    
+    def event_resume(self):
+        """Mark the current packet as done and continue with the queue (discrete-event mode).
+        """
+        self.queue.task_done()
+        self.busy = False
+        self.event_kick()
+    
+    def admit_blocked_put(self):
+        """Move the oldest blocked ACK into the queue after a slot was freed (discrete-event mode).
+        """
+        if not self.blocked_puts:
+            return
+        entry, blocked_node = self.blocked_puts.popleft()
+        self.queue.put_nowait(entry)
+        self.network.scheduler.schedule(0, blocked_node.event_resume)
+    
     def send_ack(self, packet, src):
         """Send an acknowledgment packet in response to a data packet.
 
@@ -172,9 +399,9 @@ class Node:
             packet (Packet): The original data packet to acknowledge
             src (Node): The source node that sent the original packet
         """
-        packet_id = packet_id_manager()
-        ack = Packet(packet_id, self.id, packet.src_id, 64,"ACK")
-        src.queue.put({'packet': ack, 'sender': self})
+        ack = packet.create_ack(packet_id_manager(), self.id)
+        self.stats.record_acked(packet, self.network.clock())
+        src.queue.put((ack, self))
         
     def receive_message(self, packet, src):
         """Receive and process an incoming packet.
@@ -189,20 +416,18 @@ class Node:
         try:
              # Prioritize ACKs, should always go through
             if packet.type == 'ACK':
-                self.received_packets.append(packet)
+                self.stats.record_received(packet, self.network.clock())
                 return True
+            hop = packet.trace
+            if hop is not None and hop.dest == self.id:
+                # Stamped before the put, the processing thread may dequeue it right away
+                hop.enqueue = self.network.clock()
             try:
-                self.queue.put_nowait({'packet': packet, 'sender': src})
+                self.queue.put_nowait((packet, src))
                 return True
             except queue.Full:
                 print(f"Node {self.id}: dropping {packet.id} (buffer full)")
-                self.dropped_packets.append({
-                    'packet_id': packet.id,
-                    'src': packet.src_id,
-                    'dest': packet.dest_id,
-                    'time': time.time(),
-                    'reason': 'buffer_full'
-                })
+                self.stats.record_dropped(packet, 'buffer_full', self.network.clock())
                 return False
         except Exception as e:
             logger.error(f"Error receiving message at Node {self.id}: {e}")
@@ -221,12 +446,12 @@ class Node:
         
         self.wcett_lb_updates[sender_id] = {
             'paths': paths,
-            'timestamp': time.time(),
+            'timestamp': self.network.clock(),
             'state_changed': state_changed
         }
     
 class Edge:
-    def __init__(self, edge_id, src, dest, bandwidth, loss_rate):
+    def __init__(self, edge_id, src, dest, bandwidth, loss_rate, channel=None):
         """Initialize a new edge between two nodes.
 
         Args:
@@ -235,18 +460,70 @@ class Edge:
             dest (Node): Destination node object
             bandwidth (float): Maximum data transfer rate
             loss_rate (float): Probability (0-1) of packet loss on this edge
+            channel (int, optional): Radio channel 1-3. Defaults to a random channel.
         """
         self.id = edge_id
         self.src = src
         self.dest = dest
         self.bandwidth = bandwidth
         self.loss_rate = loss_rate
-        self.channel = rnd.randint(1,3)
+        self.channel = channel if channel is not None else rnd.randint(1,3)
         self.active = True
+        self.packets_sent = 0 # packets put on the edge and accepted by the receiver, both directions
+        self.bytes_sent = 0
+        self.stats_lock = threading.Lock()
         
     def __repr__(self):
         return f"Edge({self.src.id} <-> {self.dst.id})"
     
+    def transmission_time(self, packet):
+        """Return the time it takes to put a packet on this edge.
+
+        Args:
+            packet (Packet): The packet to be sent
+
+        Returns:
+            float: Transmission time in seconds
+        """
+        return packet.size / self.bandwidth * 0.01
+    
+    def check_send(self, src, dest, packet):
+        """Check whether a packet can be put on this edge, including random link loss.
+
+        Args:
+            src (Node): Source node sending the packet
+            dest (Node): Destination node receiving the packet
+            packet (Packet): The packet to be sent
+
+        Returns:
+            dict: Failure result with 'success' False and a 'reason', or None if the packet goes through
+        """
+        reason = None
+        if not self.active:
+            logger.error(f"Edge {self.id}: Inactive, cannot send packet {packet.id}")
+            reason = 'edge_inactive'
+        elif src.id != self.src.id and src.id != self.dest.id:
+            reason = 'invalid_src'
+        elif dest.id != self.src.id and dest.id != self.dest.id:
+            reason = 'invalid_dest'
+        elif src.network.loss_rng.random() < self.loss_rate:
+            reason = 'packet_loss'
+        
+        if reason is None:
+            return None
+        src.stats.record_dropped(packet, reason, src.network.clock())
+        return {'success': False, 'reason': reason}
+    
+    def record_sent(self, packet):
+        """Count a packet that crossed this edge
+
+        Args:
+            packet (Packet): The transmitted packet
+        """
+        with self.stats_lock:
+            self.packets_sent += 1
+            self.bytes_sent += packet.size
+    
     def send_packet_edge(self, src, dest, packet):
         """Send a packet across this edge.
 
@@ -258,35 +535,223 @@ class Edge:
         Returns:
             dict: Result with 'success' boolean and 'reason' string if failed
         """
-        if not self.active:
-            logger.error(f"Edge {self.id}: Inactive, cannot send packet {packet.id}")
-            return {'success': False, 'reason': 'edge_inactive'}
-        if src.id != self.src.id and src.id != self.dest.id:
-            return {'success': False, 'reason': 'invalid_src'}
-        if dest.id != self.src.id and dest.id != self.dest.id:
-            return {'success': False, 'reason': 'invalid_dest'}
-        if rnd.random() < self.loss_rate:
-            return {'success': False, 'reason': 'packet_loss'}
+        failure = self.check_send(src, dest, packet)
+        if failure:
+            return failure
         
-        tx = packet.size / self.bandwidth * 0.01
-        time.sleep(tx)
+        hop = packet.trace
+        if hop is not None:
+            hop.tx_start = src.network.clock()
+        time.sleep(self.transmission_time(packet))
+        if hop is not None:
+            hop.tx_end = src.network.clock()
         
         receive_result = dest.receive_message(packet, src)
         if not receive_result:
             return {'success': False, 'reason': 'buffer_full'}
+        self.record_sent(packet)
         return {'success': True}
     
+class CongestionMonitor:
+    def __init__(self, network, interval=MONITOR_INTERVAL, workers=MONITOR_WORKERS, history=STATS_HISTORY):
+        """Central congestion monitor ticking every node of a network once per interval
+
+        Replaces a monitor thread per node. Nodes are ticked in topological order of
+        the routing tables, every next hop before the nodes forwarding through it, so
+        a node sees the WCETT-LB report its parents multicast in the same tick. Nodes
+        of one level do not depend on each other and can be spread over a thread pool.
+
+        Args:
+            network (Graph): The network to monitor
+            interval (float, optional): Seconds between ticks. Defaults to MONITOR_INTERVAL.
+            workers (int, optional): Threads ticking the nodes of a level. Defaults to MONITOR_WORKERS.
+            history (int, optional): Number of recent ticks kept. Defaults to STATS_HISTORY.
+        """
+        self.network = network
+        self.interval = interval
+        self.workers = workers
+        self.running = False
+        self.thread = None
+        self.pool = None
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.stats = {'ticks': 0, 'nodes': 0, 'cpu_total': 0.0, 'cpu_max': 0.0, 'wall_total': 0.0, 'errors': 0}
+        self.recent = deque(maxlen=history) # (time, nodes, CPU seconds, wall seconds)
+
+    def levels(self):
+        """Group the nodes into levels, every next hop of a node is in an earlier level.
+
+        Routes towards different gateways can wait on each other in a cycle (a gateway
+        routing to another gateway through nodes that route back to it). The search
+        then releases the waiting node with the fewest unticked next hops as a level
+        of its own and carries on.
+
+        Returns:
+            list: Lists of Node objects, sorted by ID within a level
+        """
+        nodes = self.network.nodes
+        waiting = {}
+        for node_id, node in nodes.items():
+            parents = set(node.routing_table.values())
+            parents.discard(node_id)
+            waiting[node_id] = len(parents)
+
+        levels = []
+        level = sorted(node_id for node_id, count in waiting.items() if count == 0)
+        while waiting:
+            if not level:
+                level = [min(waiting, key=lambda node_id: (waiting[node_id], node_id))]
+            levels.append([nodes[node_id] for node_id in level])
+            for node_id in level:
+                del waiting[node_id]
+            ready = set()
+            for node_id in level:
+                for child_id in self.network.get_children(node_id):
+                    if child_id in waiting:
+                        waiting[child_id] -= 1
+                        if waiting[child_id] == 0:
+                            ready.add(child_id)
+            level = sorted(ready)
+        return levels
+
+    def tick_node(self, node):
+        """Tick one node.
+
+        Returns:
+            float: CPU seconds the tick took in the calling thread
+        """
+        start = time.thread_time()
+        try:
+            node.monitor_tick()
+        except Exception as e:
+            logger.error(f"Error monitoring congestion at Node {node.id}: {e}")
+            with self.lock:
+                self.stats['errors'] += 1
+        return time.thread_time() - start
+
+    def tick(self):
+        """Tick every node once, level by level.
+
+        A WCETT-LB routing algorithm first takes a new snapshot of its shared metrics,
+        which every node of the tick then evaluates its paths against.
+
+        Returns:
+            dict: Number of nodes, CPU seconds over all threads and wall seconds of the tick
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        routing_algorithm = self.network.routing_algorithm
+        if isinstance(routing_algorithm, (routing.WCETT_LB_POSTRouting, routing.WCETT_LB_PRERouting)):
+            get_metrics(routing_algorithm, self.network).refresh()
+        levels = self.levels()
+        cpu = time.thread_time() - cpu_start
+        count = 0
+        for level in levels:
+            if self.pool is not None and len(level) > 1:
+                cpu += sum(self.pool.map(self.tick_node, level))
+            else:
+                cpu += sum(self.tick_node(node) for node in level)
+            count += len(level)
+        wall = time.perf_counter() - wall_start
+
+        with self.lock:
+            self.stats['ticks'] += 1
+            self.stats['nodes'] += count
+            self.stats['cpu_total'] += cpu
+            self.stats['cpu_max'] = max(self.stats['cpu_max'], cpu)
+            self.stats['wall_total'] += wall
+            self.recent.append((self.network.clock(), count, cpu, wall))
+        return {'nodes': count, 'cpu': cpu, 'wall': wall}
+
+    def run(self):
+        """Tick every interval until stopped (real-time mode)"""
+        while self.running:
+            start = time.monotonic()
+            self.tick()
+            self.stop_event.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def start(self):
+        """Start the monitor thread, and the worker pool if more than one worker is configured"""
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+        if self.workers > 1:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="monitor")
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the monitor thread and the worker pool"""
+        self.running = False
+        self.stop_event.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    def report(self):
+        """Summarise the cost of the monitor ticks
+
+        Returns:
+            dict: ticks, mean nodes per tick, mean and max CPU seconds per tick,
+                mean wall seconds per tick and errors
+        """
+        with self.lock:
+            stats = dict(self.stats)
+        ticks = stats['ticks']
+        return {
+            'ticks': ticks,
+            'nodes_per_tick': stats['nodes'] / ticks if ticks else 0.0,
+            'mean_cpu': stats['cpu_total'] / ticks if ticks else 0.0,
+            'max_cpu': stats['cpu_max'],
+            'mean_wall': stats['wall_total'] / ticks if ticks else 0.0,
+            'errors': stats['errors']
+        }
+
 class Graph:
-    def __init__(self, routing_algorithm=None):
+    def __init__(self, routing_algorithm=None, channel_rng=None, loss_rng=None):
         """Initialize a new network graph.
 
         Args:
             routing_algorithm (object, optional): The routing algorithm to use.
                 Defaults to None.
+            channel_rng (random.Random, optional): Random stream assigning edge channels.
+                Defaults to the global random module.
+            loss_rng (random.Random, optional): Random stream deciding link losses.
+                Defaults to the global random module.
         """
         self.nodes = {}
         self.edges = {}
+        self.edge_index = {} # (min node id, max node id) -> Edge
+        self.incident_edges = {} # node id -> list of Edges touching the node
+        self.next_hop_children = {} # next hop id -> {child id: number of routing table entries}
+        self.next_hop_counts = {} # next hop id -> number of routing table entries using it
+        self.index_lock = threading.Lock()
         self.routing_algorithm = routing_algorithm
+        self.channel_rng = channel_rng or rnd
+        self.loss_rng = loss_rng or rnd
+        self.clock = time.time
+        self.scheduler = None
+        self.ack_waiters = {} # (packet id, sender id, acker id) -> pending wait for the ACK of one hop
+        self.ack_lock = threading.Lock()
+        self.ack_stats = {'acked': 0, 'timeouts': 0, 'latency_total': 0.0, 'latency_max': 0.0}
+        self.link_event_stats = {'events': 0, 'routing_entries': 0, 'paths': 0}
+        self.monitor = CongestionMonitor(self)
+        self.hop_trace = None # HopTrace recording the hops of every DATA packet, None when off
+        
+    def attach_scheduler(self, scheduler):
+        """Switch the network to discrete-event mode.
+        
+        Node service, edge transmission, ACK waits and monitor ticks are then driven
+        by the scheduler's virtual clock instead of threads and sleeps.
+
+        Args:
+            scheduler (EventScheduler): The event scheduler providing the virtual clock
+        """
+        self.scheduler = scheduler
+        self.clock = scheduler.now
         
     def create_node(self, type):
         """Create a new node and add it to the network.
@@ -299,6 +764,7 @@ class Graph:
         """
         node = Node(node_id_manager(), type, network=self)
         self.nodes[node.id] = node
+        self.incident_edges[node.id] = []
         return node
     
     def add_edge(self, node_a, node_b, bandwidth, loss_rate):
@@ -313,22 +779,263 @@ class Graph:
         Returns:
             Edge: The newly created edge, or None if the nodes were already connected
         """
-        if node_b.id not in node_a.neighbors:
-            edge = Edge(edge_id_manager(), node_a, node_b, bandwidth, loss_rate)
+        key = self.edge_key(node_a.id, node_b.id)
+        if key not in self.edge_index:
+            edge = Edge(edge_id_manager(), node_a, node_b, bandwidth, loss_rate, self.channel_rng.randint(1,3))
             self.edges[edge.id] = edge
+            self.edge_index[key] = edge
+            self.incident_edges.setdefault(node_a.id, []).append(edge)
+            self.incident_edges.setdefault(node_b.id, []).append(edge)
             node_a.neighbors.append(node_b.id)
             node_b.neighbors.append(node_a.id)
             return edge
+
+    def add_bulk(self, node_types, edges):
+        """Create many nodes and the edges between them in one pass.
+
+        Gives the same network as create_node for every type followed by add_edge
+        for every edge, channels drawn in the same order, without the per-call
+        overhead of building a large topology one element at a time.
+
+        Args:
+            node_types (list): Type of every new node, in order
+            edges (iterable): (i, j, bandwidth, loss_rate, channel) tuples, i and j indexing
+                node_types, channel 0 or None to draw one like add_edge
+
+        Returns:
+            list: The new nodes, in the order of node_types
+        """
+        nodes = [Node(node_id_manager(), node_type, network=self) for node_type in node_types]
+        incident_edges = self.incident_edges
+        for node in nodes:
+            self.nodes[node.id] = node
+            incident_edges[node.id] = []
+
+        edge_index = self.edge_index
+        edge_key = self.edge_key
+        randint = self.channel_rng.randint
+        for i, j, bandwidth, loss_rate, channel in edges:
+            node_a = nodes[i]
+            node_b = nodes[j]
+            key = edge_key(node_a.id, node_b.id)
+            if key in edge_index:
+                continue
+            edge = Edge(edge_id_manager(), node_a, node_b, bandwidth, loss_rate, channel or randint(1,3))
+            self.edges[edge.id] = edge
+            edge_index[key] = edge
+            incident_edges[node_a.id].append(edge)
+            incident_edges[node_b.id].append(edge)
+            node_a.neighbors.append(node_b.id)
+            node_b.neighbors.append(node_a.id)
+        return nodes
+
+    def remove_edge(self, edge):
+        """Remove an edge from the network and the adjacency index.
+
+        Args:
+            edge (Edge): The edge to remove
+
+        Returns:
+            bool: True if the edge was removed, False if it was not part of the network
+        """
+        if self.edges.pop(edge.id, None) is None:
+            return False
+        self.edge_index.pop(self.edge_key(edge.src.id, edge.dest.id), None)
+        for node, other in ((edge.src, edge.dest), (edge.dest, edge.src)):
+            incident = self.incident_edges.get(node.id, [])
+            if edge in incident:
+                incident.remove(edge)
+            if other.id in node.neighbors:
+                node.neighbors.remove(other.id)
+        return True
+    
+    def set_edge_active(self, edge, active):
+        """Activate or deactivate an edge.
+        
+        Inactive edges stay in the adjacency index so lookups still find them, but
+        routing and forwarding skip them.
+
+        Args:
+            edge (Edge): The edge to update
+            active (bool): New state of the edge
+        """
+        edge.active = active
+    
+    def link_cost(self, edge):
+        """Return the cost of a link for the current routing algorithm, math.inf if it is down"""
+        if not edge.active:
+            return math.inf
+        if self.routing_algorithm is None:
+            return 1
+        return self.routing_algorithm.link_cost(edge)
+    
+    def link_down(self, edge):
+        """Take a link down and repair the routes that used it.
+
+        Args:
+            edge (Edge): The link going down
+
+        Returns:
+            dict: Report of the event, see repair_link
+        """
+        old_cost = self.link_cost(edge)
+        self.set_edge_active(edge, False)
+        return self.repair_link('down', edge, old_cost)
+    
+    def link_up(self, edge):
+        """Bring a link back up and move the routes that gain from it.
+
+        Args:
+            edge (Edge): The link coming up
+
+        Returns:
+            dict: Report of the event, see repair_link
+        """
+        old_cost = self.link_cost(edge)
+        self.set_edge_active(edge, True)
+        return self.repair_link('up', edge, old_cost)
+    
+    def set_link_quality(self, edge, bandwidth=None, loss_rate=None):
+        """Change the bandwidth or loss rate of a link and repair the affected routes.
+
+        Args:
+            edge (Edge): The link to update
+            bandwidth (float, optional): New bandwidth in Mbps. Defaults to unchanged.
+            loss_rate (float, optional): New loss probability (0-1). Defaults to unchanged.
+
+        Returns:
+            dict: Report of the event, see repair_link
+        """
+        old_cost = self.link_cost(edge)
+        if bandwidth is not None:
+            edge.bandwidth = bandwidth
+        if loss_rate is not None:
+            edge.loss_rate = loss_rate
+        return self.repair_link('quality', edge, old_cost)
+    
+    def repair_link(self, event, edge, old_cost):
+        """Update only the routing table entries and cached paths affected by a link event,
+        instead of rebuilding every table.
+
+        Args:
+            event (str): 'down', 'up' or 'quality'
+            edge (Edge): The link that changed, already in its new state
+            old_cost (float): Link cost before the change
+
+        Returns:
+            dict: event, edge ID, number of destinations repaired, routing table entries
+                changed and cached paths updated
+        """
+        routing_algorithm = self.routing_algorithm
+        report = repair_routes(self, edge, old_cost, self.link_cost,
+                               getattr(routing_algorithm, 'path_cache', None))
+        report = {'event': event, 'edge': edge.id, **report}
+        
+        self.link_event_stats['events'] += 1
+        self.link_event_stats['routing_entries'] += report['routing_entries']
+        self.link_event_stats['paths'] += report['paths']
+        # Cached WCETT-LB path metrics depend on the link state
+        lb_metrics = getattr(routing_algorithm, 'lb_metrics', None)
+        if lb_metrics is not None:
+            lb_metrics.refresh()
+        
+        logger.info(f"Link {edge.src.id}-{edge.dest.id} {event}: {report['routing_entries']} routing entries "
+                    f"and {report['paths']} cached paths updated for {report['destinations']} destinations")
+        return report
+    
+    @staticmethod
+    def edge_key(node_a_id, node_b_id):
+        """Return the adjacency index key for an unordered node pair.
+
+        Args:
+            node_a_id (int): ID of the first node
+            node_b_id (int): ID of the second node
+
+        Returns:
+            tuple: The node IDs in ascending order
+        """
+        if node_a_id <= node_b_id:
+            return (node_a_id, node_b_id)
+        return (node_b_id, node_a_id)
+    
+    def link_next_hop(self, node_id, next_hop_id):
+        """Record that a routing table entry of a node points at a next hop.
+
+        Args:
+            node_id (int): ID of the node owning the routing table entry
+            next_hop_id (int): ID of the next hop
+        """
+        with self.index_lock:
+            children = self.next_hop_children.setdefault(next_hop_id, {})
+            children[node_id] = children.get(node_id, 0) + 1
+            self.next_hop_counts[next_hop_id] = self.next_hop_counts.get(next_hop_id, 0) + 1
+    
+    def unlink_next_hop(self, node_id, next_hop_id):
+        """Remove a routing table entry of a node from the next-hop index.
+
+        Args:
+            node_id (int): ID of the node owning the routing table entry
+            next_hop_id (int): ID of the next hop
+        """
+        with self.index_lock:
+            children = self.next_hop_children.get(next_hop_id, {})
+            if children.get(node_id, 0) <= 1:
+                children.pop(node_id, None)
+            else:
+                children[node_id] -= 1
+            if self.next_hop_counts.get(next_hop_id, 0) <= 1:
+                self.next_hop_counts.pop(next_hop_id, None)
+            else:
+                self.next_hop_counts[next_hop_id] -= 1
+    
+    def get_children(self, node_id):
+        """Return the nodes that use a node as next hop for at least one destination.
+
+        Args:
+            node_id (int): ID of the next hop
+
+        Returns:
+            list: IDs of the nodes forwarding through node_id
+        """
+        with self.index_lock:
+            return list(self.next_hop_children.get(node_id, ()))
+    
+    def next_hop_count(self, node_id):
+        """Return how many routing table entries in the network point at a node.
+
+        Args:
+            node_id (int): ID of the next hop
+
+        Returns:
+            int: Number of routing table entries using node_id as next hop
+        """
+        return self.next_hop_counts.get(node_id, 0)
+    
+    def get_incident_edges(self, node_id):
+        """Return all edges touching a node.
+
+        Args:
+            node_id (int): ID of the node
+
+        Returns:
+            list: Edge objects connected to the node, including inactive ones
+        """
+        return self.incident_edges.get(node_id, [])
         
     def start_network(self):
-        """Start the operation of all nodes in the network.
+        """Start the operation of all nodes in the network and the congestion monitor.
         """
         for node in self.nodes.values():
             node.start_running()
+        self.monitor.start()
     
     def stop_network(self):
-        """Stop the operation of all nodes in the network.
+        """Stop the congestion monitor and the operation of all nodes in the network.
         """
+        self.monitor.stop()
+        # Let every processing loop wind down at once before joining them one by one
+        for node in self.nodes.values():
+            node.running = False
         for node in self.nodes.values():
             node.stop_running()
             
@@ -342,10 +1049,7 @@ class Graph:
         Returns:
             Edge: The edge object connecting the two nodes, or None if no such edge exists
         """
-        for edge in self.edges.values():
-            if (edge.src.id == node_a_id and edge.dest.id == node_b_id) or (edge.src.id == node_b_id and edge.dest.id == node_a_id):
-                return edge
-        return None
+        return self.edge_index.get(self.edge_key(node_a_id, node_b_id))
     
     def send_packet_graph(self, src_id, dest_id):
         """Send a packet from a source node to a destination node through the network
@@ -355,8 +1059,8 @@ class Graph:
             dest_id (int): ID of the destination node
 
         Returns:
-            dict: Result containing 'success' boolean and either 'reason' for failure
-                  or 'packet' object for successful delivery
+            dict: Result containing 'success' boolean, the 'packet' object once it was
+                  created and a 'reason' for failure
         """
         if src_id not in self.nodes or dest_id not in self.nodes:
             logger.error(f"Invalid node ID: {src_id} or {dest_id}")
@@ -379,42 +1083,271 @@ class Graph:
         
         while current_node.id != dest_id:
             if dest_id not in current_node.routing_table:
-                return {'success': False, 'reason': 'no_route_found'}
+                return {'success': False, 'reason': 'no_route_found', 'packet': packet}
             next_hop_id = current_node.routing_table[dest_id]
             next_node = self.nodes[next_hop_id]
             
             edge = self.get_edge_between_nodes(current_node.id, next_hop_id)
             if not edge:
-                return {'success': False, 'reason': 'nodes_not_connected'}
+                return {'success': False, 'reason': 'nodes_not_connected', 'packet': packet}
             
-            # Clear any old ACKs before sending
-            current_node.received_packets = [p for p in current_node.received_packets if p.type != 'ACK']
+            hop_trace = self.hop_trace
+            if hop_trace:
+                hop = hop_trace.begin(packet, current_node.id, next_hop_id, self.clock())
             
-            max_tries = 3
+            max_tries = MAX_SEND_TRIES
             for retry in range(max_tries):
+                # Registered before sending, the ACK can arrive before send_packet_edge returns
+                ack_received = self.expect_ack(packet, current_node, next_node)
                 send_result = edge.send_packet_edge(current_node, next_node, packet)
                 if send_result['success']:
+                    delivered = time.time()
                     packet.route_taken.append(next_hop_id)
-                    current_node.sent_packets[packet.id] = time.time()
-                    current_node = next_node
+                    current_node.stats.record_sent(packet, next_hop_id, self.clock())
                     
-                    # Wait for ACK
-                    ack_received = False
-                    start_time = time.time()
-                    while time.time() - start_time < 0.5: 
-                        if any(pkt.type == 'ACK' and 
-                              pkt.src_id == next_hop_id and
-                              pkt.dest_id == current_node.id
-                              for pkt in src.received_packets):
-                            ack_received = True
-                            break
-                        time.sleep(0.05)
+                    # Wait for the ACK, moving on without it after ACK_TIMEOUT
+                    if ack_received.wait(ACK_TIMEOUT):
+                        self.record_ack(time.time() - delivered)
+                        if hop_trace:
+                            hop.ack = self.clock()
+                    else:
+                        self.cancel_ack(packet, current_node, next_node)
+                        self.record_ack_timeout()
+                    if hop_trace:
+                        hop_trace.finish(packet, self.clock())
+                    current_node = next_node
                     break
+                if hop_trace:
+                    hop.failed(send_result['reason'])
+                self.cancel_ack(packet, current_node, next_node)
             else:
                 # If we couldn't send the packet at all, try again or fail
                 if retry == max_tries - 1:
-                    return send_result
+                    if hop_trace:
+                        hop_trace.finish(packet, self.clock(), delivered=False)
+                    return {**send_result, 'packet': packet}
     
         # If we reached here, the packet made it to the destination
         packet.delivered_time = time.time()
-        return {'success': True, 'packet': packet}
\ No newline at end of file
+        return {'success': True, 'packet': packet}
+    
+    def send_packet_event(self, src_id, dest_id, on_complete):
+        """Send a packet through the network in discrete-event mode.
+        
+        Follows the same hop logic as send_packet_graph, but every delay is an event
+        on the scheduler. The result is passed to on_complete once the packet is
+        delivered or dropped.
+
+        Args:
+            src_id (int): ID of the source node
+            dest_id (int): ID of the destination node
+            on_complete (callable): Called with the result dict of send_packet_graph
+        """
+        if src_id not in self.nodes or dest_id not in self.nodes:
+            logger.error(f"Invalid node ID: {src_id} or {dest_id}")
+            on_complete({'success': False, 'reason': 'invalid_node_id'})
+            return
+        
+        packet_id = packet_id_manager()
+        packet = Packet(packet_id, src_id, dest_id, PACKET_SIZE, "DATA")
+        packet.created_time = self.clock()
+        packet.route_taken.append(src_id)
+        self.event_hop(packet, self.nodes[src_id], dest_id, on_complete)
+    
+    def event_hop(self, packet, current_node, dest_id, on_complete):
+        """Forward a packet one hop from current_node (discrete-event mode).
+
+        Args:
+            packet (Packet): The packet in transit
+            current_node (Node): The node currently holding the packet
+            dest_id (int): ID of the destination node
+            on_complete (callable): Called with the final result dict
+        """
+        if current_node.id == dest_id:
+            packet.delivered_time = self.clock()
+            on_complete({'success': True, 'packet': packet})
+            return
+        if dest_id not in current_node.routing_table:
+            on_complete({'success': False, 'reason': 'no_route_found', 'packet': packet})
+            return
+        next_hop_id = current_node.routing_table[dest_id]
+        next_node = self.nodes[next_hop_id]
+        
+        edge = self.get_edge_between_nodes(current_node.id, next_hop_id)
+        if not edge:
+            on_complete({'success': False, 'reason': 'nodes_not_connected', 'packet': packet})
+            return
+        if self.hop_trace:
+            self.hop_trace.begin(packet, current_node.id, next_hop_id, self.clock())
+        self.event_attempt(packet, current_node, next_node, edge, dest_id, on_complete, 0)
+    
+    def event_attempt(self, packet, current_node, next_node, edge, dest_id, on_complete, retry):
+        """Try to transmit a packet over an edge (discrete-event mode).
+
+        Args:
+            packet (Packet): The packet in transit
+            current_node (Node): The sending node
+            next_node (Node): The receiving node
+            edge (Edge): The edge between the two nodes
+            dest_id (int): ID of the destination node
+            on_complete (callable): Called with the final result dict
+            retry (int): Number of failed attempts on this hop so far
+        """
+        failure = edge.check_send(current_node, next_node, packet)
+        if failure:
+            self.event_retry(packet, current_node, next_node, edge, dest_id, on_complete, retry, failure)
+            return
+        if packet.trace is not None:
+            packet.trace.tx_start = self.clock()
+        self.scheduler.schedule(edge.transmission_time(packet), self.event_deliver,
+                                packet, current_node, next_node, edge, dest_id, on_complete, retry)
+    
+    def event_retry(self, packet, current_node, next_node, edge, dest_id, on_complete, retry, failure):
+        """Retry a failed hop or give up after MAX_SEND_TRIES attempts (discrete-event mode).
+        """
+        if packet.trace is not None:
+            packet.trace.failed(failure['reason'])
+        if retry + 1 < MAX_SEND_TRIES:
+            self.event_attempt(packet, current_node, next_node, edge, dest_id, on_complete, retry + 1)
+        else:
+            if self.hop_trace:
+                self.hop_trace.finish(packet, self.clock(), delivered=False)
+            on_complete({**failure, 'packet': packet})
+    
+    def event_deliver(self, packet, current_node, next_node, edge, dest_id, on_complete, retry):
+        """Hand a transmitted packet to the receiving node's queue (discrete-event mode).
+        """
+        if packet.trace is not None:
+            packet.trace.tx_end = self.clock()
+        if not next_node.receive_message(packet, current_node):
+            self.event_retry(packet, current_node, next_node, edge, dest_id, on_complete, retry,
+                             {'success': False, 'reason': 'buffer_full'})
+            return
+        next_node.event_kick()
+        edge.record_sent(packet)
+        packet.route_taken.append(next_node.id)
+        current_node.stats.record_sent(packet, next_node.id, self.clock())
+        
+        key = (packet.id, current_node.id, next_node.id)
+        waiter = [None, packet, next_node, dest_id, on_complete, self.clock()]
+        waiter[0] = self.scheduler.schedule(ACK_TIMEOUT, self.event_ack_done, key, waiter)
+        self.ack_waiters[key] = waiter
+    
+    def event_ack_done(self, key, waiter):
+        """Continue forwarding after an ACK arrived or the wait timed out (discrete-event mode).
+        """
+        if key is not None:
+            self.ack_waiters.pop(key, None)
+            self.record_ack_timeout()
+        _, packet, next_node, dest_id, on_complete, _ = waiter
+        if self.hop_trace:
+            if key is None and packet.trace is not None:
+                packet.trace.ack = self.clock()
+            self.hop_trace.finish(packet, self.clock())
+        self.event_hop(packet, next_node, dest_id, on_complete)
+    
+    def expect_ack(self, packet, sender, acker):
+        """Register a wait for the ACK of one hop of a packet.
+
+        Args:
+            packet (Packet): The packet being sent
+            sender (Node): The node sending the packet and waiting for the ACK
+            acker (Node): The node receiving the packet and sending the ACK
+
+        Returns:
+            threading.Event: Set as soon as the sender receives the ACK
+        """
+        ack_received = threading.Event()
+        with self.ack_lock:
+            self.ack_waiters[(packet.id, sender.id, acker.id)] = ack_received
+        return ack_received
+    
+    def cancel_ack(self, packet, sender, acker):
+        """Remove the wait for the ACK of one hop, after a failed send or a timeout.
+
+        Args:
+            packet (Packet): The packet being sent
+            sender (Node): The node sending the packet
+            acker (Node): The node the packet was sent to
+        """
+        with self.ack_lock:
+            self.ack_waiters.pop((packet.id, sender.id, acker.id), None)
+    
+    def ack_arrived(self, node, ack):
+        """Wake the hop waiting for an ACK that node just received.
+
+        Args:
+            node (Node): The node that received the ACK
+            ack (Packet): The ACK packet
+        """
+        with self.ack_lock:
+            waiter = self.ack_waiters.pop((ack.ack_for, node.id, ack.src_id), None)
+        if waiter is None:
+            # The hop already stopped waiting
+            return
+        if self.scheduler:
+            waiter[0].cancel()
+            self.record_ack(self.clock() - waiter[5])
+            self.scheduler.schedule(0, self.event_ack_done, None, waiter)
+        else:
+            waiter.set()
+    
+    def record_ack(self, latency):
+        """Record the time between handing a packet to the next hop and receiving its ACK.
+
+        Args:
+            latency (float): ACK latency in seconds
+        """
+        with self.ack_lock:
+            self.ack_stats['acked'] += 1
+            self.ack_stats['latency_total'] += latency
+            self.ack_stats['latency_max'] = max(self.ack_stats['latency_max'], latency)
+    
+    def record_ack_timeout(self):
+        """Record a hop that moved on without receiving its ACK.
+        """
+        with self.ack_lock:
+            self.ack_stats['timeouts'] += 1
+    
+    def ack_report(self):
+        """Summarise the per-hop ACK latency.
+
+        Returns:
+            dict: Number of ACKed hops and timeouts, and the mean and max ACK latency in seconds
+        """
+        with self.ack_lock:
+            stats = dict(self.ack_stats)
+        acked = stats['acked']
+        return {
+            'acked': acked,
+            'timeouts': stats['timeouts'],
+            'mean_latency': stats['latency_total'] / acked if acked else 0.0,
+            'max_latency': stats['latency_max']
+        }
+    
+    def packet_counters(self):
+        """Sum the packet counters of all nodes.
+
+        Returns:
+            dict: received, acks_received, sent, acked and dropped (reason -> count)
+        """
+        totals = {'received': 0, 'acks_received': 0, 'sent': 0, 'acked': 0, 'dropped': {}}
+        for node in self.nodes.values():
+            counters = node.stats.counters()
+            for key in ('received', 'acks_received', 'sent', 'acked'):
+                totals[key] += counters[key]
+            for reason, count in counters['dropped'].items():
+                totals['dropped'][reason] = totals['dropped'].get(reason, 0) + count
+        return totals
+    
+    def event_monitor(self, until):
+        """Run a congestion monitor tick on every node and reschedule (discrete-event mode).
+
+        Like the real-time monitor thread, every tick refreshes the WCETT-LB metrics snapshot.
+
+        Args:
+            until (float): Virtual time after which no further ticks are scheduled
+        """
+        self.monitor.tick()
+        if self.clock() + self.monitor.interval < until:
+            self.scheduler.schedule(self.monitor.interval, self.event_monitor, until)
@@ -6,15 +6,21 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import network as nt
 import visualiser as vis
 
-def initialize_network():
+def initialize_network(channel_rng=None, loss_rng=None):
     """
     Creates a larger network with strategic bottlenecks and diverse link
     characteristics to showcase load balancing benefits.
     
+    Args:
+        channel_rng (random.Random, optional): Random stream assigning edge channels.
+            Defaults to the global random module.
+        loss_rng (random.Random, optional): Random stream deciding link losses.
+            Defaults to the global random module.
+    
     Returns:
         Network: A Network object containing all nodes and edges.
     """
-    network = nt.Graph()
+    network = nt.Graph(channel_rng=channel_rng, loss_rng=loss_rng)
 
     igw0 = network.create_node("IGW")
     igw1 = network.create_node("IGW")
@@ -0,0 +1,390 @@
+import sys
+import os
+import math
+import random as rnd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import network as nt
+from utils import gc_paused
+
+# Link characteristics drawn uniformly from these ranges, matching the hand-built topologies
+BACKBONE_BANDWIDTH = (25, 200) # Mbps
+BACKBONE_LOSS = (0.01, 0.1)
+CLIENT_BANDWIDTH = (30, 60)
+CLIENT_LOSS = (0.1, 0.2)
+CHANNEL_ASSIGNMENTS = ('random', 'greedy')
+
+def build_mesh(backbone_count, backbone_links, igw_count=1, client_count=None, client_links=2,
+               bandwidth=BACKBONE_BANDWIDTH, loss=BACKBONE_LOSS, client_bandwidth=CLIENT_BANDWIDTH,
+               client_loss=CLIENT_LOSS, channels=3, channel_assignment='random', rng=None,
+               channel_rng=None, loss_rng=None):
+    """
+    Creates a mesh network from a backbone described as index pairs.
+
+    The backbone nodes become IGWs and MRs, then clients are attached to an MR
+    and to MRs neighbouring it.
+
+    Args:
+        backbone_count (int): Number of IGW and MR nodes.
+        backbone_links (list): (i, j) pairs of backbone node indices to connect.
+        igw_count (int, optional): Number of backbone nodes acting as gateway. Defaults to 1.
+        client_count (int, optional): Number of client nodes. Defaults to half the backbone.
+        client_links (int, optional): Number of MRs each client connects to. Defaults to 2.
+        bandwidth (tuple, optional): (min, max) bandwidth of backbone links in Mbps.
+        loss (tuple, optional): (min, max) loss rate of backbone links.
+        client_bandwidth (tuple, optional): (min, max) bandwidth of client links in Mbps.
+        client_loss (tuple, optional): (min, max) loss rate of client links.
+        channels (int, optional): Number of radio channels. Defaults to 3.
+        channel_assignment (str, optional): 'random' draws every channel, 'greedy' picks the
+            channel least used by the links already at both endpoints. Defaults to 'random'.
+        rng (random.Random, optional): Random stream for the layout and link characteristics.
+            Defaults to the global random module.
+        channel_rng (random.Random, optional): Random stream assigning edge channels.
+            Defaults to the global random module.
+        loss_rng (random.Random, optional): Random stream deciding link losses.
+            Defaults to the global random module.
+
+    Returns:
+        Network: A Network object containing all nodes and edges.
+    """
+    rng = rng or rnd
+    if not 0 < igw_count <= backbone_count:
+        raise ValueError(f"igw_count must be between 1 and {backbone_count}, got {igw_count}")
+    if channel_assignment not in CHANNEL_ASSIGNMENTS:
+        raise ValueError(f"Unknown channel assignment {channel_assignment!r}, expected one of {CHANNEL_ASSIGNMENTS}")
+    if client_count is None:
+        client_count = backbone_count // 2
+
+    with gc_paused():
+        return _populate(backbone_count, backbone_links, igw_count, client_count, client_links, bandwidth, loss,
+                         client_bandwidth, client_loss, channels, channel_assignment, rng, channel_rng, loss_rng)
+
+def _populate(backbone_count, backbone_links, igw_count, client_count, client_links, bandwidth, loss,
+              client_bandwidth, client_loss, channels, channel_assignment, rng, channel_rng, loss_rng):
+    """Lays out the nodes and edges of build_mesh, then creates them with Graph.add_bulk"""
+    network = nt.Graph(channel_rng=channel_rng, loss_rng=loss_rng)
+    gateways = set(rng.sample(range(backbone_count), igw_count))
+    node_types = ["IGW" if i in gateways else "MR" for i in range(backbone_count)]
+    neighbours = [[] for _ in range(backbone_count)]
+    edges = [] # (i, j, bandwidth, loss, channel) indexing node_types, channel 0 is drawn by add_bulk
+    linked = set()
+    greedy = channel_assignment == 'greedy'
+    usage = [] # per node, incident links on every channel, for greedy assignment
+
+    def connect(i, j, bw_range, loss_range):
+        bw = rng.uniform(*bw_range)
+        loss_rate = rng.uniform(*loss_range)
+        key = (i, j) if i < j else (j, i)
+        if key in linked:
+            return
+        linked.add(key)
+        if greedy:
+            # The channel least used by the links already at both endpoints, the lowest on a tie
+            usage_a = usage[i]
+            usage_b = usage[j]
+            best = 0
+            best_load = usage_a[0] + usage_b[0]
+            for c in range(1, channels):
+                load = usage_a[c] + usage_b[c]
+                if load < best_load:
+                    best, best_load = c, load
+            usage_a[best] += 1
+            usage_b[best] += 1
+            channel = best + 1
+        elif channels != 3:
+            channel = network.channel_rng.randint(1, channels)
+        else:
+            channel = 0
+        edges.append((i, j, bw, loss_rate, channel))
+
+    if greedy:
+        usage = [[0] * channels for _ in range(backbone_count + client_count)]
+    for i, j in backbone_links:
+        connect(i, j, bandwidth, loss)
+        neighbours[i].append(j)
+        neighbours[j].append(i)
+
+    routers = [i for i in range(backbone_count) if i not in gateways] or list(range(backbone_count))
+    for _ in range(client_count):
+        client = len(node_types)
+        node_types.append("C")
+        first = rng.choice(routers)
+        attach = [first]
+        # Further links go to MRs around the first one, like a client in range of several routers
+        nearby = [i for i in neighbours[first] if i not in gateways]
+        rng.shuffle(nearby)
+        attach.extend(nearby[:client_links - 1])
+        for i in attach:
+            connect(client, i, client_bandwidth, client_loss)
+
+    network.add_bulk(node_types, edges)
+    return network
+
+def grid_links(rows, cols):
+    """
+    Args:
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+
+    Returns:
+        list: (i, j) index pairs connecting every node to its right and lower neighbour
+    """
+    links = []
+    for r in range(rows):
+        for c in range(cols):
+            i = r * cols + c
+            if c + 1 < cols:
+                links.append((i, i + 1))
+            if r + 1 < rows:
+                links.append((i, i + cols))
+    return links
+
+def random_geometric_links(node_count, mean_degree=6, rng=None):
+    """
+    Places nodes uniformly in the unit square and links every pair within radio range.
+
+    Pairs are found through a spatial hash with cells as wide as the range, so only
+    nodes in neighbouring cells are compared. Components left disconnected are joined
+    to the nearest node of the largest component, so every node can reach a gateway.
+
+    Args:
+        node_count (int): Number of nodes.
+        mean_degree (float, optional): Expected number of links per node. Defaults to 6.
+        rng (random.Random, optional): Random stream for the positions. Defaults to the global random module.
+
+    Returns:
+        list: (i, j) index pairs of linked nodes
+    """
+    rng = rng or rnd
+    radius = math.sqrt(mean_degree / (math.pi * max(node_count, 1)))
+    radius_sq = radius * radius
+    positions = [(rng.random(), rng.random()) for _ in range(node_count)]
+
+    cells = {}
+    for i, (x, y) in enumerate(positions):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+
+    links = []
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                others = cells.get((cx + dx, cy + dy))
+                if not others:
+                    continue
+                for i in members:
+                    xi, yi = positions[i]
+                    for j in others:
+                        if i < j:
+                            xj, yj = positions[j]
+                            if (xi - xj) ** 2 + (yi - yj) ** 2 <= radius_sq:
+                                links.append((i, j))
+
+    parent = list(range(node_count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in links:
+        parent[find(i)] = find(j)
+    components = {}
+    for i in range(node_count):
+        components.setdefault(find(i), []).append(i)
+    if len(components) <= 1:
+        return links
+
+    giant = max(components.values(), key=len)
+    giant_root = find(giant[0])
+    grid_size = int(1 / radius) + 1
+    for root, members in components.items():
+        if root == giant_root:
+            continue
+        # Search rings of cells around the first member until a giant component node is found
+        i = members[0]
+        xi, yi = positions[i]
+        cx, cy = int(xi / radius), int(yi / radius)
+        best = None
+        for ring in range(grid_size + 1):
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) != ring:
+                        continue
+                    for j in cells.get((gx, gy), ()):
+                        if find(j) == giant_root:
+                            dist = (xi - positions[j][0]) ** 2 + (yi - positions[j][1]) ** 2
+                            if best is None or dist < best[0]:
+                                best = (dist, j)
+            # A node in the next ring can still be closer than one found in a corner of this ring
+            if best is not None and best[0] <= (ring * radius) ** 2:
+                break
+        links.append((i, best[1]))
+    return links
+
+def scale_free_links(node_count, links_per_node=2, rng=None):
+    """
+    Grows a scale-free backbone by preferential attachment (Barabasi-Albert).
+
+    Args:
+        node_count (int): Number of nodes.
+        links_per_node (int, optional): Links added by every new node. Defaults to 2.
+        rng (random.Random, optional): Random stream for the attachment. Defaults to the global random module.
+
+    Returns:
+        list: (i, j) index pairs of linked nodes
+    """
+    rng = rng or rnd
+    seed_count = min(links_per_node + 1, node_count)
+    links = [(i, j) for i in range(seed_count) for j in range(i + 1, seed_count)]
+    # Every node appears once per link, so a uniform pick is proportional to degree
+    endpoints = [i for link in links for i in link]
+    for new in range(seed_count, node_count):
+        targets = set()
+        while len(targets) < links_per_node:
+            targets.add(rng.choice(endpoints))
+        for target in targets:
+            links.append((target, new))
+            endpoints.extend((target, new))
+    return links
+
+def grid_network(rows, cols, **options):
+    """
+    Creates a rows x cols grid backbone, every MR linked to its four neighbours.
+
+    Args:
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        **options: Role counts, link characteristics and random streams, see build_mesh.
+
+    Returns:
+        Network: A Network object containing all nodes and edges.
+    """
+    return build_mesh(rows * cols, grid_links(rows, cols), **options)
+
+def random_geometric_network(node_count, mean_degree=6, **options):
+    """
+    Creates a random geometric backbone of nodes in radio range of each other.
+
+    Args:
+        node_count (int): Number of IGW and MR nodes.
+        mean_degree (float, optional): Expected number of backbone links per node. Defaults to 6.
+        **options: Role counts, link characteristics and random streams, see build_mesh.
+
+    Returns:
+        Network: A Network object containing all nodes and edges.
+    """
+    return build_mesh(node_count, random_geometric_links(node_count, mean_degree, options.get('rng')), **options)
+
+def scale_free_network(node_count, links_per_node=2, **options):
+    """
+    Creates a scale-free backbone with a few highly connected hubs.
+
+    Args:
+        node_count (int): Number of IGW and MR nodes.
+        links_per_node (int, optional): Links added by every new node. Defaults to 2.
+        **options: Role counts, link characteristics and random streams, see build_mesh.
+
+    Returns:
+        Network: A Network object containing all nodes and edges.
+    """
+    return build_mesh(node_count, scale_free_links(node_count, links_per_node, options.get('rng')), **options)
+
+GENERATORS = {
+    'grid': grid_network,
+    'geometric': random_geometric_network,
+    'scalefree': scale_free_network
+}
+# Short option names accepted in a topology spec
+SPEC_OPTIONS = {
+    'igw': 'igw_count',
+    'clients': 'client_count',
+    'client_links': 'client_links',
+    'degree': 'mean_degree',
+    'links': 'links_per_node',
+    'channels': 'channels',
+    'assign': 'channel_assignment'
+}
+MESH_OPTIONS = ('igw', 'clients', 'client_links', 'channels', 'assign') # passed on to build_mesh
+# Spec options each generator accepts
+GENERATOR_OPTIONS = {
+    'grid': MESH_OPTIONS,
+    'geometric': MESH_OPTIONS + ('degree',),
+    'scalefree': MESH_OPTIONS + ('links',)
+}
+
+def parse_spec(spec):
+    """
+    Parses a topology spec such as "grid:100x100,igw=4,clients=500",
+    "geometric:10000,degree=8" or "scalefree:10000,links=2,assign=greedy".
+
+    The options and their values are validated here, so a bad spec is rejected
+    before any network is built.
+
+    Args:
+        spec (str): The topology spec.
+
+    Returns:
+        tuple: (generator function, positional args, keyword args)
+
+    Raises:
+        ValueError: If the kind, size or an option of the spec is invalid.
+    """
+    kind, _, rest = spec.partition(':')
+    if kind not in GENERATORS or not rest:
+        raise ValueError(f"Invalid topology spec {spec!r}, expected <{'|'.join(GENERATORS)}>:<size>[,key=value...]")
+    size, *options = rest.split(',')
+    try:
+        if kind == 'grid':
+            args = tuple(int(n) for n in size.split('x'))
+            if len(args) != 2:
+                raise ValueError
+        else:
+            args = (int(size),)
+    except ValueError:
+        raise ValueError(f"Invalid size {size!r} in topology spec {spec!r}") from None
+    if min(args) < 1:
+        raise ValueError(f"Invalid size {size!r} in topology spec {spec!r}, sizes must be positive")
+    backbone_count = math.prod(args)
+
+    kwargs = {}
+    for option in options:
+        key, _, value = option.partition('=')
+        if key not in GENERATOR_OPTIONS[kind] or not value:
+            raise ValueError(f"Invalid option {option!r} in topology spec {spec!r}, "
+                             f"expected one of {list(GENERATOR_OPTIONS[kind])}")
+        if key == 'assign':
+            if value not in CHANNEL_ASSIGNMENTS:
+                raise ValueError(f"Invalid option {option!r} in topology spec {spec!r}, "
+                                 f"expected one of {CHANNEL_ASSIGNMENTS}")
+            kwargs[SPEC_OPTIONS[key]] = value
+            continue
+        try:
+            number = float(value) if key == 'degree' else int(value)
+        except ValueError:
+            raise ValueError(f"Invalid option {option!r} in topology spec {spec!r}, expected a number") from None
+        if key == 'igw' and not 1 <= number <= backbone_count:
+            raise ValueError(f"Invalid option {option!r} in topology spec {spec!r}, "
+                             f"igw must be between 1 and {backbone_count}")
+        # Only the client count may be zero
+        if number < 0 or (number == 0 and key != 'clients'):
+            raise ValueError(f"Invalid option {option!r} in topology spec {spec!r}, expected a positive number")
+        kwargs[SPEC_OPTIONS[key]] = number
+    return GENERATORS[kind], args, kwargs
+
+def build_topology(spec, rng=None, channel_rng=None, loss_rng=None):
+    """
+    Creates a synthetic network from a topology spec, see parse_spec.
+
+    Args:
+        spec (str): The topology spec.
+        rng (random.Random, optional): Random stream for the layout and link characteristics.
+        channel_rng (random.Random, optional): Random stream assigning edge channels.
+        loss_rng (random.Random, optional): Random stream deciding link losses.
+
+    Returns:
+        Network: A Network object containing all nodes and edges.
+    """
+    generator, args, kwargs = parse_spec(spec)
+    return generator(*args, rng=rng, channel_rng=channel_rng, loss_rng=loss_rng, **kwargs)
@@ -0,0 +1,328 @@
+import sys
+import os
+import argparse
+import csv
+import hashlib
+import json
+import random as rnd
+import zipfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import network as nt
+from log_config import get_logger, setup_logging
+from utils import atomic_write, gc_paused
+
+logger = get_logger("topology_file")
+
+TOPOLOGY_FORMATS = ('.json', '.csv')
+NODE_TYPES = ('IGW', 'MR', 'C') # gateways, mesh routers and clients
+CSV_COLUMNS = ('src', 'src_type', 'dest', 'dest_type', 'bandwidth', 'loss') # required, channel is optional
+COMPILED_VERSION = 2 # bump when the compiled arrays or their validation change, old cache files are then ignored
+CACHE_DIR_NAME = '.topology_cache' # created next to the topology file
+HASH_CHUNK = 1 << 20 # bytes read at a time when hashing a topology file
+
+def is_topology_file(value):
+    """Return True if value names a topology file by its extension"""
+    return isinstance(value, str) and os.path.splitext(value)[1].lower() in TOPOLOGY_FORMATS
+
+def file_hash(path):
+    """
+    Args:
+        path (str): A topology file
+
+    Returns:
+        str: Hex SHA-256 of the file contents and COMPILED_VERSION
+    """
+    digest = hashlib.sha256(f"topology/{COMPILED_VERSION}/".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class TopologyBuilder:
+    def __init__(self, path):
+        """Collects the nodes and edges of a topology file as they are parsed
+
+        Args:
+            path (str): File being parsed, for error messages
+        """
+        self.path = path
+        self.names = {} # node name -> index
+        self.types = [] # node type per index
+        self.edges = [] # (src index, dest index, bandwidth, loss, channel)
+
+    def error(self, where, message):
+        return ValueError(f"{self.path}: {where}: {message}")
+
+    def add_node(self, name, node_type, where):
+        """Return the index of a node, creating it the first time its name is seen"""
+        name = str(name)
+        if not node_type:
+            raise self.error(where, f"node {name!r} has no type")
+        if node_type not in NODE_TYPES:
+            raise self.error(where, f"node {name!r} has unknown type {node_type!r}, expected one of {NODE_TYPES}")
+        index = self.names.get(name)
+        if index is None:
+            index = self.names[name] = len(self.types)
+            self.types.append(node_type)
+        elif self.types[index] != node_type:
+            raise self.error(where, f"node {name!r} is both {self.types[index]} and {node_type}")
+        return index
+
+    def node_index(self, name, where):
+        """Return the index of a node referenced by its name or its position in the node list"""
+        index = self.names.get(str(name))
+        if index is None and isinstance(name, int) and 0 <= name < len(self.types):
+            index = name
+        if index is None:
+            raise self.error(where, f"unknown node {name!r}")
+        return index
+
+    def add_edge(self, src, dest, bandwidth, loss, channel, where):
+        try:
+            bandwidth = float(bandwidth)
+            loss = float(loss)
+            channel = int(channel) if channel not in (None, '') else 0
+        except (TypeError, ValueError):
+            raise self.error(where, "bandwidth, loss and channel must be numbers") from None
+        if src == dest:
+            raise self.error(where, "an edge must connect two different nodes")
+        if bandwidth <= 0:
+            raise self.error(where, f"bandwidth must be positive, got {bandwidth}")
+        if not 0 <= loss <= 1:
+            raise self.error(where, f"loss must be between 0 and 1, got {loss}")
+        if channel < 0:
+            raise self.error(where, f"channel must be positive, got {channel}")
+        self.edges.append((src, dest, bandwidth, loss, channel))
+
+    def compile(self):
+        """
+        Returns:
+            dict: The topology as NumPy arrays, node types stored as codes into type_names
+        """
+        type_names = sorted(set(self.types))
+        codes = {name: code for code, name in enumerate(type_names)}
+        edges = np.array(self.edges, dtype=[('src', '<i4'), ('dest', '<i4'), ('bandwidth', '<f8'),
+                                            ('loss', '<f8'), ('channel', '<i2')])
+        return {
+            'version': np.int32(COMPILED_VERSION),
+            'type_names': np.array(type_names, dtype=str),
+            'node_type': np.array([codes[node_type] for node_type in self.types], dtype=np.int16),
+            'edge_src': edges['src'],
+            'edge_dest': edges['dest'],
+            'bandwidth': edges['bandwidth'],
+            'loss': edges['loss'],
+            'channel': edges['channel'] # 0 = drawn from the channel stream when the network is built
+        }
+
+def parse_json(path):
+    """
+    Parse a JSON topology file.
+
+    {"nodes": [{"name": "igw", "type": "IGW"}, ...],
+     "edges": [{"src": "igw", "dest": "mr1", "bandwidth": 200, "loss": 0.01, "channel": 1}, ...]}
+
+    A node without a name is named after its position in the list, and edges may
+    refer to nodes by name or by position. The channel of an edge is optional.
+
+    Args:
+        path (str): The topology file
+
+    Returns:
+        dict: Compiled topology, see TopologyBuilder.compile
+    """
+    with open(path) as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"{path}: invalid JSON: {e}") from None
+    builder = TopologyBuilder(path)
+    if not isinstance(data, dict) or not isinstance(data.get('nodes'), list) or not isinstance(data.get('edges'), list):
+        raise ValueError(f"{path}: expected an object with 'nodes' and 'edges' lists")
+    for position, node in enumerate(data['nodes']):
+        where = f"node {position}"
+        if not isinstance(node, dict):
+            raise builder.error(where, "expected an object with a type")
+        index = builder.add_node(node.get('name', position), node.get('type'), where)
+        if index != position:
+            raise builder.error(where, f"duplicate node name {node.get('name')!r}")
+    for position, edge in enumerate(data['edges']):
+        where = f"edge {position}"
+        try:
+            src, dest, bandwidth, loss = edge['src'], edge['dest'], edge['bandwidth'], edge['loss']
+        except (TypeError, KeyError):
+            raise builder.error(where, "expected an object with src, dest, bandwidth and loss") from None
+        builder.add_edge(builder.node_index(src, where), builder.node_index(dest, where), bandwidth, loss,
+                         edge.get('channel'), where)
+    return builder.compile()
+
+def parse_csv(path):
+    """
+    Parse a CSV edge list, one edge per row under a header naming the columns:
+    src, src_type, dest, dest_type, bandwidth, loss and optionally channel.
+    Nodes are numbered in the order they first appear.
+
+    Args:
+        path (str): The topology file
+
+    Returns:
+        dict: Compiled topology, see TopologyBuilder.compile
+    """
+    builder = TopologyBuilder(path)
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"{path}: missing CSV columns {missing}, expected {list(CSV_COLUMNS)} and optionally channel")
+        for row in reader:
+            where = f"line {reader.line_num}"
+            src = builder.add_node(row['src'], row['src_type'], where)
+            dest = builder.add_node(row['dest'], row['dest_type'], where)
+            builder.add_edge(src, dest, row['bandwidth'], row['loss'], row.get('channel'), where)
+    return builder.compile()
+
+PARSERS = {
+    '.json': parse_json,
+    '.csv': parse_csv
+}
+
+def compile_topology(path, cache_dir=None, use_cache=True):
+    """
+    Return the compiled form of a topology file, parsing it only on a cache miss.
+
+    Compiled topologies are saved as uncompressed .npz files named by file_hash, so
+    any edit of the file gives a new cache entry and loading an unchanged file skips
+    parsing and validation.
+
+    Args:
+        path (str): The topology file
+        cache_dir (str, optional): Directory of the compiled files. Defaults to CACHE_DIR_NAME next to the file.
+        use_cache (bool, optional): Read and write the cache. Defaults to True.
+
+    Returns:
+        dict: Compiled topology, see TopologyBuilder.compile
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in PARSERS:
+        raise ValueError(f"Unknown topology file format {extension!r}, expected one of {TOPOLOGY_FORMATS}")
+    if not use_cache:
+        return PARSERS[extension](path)
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    cache_path = os.path.join(cache_dir, f"{file_hash(path)}.npz")
+    try:
+        with np.load(cache_path) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        pass
+
+    compiled = PARSERS[extension](path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with atomic_write(cache_path, 'wb') as f:
+            np.savez(f, **compiled)
+    except OSError as e:
+        logger.warning(f"Could not cache the compiled topology of {path}: {e}")
+    return compiled
+
+def build_network(compiled, channel_rng=None, loss_rng=None):
+    """
+    Create the network of a compiled topology with Graph.add_bulk.
+
+    Args:
+        compiled (dict): Compiled topology, see TopologyBuilder.compile
+        channel_rng (random.Random, optional): Random stream assigning the channels the file leaves open.
+            Defaults to the global random module.
+        loss_rng (random.Random, optional): Random stream deciding link losses.
+            Defaults to the global random module.
+
+    Returns:
+        Network: A Network object containing all nodes and edges.
+    """
+    network = nt.Graph(channel_rng=channel_rng, loss_rng=loss_rng)
+    node_types = compiled['type_names'][compiled['node_type']].tolist()
+    edges = zip(compiled['edge_src'].tolist(), compiled['edge_dest'].tolist(), compiled['bandwidth'].tolist(),
+                compiled['loss'].tolist(), compiled['channel'].tolist())
+    with gc_paused():
+        network.add_bulk(node_types, edges)
+    return network
+
+def load_topology(path, channel_rng=None, loss_rng=None, cache_dir=None, use_cache=True):
+    """
+    Creates the network described by a topology file.
+
+    Args:
+        path (str): A .json or .csv topology file, see parse_json and parse_csv
+        channel_rng (random.Random, optional): Random stream assigning the channels the file leaves open.
+        loss_rng (random.Random, optional): Random stream deciding link losses.
+        cache_dir (str, optional): Directory of the compiled files, see compile_topology.
+        use_cache (bool, optional): Read and write the compiled cache. Defaults to True.
+
+    Returns:
+        Network: A Network object containing all nodes and edges.
+    """
+    return build_network(compile_topology(path, cache_dir, use_cache), channel_rng, loss_rng)
+
+def save_topology(network, path, channels=True):
+    """
+    Write a network as a topology file, JSON or CSV by the extension of path.
+
+    Nodes are named after their type and ID, e.g. "mr4".
+
+    Args:
+        network (Graph): The network to save
+        path (str): File to write
+        channels (bool, optional): Save the edge channels. Without them the channels are
+            drawn again whenever the file is loaded. Defaults to True.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in PARSERS:
+        raise ValueError(f"Unknown topology file format {extension!r}, expected one of {TOPOLOGY_FORMATS}")
+    names = {node_id: f"{node.type.lower()}{node_id}" for node_id, node in network.nodes.items()}
+    edges = [network.edges[edge_id] for edge_id in sorted(network.edges)]
+
+    if extension == '.json':
+        nodes = [{'name': names[node_id], 'type': network.nodes[node_id].type} for node_id in sorted(network.nodes)]
+        edges = [{'src': names[edge.src.id], 'dest': names[edge.dest.id], 'bandwidth': edge.bandwidth,
+                  'loss': edge.loss_rate, **({'channel': edge.channel} if channels else {})} for edge in edges]
+        # One node or edge per line, readable and diffable even for large meshes
+        lines = lambda items: '[' + ','.join('\n  ' + json.dumps(item) for item in items) + ('\n ]' if items else ']')
+        with open(path, 'w') as f:
+            f.write(f'{{\n "nodes": {lines(nodes)},\n "edges": {lines(edges)}\n}}\n')
+        return
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS + (('channel',) if channels else ()))
+        for edge in edges:
+            writer.writerow([names[edge.src.id], edge.src.type, names[edge.dest.id], edge.dest.type, edge.bandwidth,
+                             edge.loss_rate] + ([edge.channel] if channels else []))
+
+def main():
+    parser = argparse.ArgumentParser(description='Save a built-in, synthetic or file topology as a topology file')
+    parser.add_argument('source', help='0 (small), 1 (big), a synthetic spec such as grid:100x100,igw=4, '
+                                       'or a topology file')
+    parser.add_argument('output', help='Topology file to write, .json or .csv')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='Seed of the layout and channels')
+    parser.add_argument('--no-channels', action='store_true',
+                        help='Leave the channels out, they are then drawn whenever the file is loaded')
+    args = parser.parse_args()
+
+    rng = rnd.Random(args.seed) if args.seed is not None else rnd
+    if args.source in ('0', '1'):
+        from networks import complex_network, advanced_network
+        network = (complex_network if args.source == '0' else advanced_network).initialize_network(rng, rng)
+    elif is_topology_file(args.source):
+        network = load_topology(args.source, rng, rng)
+    else:
+        from networks import generated_network
+        network = generated_network.build_topology(args.source, rng, rng, rng)
+    save_topology(network, args.output, channels=not args.no_channels)
+    logger.info(f"Saved {len(network.nodes)} nodes and {len(network.edges)} edges to {args.output}")
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
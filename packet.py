@@ -1,6 +1,10 @@
 import time
+from array import array
 
 class Packet:
+    __slots__ = ('id', 'src_id', 'dest_id', 'size', 'type', 'time', 'route_taken',
+                 'created_time', 'delivered_time', 'ack_for', 'trace')
+    
     def __init__(self, packet_id, src_id, dest_id, size, packet_type="DATA"):
         """
         Args:
@@ -14,13 +18,23 @@ class Packet:
         self.dest_id = dest_id
         self.size = size
         self.type = packet_type
-        self.time = time.time()
-        self.route_taken = []
-        self.created_time = time.time()
+        now = time.time()
+        self.time = now
+        self.route_taken = array('i') # node IDs visited so far
+        self.created_time = now
         self.delivered_time = None
+        self.ack_for = None # ID of the packet an ACK acknowledges
+        self.trace = None # HopRecord of the current hop while hop tracing is on
         
     def add_hop(self, node_id):
         self.route_taken.append(node_id)
     
-    def create_ack(self):
-        return Packet(self.dest,self.src, None, "ACK")
\ No newline at end of file
+    def create_ack(self, packet_id, acker_id):
+        """
+        Args:
+            packet_id (int): ID of the new ACK packet
+            acker_id (int): ID of the node acknowledging this packet
+        """
+        ack = Packet(packet_id, acker_id, self.src_id, 64, "ACK")
+        ack.ack_for = self.id
+        return ack
@@ -0,0 +1,246 @@
+import os
+import re
+import threading
+
+import numpy as np
+
+from latency_histogram import LatencyHistogram
+
+# Outcome codes of the outcome column, pending for packets still in flight when the run ended
+OUTCOMES = ('pending', 'delivered', 'packet_loss', 'buffer_full', 'edge_inactive', 'no_route_found',
+            'nodes_not_connected', 'invalid_node_id', 'invalid_src', 'invalid_dest', 'other')
+OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOMES)}
+# Columns of a packet file, in file order
+COLUMNS = (
+    ('id', np.int64),
+    ('src', np.int32),
+    ('dest', np.int32),
+    ('size', np.int32),
+    ('created', np.float64),
+    ('delivered', np.float64),
+    ('hops', np.int16),
+    ('success', np.bool_),
+    ('outcome', np.int8)
+)
+MAGIC = b'PKTTABLE'
+VERSION = 1
+HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('columns', '<u4'), ('rows', '<u8'), ('start', '<f8')])
+COLUMN_ALIGN = 8 # bytes, every column starts on a multiple
+PACKET_FILE_PATTERN = re.compile(r'packets_(.+)_([\d.]+)pps\.bin$')
+CHUNK_ROWS = 1 << 20 # rows of a packet file read at a time by read_latency
+
+class PacketTable:
+    """
+    Columnar store of the per-packet results of one simulation run.
+
+    One row per injected packet, each field in its own NumPy array, so the
+    metrics at the end of a run are computed vectorised instead of by looping
+    over result dicts, and delivered Packet objects do not have to be kept alive.
+    """
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): Maximum number of packets in the run.
+        """
+        self.capacity = capacity
+        self.id = np.full(capacity, -1, dtype=np.int64)
+        self.src = np.full(capacity, -1, dtype=np.int32)
+        self.dest = np.full(capacity, -1, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.created = np.full(capacity, np.nan)
+        self.delivered = np.full(capacity, np.nan)
+        self.hops = np.zeros(capacity, dtype=np.int16)
+        self.success = np.zeros(capacity, dtype=bool)
+        self.outcome = np.zeros(capacity, dtype=np.int8) # OUTCOMES code
+        self.latency = LatencyHistogram() # end-to-end transmission time, filled as packets complete
+        self.latency_lock = threading.Lock() # injector threads record concurrently
+
+    def record(self, row, src_id, dest_id, result, injected=None):
+        """
+        Store the result of sending one packet.
+
+        Args:
+            row (int): Row of the packet, its packet number minus one.
+            src_id (int): ID of the source node.
+            dest_id (int): ID of the destination node.
+            result (dict): Result dict of send_packet_graph or send_packet_event. Dropped
+                packets carry the packet too, so their id, size and hops are stored.
+            injected (float, optional): Clock time the packet was injected, kept as the
+                creation time of packets that were never created. Defaults to None.
+        """
+        self.src[row] = src_id
+        self.dest[row] = dest_id
+
+        packet = result.get('packet')
+        if packet is None:
+            self.outcome[row] = OUTCOME_CODES.get(result.get('reason'), OUTCOME_CODES['other'])
+            if injected is not None:
+                self.created[row] = injected
+            return
+        self.id[row] = packet.id
+        self.size[row] = packet.size
+        self.hops[row] = len(packet.route_taken) - 1
+        # A packet created at virtual time 0.0 still has a transmission time
+        if packet.created_time is not None:
+            self.created[row] = packet.created_time
+        elif injected is not None:
+            self.created[row] = injected
+        if not result.get('success'):
+            self.outcome[row] = OUTCOME_CODES.get(result.get('reason'), OUTCOME_CODES['other'])
+            return
+        if packet.delivered_time is not None:
+            self.delivered[row] = packet.delivered_time
+            if packet.created_time is not None:
+                with self.latency_lock:
+                    self.latency.record(packet.delivered_time - packet.created_time)
+        self.success[row] = True
+        self.outcome[row] = OUTCOME_CODES['delivered']
+
+    def metrics(self, total_packets, elapsed):
+        """
+        Compute the run metrics from the table.
+
+        Args:
+            total_packets (int): Number of packets injected into the network.
+            elapsed (float): Duration of the run in seconds.
+
+        Returns:
+            tuple: Tuple containing (error_rate, throughput, avg_trans_time, all_trans_time)
+        """
+        packets_sent = int(self.success.sum())
+        total_bytes = int(self.size[self.success].sum())
+
+        tx = (self.delivered - self.created)[self.success]
+        tx = tx[~np.isnan(tx)]
+
+        error_rate = ((total_packets - packets_sent) / total_packets)*100 if total_packets else 0.0
+
+        # Throughput in Kbps (kilobits per second)
+        throughput = (total_bytes * 8 / 1000) / elapsed if elapsed > 0 else 0
+        avg_tx = float(tx.sum() / packets_sent) if packets_sent > 0 else 0
+
+        return error_rate, throughput, avg_tx, tx.tolist()
+
+    def save(self, path, rows, start=0.0):
+        """
+        Write the first rows of the table to a binary columnar file in one pass.
+
+        A HEADER is followed by every column of COLUMNS in turn, each a
+        contiguous little-endian array aligned to COLUMN_ALIGN bytes, so a
+        reader can memory-map any column without touching the others.
+
+        Args:
+            path (str): File to write.
+            rows (int): Number of rows to write, the packets injected in the run.
+            start (float, optional): Clock time at which the run started. Defaults to 0.0.
+        """
+        rows = min(rows, self.capacity)
+        with open(path, 'wb') as f:
+            np.array([(MAGIC, VERSION, len(COLUMNS), rows, start)], dtype=HEADER).tofile(f)
+            for name, dtype in COLUMNS:
+                padding = -f.tell() % COLUMN_ALIGN
+                f.write(b'\0' * padding)
+                getattr(self, name)[:rows].astype(np.dtype(dtype).newbyteorder('<'), copy=False).tofile(f)
+
+def open_packet_file(path):
+    """
+    Memory-map the columns of a packet file without reading them.
+
+    Args:
+        path (str): File written by PacketTable.save.
+
+    Returns:
+        dict: Column name -> read-only numpy.memmap, plus 'rows' and 'start' from the header
+    """
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if not len(header) or header[0]['magic'] != MAGIC:
+        raise ValueError(f"{path} is not a packet file")
+    if header[0]['version'] != VERSION or header[0]['columns'] != len(COLUMNS):
+        raise ValueError(f"{path} has packet file version {header[0]['version']}, expected {VERSION}")
+    rows = int(header[0]['rows'])
+    columns = {'rows': rows, 'start': float(header[0]['start'])}
+    offset = HEADER.itemsize
+    for name, dtype in COLUMNS:
+        dtype = np.dtype(dtype).newbyteorder('<')
+        offset += -offset % COLUMN_ALIGN
+        # numpy.memmap cannot map zero bytes
+        columns[name] = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(rows,)) if rows \
+            else np.zeros(0, dtype=dtype)
+        offset += rows * dtype.itemsize
+    return columns
+
+def read_latency(path, chunk_rows=CHUNK_ROWS):
+    """
+    Build the transmission time histogram of a run from its packet file.
+
+    The mapped columns are read chunk by chunk, so memory stays bounded
+    however many packets the run injected.
+
+    Args:
+        path (str): File written by PacketTable.save.
+        chunk_rows (int, optional): Rows read at a time. Defaults to CHUNK_ROWS.
+
+    Returns:
+        LatencyHistogram: End-to-end transmission times of the delivered packets
+    """
+    packets = open_packet_file(path)
+    histogram = LatencyHistogram()
+    counts = np.zeros(histogram.bucket_count, dtype=np.int64)
+    for first in range(0, packets['rows'], chunk_rows):
+        chunk = slice(first, first + chunk_rows)
+        tx = (packets['delivered'][chunk] - packets['created'][chunk])[packets['success'][chunk]]
+        tx = tx[~np.isnan(tx)]
+        if not len(tx):
+            continue
+        # Vectorised LatencyHistogram.bucket_index
+        index = np.floor(np.log2(np.maximum(tx, histogram.min_value) / histogram.min_value)
+                         * histogram.buckets_per_octave).astype(np.int64) + 1
+        index[tx < histogram.min_value] = 0
+        counts += np.bincount(np.minimum(index, histogram.bucket_count - 1), minlength=histogram.bucket_count)
+        histogram.count += len(tx)
+        histogram.total += float(tx.sum())
+        low, high = float(tx.min()), float(tx.max())
+        histogram.min = low if histogram.min is None else min(histogram.min, low)
+        histogram.max = high if histogram.max is None else max(histogram.max, high)
+    histogram.counts = counts.tolist()
+    return histogram
+
+def query_packets(directory, algorithm=None, load=None, start=None, end=None, columns=None):
+    """
+    Select packets from the packet files of a results directory.
+
+    Files are named packets_<algorithm>_<load>pps.bin, as saved by sim.py --save-packets.
+    Only the selected rows of the requested columns are copied out of the mapped files.
+
+    Args:
+        directory (str): Results directory holding the packet files.
+        algorithm (str, optional): Only this routing algorithm, e.g. 'wcett'. Defaults to None (all).
+        load (float, optional): Only this load in packets/second. Defaults to None (all).
+        start (float, optional): Only packets created at least this many seconds after the
+            start of their run. Defaults to None.
+        end (float, optional): Only packets created before this many seconds after the
+            start of their run. Defaults to None.
+        columns (list, optional): Column names to return. Defaults to None (all of COLUMNS).
+
+    Returns:
+        dict: (algorithm, load) -> column name -> numpy array of the selected packets
+    """
+    names = columns or [name for name, _ in COLUMNS]
+    selected = {}
+    for file_name in sorted(os.listdir(directory)):
+        match = PACKET_FILE_PATTERN.match(file_name)
+        if not match:
+            continue
+        file_algorithm, file_load = match.group(1), float(match.group(2))
+        if (algorithm is not None and file_algorithm != algorithm) or (load is not None and file_load != load):
+            continue
+        packets = open_packet_file(os.path.join(directory, file_name))
+        mask = np.ones(packets['rows'], dtype=bool)
+        if start is not None or end is not None:
+            created = packets['created'] - packets['start']
+            if start is not None:
+                mask &= created >= start
+            if end is not None:
+                mask &= created < end
+        selected[(file_algorithm, file_load)] = {name: np.asarray(packets[name][mask]) for name in names}
+    return selected
@@ -0,0 +1,33 @@
+import os
+import sys
+
+_pyplot = None # matplotlib.pyplot once loaded
+
+def has_display():
+    """Return True if plots can be shown on screen"""
+    if sys.platform.startswith('linux'):
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return True
+
+def pyplot(show=False):
+    """Import matplotlib.pyplot on first use
+
+    matplotlib takes most of a second to import, so modules that plot call this
+    instead of importing it at the top. Unless plots are to be shown on a display,
+    the non-interactive Agg backend is selected, which also avoids loading a GUI
+    toolkit. A backend set through MPLBACKEND is left alone.
+
+    Args:
+        show (bool, optional): Whether plots will be shown with plt.show(). Defaults to False.
+
+    Returns:
+        module: matplotlib.pyplot
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        if not os.environ.get('MPLBACKEND') and not (show and has_display()):
+            matplotlib.use('Agg')
+        import matplotlib.pyplot
+        _pyplot = matplotlib.pyplot
+    return _pyplot
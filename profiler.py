@@ -0,0 +1,247 @@
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+
+from log_config import get_logger
+
+logger = get_logger("profiler")
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Routing and forwarding hot paths, as "module:qualified name"
+PROFILE_TARGETS = (
+    'routing_alg.routing_utils:find_all_paths',
+    'routing_alg.wcett:best_paths_to',
+    'routing_alg.wcett_lb:compute_wcett_lb',
+    'routing_alg.wcett_lb:WCETTLBMetrics.path_metric',
+    'routing_alg.wcett_lb:WCETTLBMetrics.ql_b_term',
+    'routing_alg.wcett_lb_post:update_congest_status',
+    'routing_alg.wcett_lb_post:update_path',
+    'routing_alg.wcett_lb_pre:predict_congestion',
+    'routing_alg.wcett_lb_pre:update_path',
+    'routing_alg.routing:HopCountRouting.compute_routing_tables',
+    'routing_alg.routing:WCETTRouting.compute_routing_tables',
+    'routing_alg.routing:WCETT_LB_POSTRouting.compute_routing_tables',
+    'routing_alg.routing:WCETT_LB_PRERouting.compute_routing_tables',
+    'network:Graph.get_edge_between_nodes',
+    'network:Graph.send_packet_graph',
+    'network:Graph.send_packet_event',
+    'network:Graph.event_hop',
+    'network:Edge.send_packet_edge',
+    'network:Node.monitor_tick',
+    'network:CongestionMonitor.tick'
+)
+REPORT_ROWS = 20 # functions listed in the logged report
+
+class Profiler:
+    def __init__(self):
+        """Call counts and timers of selected functions, kept per thread
+
+        Nothing is wrapped until instrument() is called, so a run without
+        profiling pays no cost at all. A wrapped function records its calls,
+        its total and longest duration in the calling thread, and the self time
+        of every call stack it appears in, for a collapsed-stack flame graph.
+        Time of recursive calls is only added to the total by the outermost call.
+        """
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.threads = [] # (thread name, name -> [calls, total, max], stack -> self seconds) per thread
+        self.patched = [] # (owner, attribute, original) to restore
+
+    def instrument(self, targets=PROFILE_TARGETS):
+        """Wrap the target functions, every module binding of them included
+
+        Functions imported by name into other modules (from x import f) are
+        replaced there too. Calling instrument again is a no-op.
+
+        Args:
+            targets (iterable, optional): "module:qualified name" strings. Defaults to PROFILE_TARGETS.
+        """
+        if self.patched:
+            return
+        for target in targets:
+            module_name, qualname = target.split(':')
+            owner = importlib.import_module(module_name)
+            *classes, attribute = qualname.split('.')
+            for class_name in classes:
+                owner = getattr(owner, class_name)
+            original = getattr(owner, attribute)
+            name = f"{module_name.rsplit('.', 1)[-1]}.{qualname}"
+            wrapper = self.wrap(name, original)
+            self.patch(owner, attribute, original, wrapper)
+            if not classes:
+                for module in self.project_modules():
+                    for other_name, value in list(vars(module).items()):
+                        if value is original:
+                            self.patch(module, other_name, original, wrapper)
+        logger.info(f"Profiling {len(targets)} functions")
+
+    def project_modules(self):
+        """Return the loaded modules of this project"""
+        return [module for module in list(sys.modules.values())
+                if getattr(module, '__file__', None) and os.path.abspath(module.__file__).startswith(PROJECT_DIR)]
+
+    def patch(self, owner, attribute, original, wrapper):
+        setattr(owner, attribute, wrapper)
+        self.patched.append((owner, attribute, original))
+
+    def restore(self):
+        """Put the original functions back"""
+        for owner, attribute, original in reversed(self.patched):
+            setattr(owner, attribute, original)
+        self.patched = []
+
+    def reset(self):
+        """Drop everything recorded so far"""
+        with self.lock:
+            self.local = threading.local()
+            self.threads = []
+
+    def wrap(self, name, func):
+        """Return func wrapped with a timer recording under name"""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            local = self.local
+            stack = getattr(local, 'stack', None)
+            if stack is None:
+                stack = self.register(local)
+            frame = [name, 0.0] # function name, time spent in profiled callees
+            stack.append(frame)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                self.record(local, stack, frame, elapsed)
+        return timed
+
+    def register(self, local):
+        """Set up the records of the calling thread"""
+        local.stack = []
+        local.stats = {}
+        local.collapsed = {}
+        with self.lock:
+            self.threads.append((threading.current_thread().name, local.stats, local.collapsed))
+        return local.stack
+
+    def record(self, local, stack, frame, elapsed):
+        name = frame[0]
+        entry = local.stats.get(name)
+        if entry is None:
+            entry = local.stats[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        if all(outer[0] != name for outer in stack):
+            entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+        key = tuple(outer[0] for outer in stack) + (name,)
+        local.collapsed[key] = local.collapsed.get(key, 0.0) + elapsed - frame[1]
+        if stack:
+            stack[-1][1] += elapsed
+
+    def stats(self):
+        """Return the per-thread records
+
+        Returns:
+            dict: Thread name -> function name -> (calls, total seconds, max seconds)
+        """
+        with self.lock:
+            threads = list(self.threads)
+        result = {}
+        for thread_name, stats, _ in threads:
+            merged = result.setdefault(thread_name, {})
+            for name, (calls, total, longest) in list(stats.items()):
+                old_calls, old_total, old_max = merged.get(name, (0, 0.0, 0.0))
+                merged[name] = (old_calls + calls, old_total + total, max(old_max, longest))
+        return result
+
+    def report(self):
+        """Rank the profiled functions by total time over all threads
+
+        Returns:
+            list: One dict per function with name, calls, total, mean and max
+                seconds, the number of calling threads and the busiest of them
+        """
+        rows = {}
+        for thread_name, stats in self.stats().items():
+            for name, (calls, total, longest) in stats.items():
+                row = rows.setdefault(name, {'name': name, 'calls': 0, 'total': 0.0, 'max': 0.0,
+                                             'threads': 0, 'busiest_thread': None, 'busiest_total': -1.0})
+                row['calls'] += calls
+                row['total'] += total
+                row['max'] = max(row['max'], longest)
+                row['threads'] += 1
+                if total > row['busiest_total']:
+                    row['busiest_thread'], row['busiest_total'] = thread_name, total
+        for row in rows.values():
+            row['mean'] = row['total'] / row['calls'] if row['calls'] else 0.0
+            del row['busiest_total']
+        return sorted(rows.values(), key=lambda row: row['total'], reverse=True)
+
+    def format_report(self, rows=None):
+        """Render the ranked report as a text table
+
+        Args:
+            rows (int, optional): Number of functions listed. Defaults to None (all).
+
+        Returns:
+            str: The table, one line per function
+        """
+        lines = [f"{'function':<48} {'calls':>10} {'total s':>10} {'mean ms':>10} {'max ms':>10} "
+                 f"{'threads':>8}  busiest thread"]
+        for row in self.report()[:rows]:
+            lines.append(f"{row['name']:<48} {row['calls']:>10} {row['total']:>10.3f} {row['mean']*1000:>10.3f} "
+                         f"{row['max']*1000:>10.3f} {row['threads']:>8}  {row['busiest_thread']}")
+        return '\n'.join(lines)
+
+    def collapsed_stacks(self):
+        """Merge the self time of every call stack over all threads
+
+        Returns:
+            dict: Tuple of function names, outermost first -> self seconds
+        """
+        with self.lock:
+            threads = list(self.threads)
+        merged = {}
+        for _, _, collapsed in threads:
+            for key, seconds in list(collapsed.items()):
+                merged[key] = merged.get(key, 0.0) + seconds
+        return merged
+
+    def write_collapsed(self, path):
+        """Write the call stacks in the collapsed format of flamegraph.pl and speedscope
+
+        One "outer;inner;innermost <microseconds>" line per stack, weighted by self time.
+
+        Args:
+            path (str): File to write
+        """
+        with open(path, 'w') as f:
+            for key, seconds in sorted(self.collapsed_stacks().items()):
+                microseconds = int(round(seconds * 1e6))
+                if microseconds > 0:
+                    f.write(f"{';'.join(key)} {microseconds}\n")
+
+    def dump(self, prefix):
+        """Log the top of the ranked report and save it with the collapsed stacks
+
+        Args:
+            prefix (str): Path prefix, <prefix>.txt gets the report and <prefix>.folded the stacks
+
+        Returns:
+            tuple: Paths of the report and the collapsed-stack file
+        """
+        logger.info(f"Profile:\n{self.format_report(REPORT_ROWS)}")
+        report_path = f"{prefix}.txt"
+        with open(report_path, 'w') as f:
+            f.write(self.format_report() + '\n')
+        stacks_path = f"{prefix}.folded"
+        self.write_collapsed(stacks_path)
+        logger.info(f"Profile saved to {report_path} and {stacks_path}")
+        return report_path, stacks_path
+
+profiler = Profiler() # process-wide instance used by --profile
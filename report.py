@@ -0,0 +1,338 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from latency_histogram import LatencyHistogram, PERCENTILES
+from log_config import get_logger, setup_logging
+from packet_table import read_latency
+from plotting import pyplot
+
+logger = get_logger("report")
+
+ALGORITHM_NAMES = {
+    'hop': 'Hop Count',
+    'wcett': 'WCETT',
+    'wcett_lb_post': 'WCETT-LB Post',
+    'wcett_lb_pre': 'WCETT-LB Pre'
+}
+
+# Key of each algorithm in the results of run_all_sims
+RESULT_KEYS = {
+    'hop': 'hop_count',
+    'wcett': 'wcett',
+    'wcett_lb_post': 'wcett_lb_post',
+    'wcett_lb_pre': 'wcett_lb_pre'
+}
+
+MARKERS = ('o', 's', '^', 'P') # one per algorithm, in ALGORITHM_NAMES order
+# Metrics plotted against the load: results key, axis label, title and file name
+METRICS = (
+    ('er', "Error rate (%)", "Error Rate", 'error_rate'),
+    ('throughput', "Throughput (Kbps)", "Throughput", 'throughput'),
+    ('tx', "Transmission Time (s)", "Transmission Time", 'tx')
+)
+HISTOGRAM_ALGORITHMS = ('wcett_lb_post', 'wcett_lb_pre') # the slowest run of these gets a histogram
+
+def load_results(results_dir):
+    """
+    Read the results files of a results directory.
+
+    Args:
+        results_dir (str): Directory written by run_all_sims or run_single_algorithm_sim
+
+    Returns:
+        list: (parameters, algorithm -> per-load results) per simulation_results.json
+            or <algorithm>_results.json file
+    """
+    runs = []
+    for file_name in sorted(os.listdir(results_dir)):
+        if not file_name.endswith('results.json'):
+            continue
+        with open(os.path.join(results_dir, file_name)) as f:
+            data = json.load(f)
+        parameters = data['parameters']
+        if 'algorithm' in parameters:
+            by_algorithm = {parameters['algorithm']: data['results']}
+        else:
+            by_algorithm = {algorithm: data[key] for algorithm, key in RESULT_KEYS.items() if key in data}
+        runs.append((parameters, by_algorithm))
+    return runs
+
+def find_results_dirs(path):
+    """
+    Args:
+        path (str): A results directory, or a simulation_results directory holding several
+
+    Returns:
+        list: The results directories under path, oldest name first
+    """
+    def has_results(directory):
+        return any(name.endswith('results.json') for name in os.listdir(directory))
+
+    if has_results(path):
+        return [path]
+    subdirs = (os.path.join(path, name) for name in sorted(os.listdir(path)))
+    return [subdir for subdir in subdirs if os.path.isdir(subdir) and has_results(subdir)]
+
+def slowest_run(results):
+    """Return the index of the load with the highest mean transmission time, None if nothing was delivered"""
+    slowest, highest_tx = None, 0
+    for i, tx in enumerate(results['tx']):
+        if tx > highest_tx:
+            slowest, highest_tx = i, tx
+    return slowest
+
+def plan_report(results_dir):
+    """
+    List the plots of a results directory as independent tasks.
+
+    Args:
+        results_dir (str): Directory written by run_all_sims or run_single_algorithm_sim
+
+    Returns:
+        list: (function, args) tuples, calling function(*args) saves one plot and returns its path
+    """
+    tasks = []
+    for parameters, by_algorithm in load_results(results_dir):
+        loads = parameters['loads']
+        topology_name = parameters['topology']
+        duration = parameters['duration']
+        setting = f"({topology_name} topology, {duration}s)"
+        names = {ALGORITHM_NAMES[algorithm]: results for algorithm, results in by_algorithm.items()}
+        if len(by_algorithm) == 1:
+            algorithm = next(iter(by_algorithm))
+            title = lambda name: f"{ALGORITHM_NAMES[algorithm]} {name} {setting}"
+            file_name = lambda name: f"{algorithm}_{name}.png"
+        else:
+            title = lambda name: f"{name} Comparison {setting}"
+            file_name = lambda name: f"{name}_comparison.png"
+
+        for key, label, name, file_key in METRICS:
+            series = {algorithm_name: results[key] for algorithm_name, results in names.items()}
+            tasks.append((plot_metric, (loads, series, label, title(name),
+                                        os.path.join(results_dir, file_name(file_key)))))
+        percentiles = {algorithm_name: {f'p{percent}': results[f'p{percent}'] for percent in PERCENTILES}
+                       for algorithm_name, results in names.items()}
+        tasks.append((plot_latency_percentiles, (loads, percentiles, title("Transmission Time Percentiles"),
+                                                 os.path.join(results_dir, file_name('tx_percentiles')))))
+
+        for algorithm, results in by_algorithm.items():
+            slowest = slowest_run(results) if algorithm in HISTOGRAM_ALGORITHMS else None
+            if slowest is not None:
+                tasks.append((render_histogram, (results_dir, algorithm, loads[slowest],
+                                                 results['latency_histograms'][slowest], topology_name, duration)))
+    return tasks
+
+def render_task(task):
+    """Run one task of plan_report in a worker and free its figures"""
+    function, args = task
+    path = function(*args)
+    pyplot().close('all')
+    return path
+
+def render_report(results_dirs, jobs=1, show=False):
+    """
+    Render the comparison plots and histograms of saved simulation results.
+
+    Args:
+        results_dirs (list): Results directories
+        jobs (int, optional): Number of worker processes rendering plots in parallel. Defaults to 1.
+        show (bool, optional): Display the plots. They are then drawn in this process. Defaults to False.
+
+    Returns:
+        list: Paths of the saved plots
+    """
+    tasks = [task for results_dir in results_dirs for task in plan_report(results_dir)]
+    if show:
+        plt = pyplot(show=True)
+        paths = [function(*args) for function, args in tasks]
+        plt.show()
+    elif jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            paths = list(pool.map(render_task, tasks))
+    else:
+        paths = [render_task(task) for task in tasks]
+    paths = [path for path in paths if path]
+    logger.info(f"Report: {len(paths)} plots of {len(results_dirs)} results directories saved")
+    return paths
+
+def plot_metric(loads, series, label, title, output_file):
+    """
+    Plot one metric against the load, one line per algorithm.
+
+    Args:
+        loads (list): Loads in packets/second
+        series (dict): Mapping of algorithm name to the metric at every load
+        label (str): Label of the metric axis
+        title (str): Title of the figure
+        output_file (str): Path of the saved plot
+
+    Returns:
+        str: output_file
+    """
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    for (name, values), marker in zip(series.items(), MARKERS):
+        plt.plot(loads, values, marker=marker, label=name)
+    plt.xlabel("Load (pkts/sec)")
+    plt.ylabel(label)
+    plt.title(title)
+    if len(series) > 1:
+        plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(output_file)
+    return output_file
+
+def plot_latency_percentiles(loads, results_by_name, title, output_file):
+    """
+    Plot the transmission time percentiles of every load, one panel per percentile.
+
+    Args:
+        loads (list): Loads in packets/second
+        results_by_name (dict): Mapping of algorithm name to results holding a 'p<N>' list per percentile
+        title (str): Title of the figure
+        output_file (str): Path of the saved plot
+
+    Returns:
+        str: output_file
+    """
+    plt = pyplot()
+    fig, axes = plt.subplots(1, len(PERCENTILES), figsize=(15, 5), sharey=True)
+    for ax, percent in zip(axes, PERCENTILES):
+        for (name, results), marker in zip(results_by_name.items(), MARKERS):
+            ax.plot(loads, results[f'p{percent}'], marker=marker, label=name)
+        ax.set_title(f"p{percent}")
+        ax.set_xlabel("Load (pkts/sec)")
+        ax.grid(True)
+    axes[0].set_ylabel("Transmission Time (s)")
+    axes[0].legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    fig.savefig(output_file)
+    return output_file
+
+def render_histogram(results_dir, algorithm, load, histogram_data, topology_name, duration):
+    """
+    Plot the transmission time histogram of one run.
+
+    The packet file of the run saved by --save-packets is streamed from disk when
+    it exists, otherwise the histogram stored in the results file is used.
+
+    Args:
+        results_dir (str): Results directory of the run
+        algorithm (str): Routing algorithm
+        load (float): Load in packets/second
+        histogram_data (dict): LatencyHistogram.to_dict() of the run from the results file
+        topology_name (str): Name of the network topology
+        duration (int): Simulation duration in seconds
+
+    Returns:
+        str: Path to the saved histogram file
+    """
+    # Named as by sim.cell_file_name
+    packet_file = os.path.join(results_dir, f"packets_{algorithm}_{load:g}pps.bin")
+    if os.path.exists(packet_file):
+        histogram = read_latency(packet_file)
+    else:
+        histogram = LatencyHistogram.from_dict(histogram_data)
+    logger.info(f"Generating transmission time histogram for {ALGORITHM_NAMES[algorithm]} with load {load} pkt/s")
+    return generate_trans_histogram(histogram, ALGORITHM_NAMES[algorithm], load, topology_name, duration,
+                                    results_dir)
+
+def generate_trans_histogram(histogram, algorithm, load, topology_name, duration, output_path):
+    """
+    Generate a histogram of end-to-end packet transmission time.
+
+    Args:
+        histogram (LatencyHistogram): Transmission times of the delivered packets
+        algorithm (str): Name of the routing algorithm
+        load (float): Network load in packets per second
+        topology_name (str): Name of the network topology
+        duration (int): Simulation duration in seconds
+        output_path (str): Directory to save the histogram
+
+    Returns:
+        str: Path to the saved histogram file
+    """
+    if not histogram or not histogram.count:
+        logger.warning("No transmission time data available to generate histogram")
+        return None
+
+    # Convert algorithm name to consistent filename format (lowercase with underscores)
+    alg_filename = algorithm.lower().replace(' ', '_').replace('-', '_')
+
+    # Save the histogram buckets to CSV file
+    os.makedirs(output_path, exist_ok=True)
+    csv_filename = f"{alg_filename}_tx_data_{int(load)}pps.csv"
+    csv_filepath = os.path.join(output_path, csv_filename)
+
+    buckets = histogram.nonzero_buckets()
+    with open(csv_filepath, 'w') as f:
+        f.write("lower_seconds,upper_seconds,packets\n")
+        for lower, upper, count in buckets:
+            f.write(f"{lower},{upper},{count}\n")
+
+    logger.info(f"Transmission time histogram data saved to: {csv_filepath}")
+
+    # Merge the fine log buckets into about 50 bars over the recorded range
+    bar_count = 50
+    width = (histogram.max - histogram.min) / bar_count or 1.0
+    bars = [0] * bar_count
+    for lower, upper, count in buckets:
+        middle = min(max((lower + min(upper, histogram.max)) / 2, histogram.min), histogram.max)
+        bars[min(int((middle - histogram.min) / width), bar_count - 1)] += count
+    edges = [histogram.min + i * width for i in range(bar_count + 1)]
+
+    plt = pyplot()
+    plt.figure(figsize=(10, 6))
+    plt.stairs(bars, edges, fill=True, alpha=0.75, edgecolor='black')
+
+    # Add mean and tail percentile lines
+    mean_tx = histogram.mean()
+
+    plt.axvline(mean_tx, color='r', linestyle='dashed', linewidth=1, label=f'Mean: {mean_tx:.3f}s')
+    for percent, color in zip(PERCENTILES, ['g', 'orange', 'purple']):
+        value = histogram.percentile(percent)
+        plt.axvline(value, color=color, linestyle='dotted', linewidth=1, label=f'p{percent}: {value:.3f}s')
+
+    plt.xlabel("Transmission Time (seconds)")
+    plt.ylabel("Number of Packets")
+    plt.title(f"{algorithm} Transmission Distribution\n(Load: {load} pkt/s, {topology_name} topology, {duration}s)")
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+
+    # Make sure the directory exists
+    histogram_filename = f"{alg_filename}_tx_histogram_{int(load)}pps.png"
+    histogram_filepath = os.path.join(output_path, histogram_filename)
+    plt.savefig(histogram_filepath)
+    logger.info(f"Transmission Time histogram saved to: {histogram_filepath}")
+    return histogram_filepath
+
+def main(argv=None, prog=None):
+    """
+    Render the plots of saved results from the command line.
+
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv[1:]
+        prog (str, optional): Program name shown in the help. Defaults to None.
+    """
+    parser = argparse.ArgumentParser(prog=prog,
+                                     description='Render the plots and histograms of saved simulation results')
+    parser.add_argument('paths', nargs='+',
+                        help='Results directories, or simulation_results directories holding them')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes rendering plots in parallel (default: 1)')
+    parser.add_argument('--show', action='store_true',
+                        help='Display the plots, they are then rendered in this process')
+    args = parser.parse_args(argv)
+
+    results_dirs = [results_dir for path in args.paths for results_dir in find_results_dirs(path)]
+    if not results_dirs:
+        parser.error("no simulation results found")
+    render_report(results_dirs, jobs=args.jobs, show=args.show)
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+
+from latency_histogram import LatencyHistogram
+from log_config import get_logger
+from utils import atomic_write
+
+logger = get_logger("result_cache")
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Sources whose changes can alter a simulation result
+SOURCE_PATHS = ['routing_alg', 'networks', 'network.py', 'packet.py', 'packet_table.py', 'latency_histogram.py',
+                'events.py', 'main.py', 'sim.py']
+
+_source_hash = None
+
+def source_hash():
+    """Hash the simulator sources, so cached results are invalidated after a code change
+
+    Returns:
+        str: Hex SHA-256 over the paths and contents of all source files
+    """
+    global _source_hash
+    if _source_hash is None:
+        digest = hashlib.sha256()
+        for path in SOURCE_PATHS:
+            full_path = os.path.join(PROJECT_DIR, path)
+            if os.path.isdir(full_path):
+                files = sorted(os.path.join(path, name) for name in os.listdir(full_path) if name.endswith('.py'))
+            else:
+                files = [path]
+            for file in files:
+                digest.update(file.encode())
+                with open(os.path.join(PROJECT_DIR, file), 'rb') as f:
+                    digest.update(f.read())
+        _source_hash = digest.hexdigest()
+    return _source_hash
+
+def cell_key(params):
+    """Return the content address of a simulation cell
+
+    Args:
+        params (dict): JSON-serialisable parameters of the cell
+
+    Returns:
+        str: Hex SHA-256 of the parameters and the source hash
+    """
+    payload = json.dumps({'params': params, 'source': source_hash()}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ResultCache:
+    def __init__(self, directory):
+        """On-disk cache of simulation cell results, one JSON file per cell
+
+        Args:
+            directory (str): Directory holding the cache files
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        """Return the file of the cell with the given key"""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, params):
+        """Look up the result of a cell
+
+        Args:
+            params (dict): Parameters of the cell
+
+        Returns:
+            tuple: (error_rate, throughput, avg_trans_time, latency_histogram), or None on a miss
+        """
+        try:
+            with open(self.path(cell_key(params))) as f:
+                entry = json.load(f)
+            result = entry['result']
+            cached = (result['er'], result['throughput'], result['tx'],
+                      LatencyHistogram.from_dict(result['latency_histogram']))
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return cached
+
+    def put(self, params, result):
+        """Store the result of a cell
+
+        Args:
+            params (dict): Parameters of the cell
+            result (tuple): (error_rate, throughput, avg_trans_time, latency_histogram)
+        """
+        er, throughput, tx, histogram = result
+        entry = {
+            'params': params,
+            'source_hash': source_hash(),
+            'result': {
+                'er': er,
+                'throughput': throughput,
+                'tx': tx,
+                'latency_histogram': histogram.to_dict()
+            }
+        }
+        path = self.path(cell_key(params))
+        with atomic_write(path) as f:
+            json.dump(entry, f)
+
+    def report(self):
+        """Log and return the cache hits and misses
+
+        Returns:
+            dict: Number of hits and misses
+        """
+        logger.info(f"Result cache: {self.hits} hits, {self.misses} misses ({self.directory})")
+        return {'hits': self.hits, 'misses': self.misses}
@@ -36,3 +36,53 @@ def shortest_path(graph, src_id, dest_id):
                     continue
                 queue.append((graph.nodes[neighbor_id], path + [neighbor_id]))
     return None
+
+
+def shortest_paths_to(graph, dest_id):
+    """Finds the shortest path from every node to a destination with a single breadth-first search
+
+    The search runs backwards from the destination to get every node's hop distance.
+    Each node then picks the first neighbor that is one hop closer, which gives the
+    same path as shortest_path run from that node. Client nodes are never used as
+    transit nodes and inactive edges are skipped.
+
+    Args:
+        graph (NetworkGraph): The network graph object containing nodes and connectivity information
+        dest_id (str/int): ID of the destination node
+
+    Returns:
+        dict: Mapping of source node ID to its ordered list of node IDs ending in dest_id
+    """
+    if dest_id not in graph.nodes:
+        return {}
+
+    distance = {dest_id: 0}
+    order = [dest_id]
+    queue = deque([dest_id])
+
+    while queue:
+        current_id = queue.popleft()
+        if current_id != dest_id and graph.nodes[current_id].type == "C":
+            continue
+        for edge in graph.get_incident_edges(current_id):
+            if not edge.active:
+                continue
+            neighbor_id = edge.dest.id if edge.src.id == current_id else edge.src.id
+            if neighbor_id not in distance:
+                distance[neighbor_id] = distance[current_id] + 1
+                order.append(neighbor_id)
+                queue.append(neighbor_id)
+
+    paths = {dest_id: [dest_id]}
+    for node_id in order[1:]:
+        for edge in graph.get_incident_edges(node_id):
+            if not edge.active:
+                continue
+            neighbor_id = edge.dest.id if edge.src.id == node_id else edge.src.id
+            if distance.get(neighbor_id) != distance[node_id] - 1:
+                continue
+            if neighbor_id != dest_id and graph.nodes[neighbor_id].type == "C":
+                continue
+            paths[node_id] = [node_id] + paths[neighbor_id]
+            break
+    return paths
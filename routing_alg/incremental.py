@@ -0,0 +1,266 @@
+import heapq
+import math
+
+EPSILON = 1e-12 # smaller improvements are float noise and do not move a route
+
+class RouteTree:
+    def __init__(self, nw, dest_id, link_cost, cost_override=None):
+        """The routing table entries of all nodes towards one destination, seen as a shortest-path tree
+
+        Every node's entry points at its parent, the destination is the root. Distances
+        are computed lazily by walking the next hops.
+
+        Args:
+            nw (NetworkGraph): The network graph object
+            dest_id (int): ID of the destination
+            link_cost (callable): Additive cost of an Edge
+            cost_override (dict, optional): Edge ID -> cost used instead of link_cost, to
+                measure the tree as it was before a link changed. Defaults to None.
+        """
+        self.nw = nw
+        self.dest_id = dest_id
+        self.link_cost = link_cost
+        self.cost_override = cost_override or {}
+        self.distances = {dest_id: 0.0}
+
+    def next_hop(self, node_id):
+        return self.nw.nodes[node_id].routing_table.get(self.dest_id)
+
+    def can_transit(self, node_id):
+        """Clients are path endpoints, never transit nodes"""
+        return node_id == self.dest_id or self.nw.nodes[node_id].type != "C"
+
+    def edge_cost(self, edge):
+        if edge.id in self.cost_override:
+            return self.cost_override[edge.id]
+        if not edge.active:
+            return math.inf
+        return self.link_cost(edge)
+
+    def distance(self, node_id):
+        """Return the cost of the current route of a node, math.inf if it has none
+
+        Args:
+            node_id (int): ID of the node
+
+        Returns:
+            float: Sum of the link costs along the next hops to the destination
+        """
+        chain = []
+        current = node_id
+        while current not in self.distances:
+            next_hop = self.next_hop(current)
+            if next_hop is None or len(chain) > len(self.nw.nodes):
+                # No route, or a loop left behind by concurrent updates
+                for chained_id in chain + [current]:
+                    self.distances[chained_id] = math.inf
+                return math.inf
+            chain.append(current)
+            current = next_hop
+        distance = self.distances[current]
+        for chained_id in reversed(chain):
+            edge = self.nw.get_edge_between_nodes(chained_id, self.next_hop(chained_id))
+            distance += self.edge_cost(edge) if edge else math.inf
+            self.distances[chained_id] = distance
+        return self.distances[node_id]
+
+    def subtree(self, root_id):
+        """Return the nodes whose route passes through a node, the node included
+
+        Args:
+            root_id (int): ID of the subtree root
+
+        Returns:
+            list: Node IDs in breadth-first order from the root
+        """
+        nodes = [root_id]
+        seen = {root_id}
+        for node_id in nodes:
+            for child_id in self.nw.get_children(node_id):
+                if child_id not in seen and self.next_hop(child_id) == node_id:
+                    seen.add(child_id)
+                    nodes.append(child_id)
+        return nodes
+
+    def set_next_hop(self, node_id, next_hop):
+        """Write a routing table entry, removing it for next_hop None
+
+        Returns:
+            bool: True if the entry changed
+        """
+        routing_table = self.nw.nodes[node_id].routing_table
+        if routing_table.get(self.dest_id) == next_hop:
+            return False
+        if next_hop is None:
+            del routing_table[self.dest_id]
+        else:
+            routing_table[self.dest_id] = next_hop
+        return True
+
+    def path(self, node_id):
+        """Return the current route of a node as a list of node IDs, or None without a route"""
+        path = [node_id]
+        while path[-1] != self.dest_id:
+            next_hop = self.next_hop(path[-1])
+            if next_hop is None or len(path) > len(self.nw.nodes):
+                return None
+            path.append(next_hop)
+        return path
+
+def repair_cost_increase(tree, edge):
+    """Repair the routes after a link went down or got more expensive
+
+    Only nodes routing over the link can be worse off. Their subtree is cut off and
+    re-attached with a Dijkstra search seeded from the unaffected nodes around it,
+    the rest of the tree keeps its routes.
+
+    Args:
+        tree (RouteTree): Routes towards one destination, measured with the new link costs
+        edge (Edge): The link that changed
+
+    Returns:
+        tuple: (IDs of nodes whose entry changed, IDs of nodes whose route may have changed)
+    """
+    u, v = edge.src.id, edge.dest.id
+    if tree.next_hop(u) == v:
+        root_id = u
+    elif tree.next_hop(v) == u:
+        root_id = v
+    else:
+        return set(), set()
+
+    affected = tree.subtree(root_id)
+    affected_set = set(affected)
+    nw = tree.nw
+
+    heap = []
+    for node_id in affected:
+        for incident in nw.get_incident_edges(node_id):
+            neighbor_id = incident.dest.id if incident.src.id == node_id else incident.src.id
+            if neighbor_id in affected_set or not tree.can_transit(neighbor_id):
+                continue
+            # The neighbour's route does not use the changed link, or it would be in the subtree
+            candidate = tree.distance(neighbor_id) + tree.edge_cost(incident)
+            if candidate < math.inf:
+                heapq.heappush(heap, (candidate, node_id, neighbor_id))
+
+    settled = {}
+    while heap:
+        distance, node_id, via = heapq.heappop(heap)
+        if node_id in settled:
+            continue
+        settled[node_id] = via
+        tree.distances[node_id] = distance
+        if not tree.can_transit(node_id):
+            continue
+        for incident in nw.get_incident_edges(node_id):
+            neighbor_id = incident.dest.id if incident.src.id == node_id else incident.src.id
+            if neighbor_id in affected_set and neighbor_id not in settled:
+                candidate = distance + tree.edge_cost(incident)
+                if candidate < math.inf:
+                    heapq.heappush(heap, (candidate, neighbor_id, node_id))
+
+    changed = set()
+    for node_id in affected:
+        if node_id not in settled:
+            tree.distances[node_id] = math.inf
+        if tree.set_next_hop(node_id, settled.get(node_id)):
+            changed.add(node_id)
+    return changed, affected_set
+
+def repair_cost_decrease(tree, edge, new_cost):
+    """Repair the routes after a link came up or got cheaper
+
+    Nodes that gain from the link are relaxed outwards from its endpoints, as in
+    Dijkstra, and the search stops wherever a route does not improve.
+
+    Args:
+        tree (RouteTree): Routes towards one destination, measured with the old link costs
+        edge (Edge): The link that changed
+        new_cost (float): Cost of the link after the change
+
+    Returns:
+        tuple: (IDs of nodes whose entry changed, IDs of nodes whose route may have changed)
+    """
+    nw = tree.nw
+    improved = {}
+
+    def current(node_id):
+        return improved.get(node_id, tree.distance(node_id))
+
+    heap = []
+    for node_id, via in ((edge.src.id, edge.dest.id), (edge.dest.id, edge.src.id)):
+        if tree.can_transit(via):
+            candidate = tree.distance(via) + new_cost
+            if candidate < tree.distance(node_id) - EPSILON:
+                heapq.heappush(heap, (candidate, node_id, via))
+
+    # New next hops are written after the search, so distances keep walking the old tree
+    next_hops = {}
+    while heap:
+        distance, node_id, via = heapq.heappop(heap)
+        if distance >= current(node_id) - EPSILON:
+            continue
+        improved[node_id] = distance
+        next_hops[node_id] = via
+        if not tree.can_transit(node_id):
+            continue
+        for incident in nw.get_incident_edges(node_id):
+            neighbor_id = incident.dest.id if incident.src.id == node_id else incident.src.id
+            cost = new_cost if incident is edge else tree.edge_cost(incident)
+            candidate = distance + cost
+            if neighbor_id != tree.dest_id and candidate < current(neighbor_id) - EPSILON:
+                heapq.heappush(heap, (candidate, neighbor_id, node_id))
+
+    changed = {node_id for node_id, via in next_hops.items() if tree.set_next_hop(node_id, via)}
+    return changed, set(improved)
+
+def repair_routes(nw, edge, old_cost, link_cost, path_cache=None):
+    """Update the routing tables after the state or quality of one link changed
+
+    Only destinations one of the link endpoints has a route to can be affected, and
+    for those only the part of the routing tree around the link is repaired.
+
+    Args:
+        nw (NetworkGraph): The network graph object
+        edge (Edge): The link that changed, already in its new state
+        old_cost (float): Cost of the link before the change, math.inf if it was down
+        link_cost (callable): Additive cost of an Edge
+        path_cache (dict, optional): (src, dest) -> path cache to keep in sync. Defaults to None.
+
+    Returns:
+        dict: Number of destinations, changed routing table entries and updated cached paths
+    """
+    new_cost = link_cost(edge) if edge.active else math.inf
+    dest_ids = set(edge.src.routing_table) | set(edge.dest.routing_table)
+    report = {'destinations': 0, 'routing_entries': 0, 'paths': 0}
+    if new_cost == old_cost:
+        return report
+
+    for dest_id in sorted(dest_ids):
+        if new_cost > old_cost:
+            tree = RouteTree(nw, dest_id, link_cost)
+            changed, rerouted = repair_cost_increase(tree, edge)
+        else:
+            tree = RouteTree(nw, dest_id, link_cost, {edge.id: old_cost})
+            changed, rerouted = repair_cost_decrease(tree, edge, new_cost)
+        if not rerouted:
+            continue
+        report['destinations'] += 1
+        report['routing_entries'] += len(changed)
+
+        if path_cache is not None:
+            # Routes below a rerouted node changed too, even where their own next hop did not
+            refresh = set()
+            for node_id in rerouted:
+                if node_id not in refresh:
+                    refresh.update(tree.subtree(node_id))
+            for node_id in refresh:
+                path = tree.path(node_id)
+                if path is not None and len(path) >= 2:
+                    if path_cache.get((node_id, dest_id)) != path:
+                        path_cache[(node_id, dest_id)] = path
+                        report['paths'] += 1
+                elif path_cache.pop((node_id, dest_id), None) is not None:
+                    report['paths'] += 1
+    return report
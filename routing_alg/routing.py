@@ -3,8 +3,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from routing_alg import hop_count as hc
-from routing_alg import wcett, wcett_lb_post, wcett_lb_pre
-from routing_alg.routing_utils import find_all_paths, is_valid_path
+from routing_alg import wcett, wcett_lb
+from routing_alg.routing_utils import find_all_paths, is_valid_path, compute_load_penalties
 
 class RoutingProtocol:
     def compute_routing_tb(self, nw, src_id, dest_id):
@@ -15,6 +15,52 @@ class RoutingProtocol:
             dest_id (int): node_id for the destination node
         """
         raise NotImplementedError()
+    
+    def compute_routing_tables(self, nw, dest_ids):
+        """Fill the routing table of every node for each destination
+        
+        The default implementation computes every (node, destination) pair separately.
+
+        Args:
+            nw (Network): The network graph
+            dest_ids (list): node_ids of the destinations, usually the IGWs
+        """
+        for node_id, node in nw.nodes.items():
+            for dest_id in dest_ids:
+                next_hop = self.compute_routing_tb(nw, node_id, dest_id)
+                if next_hop is not None:
+                    node.routing_table[dest_id] = next_hop
+    
+    def link_cost(self, edge):
+        """Additive cost of a link, used to repair routes incrementally after a link event
+
+        The default counts hops.
+
+        Args:
+            edge (Edge): The link
+
+        Returns:
+            float: Cost of routing over the link
+        """
+        return 1
+    
+    def install_paths(self, nw, dest_id, paths):
+        """Write the next hops of a set of paths into the routing tables
+        
+        Paths are also stored in path_cache if the algorithm keeps one.
+
+        Args:
+            nw (Network): The network graph
+            dest_id (int): node_id of the destination all paths end in
+            paths (dict): Mapping of source node_id to its path as a list of node_ids
+        """
+        path_cache = getattr(self, 'path_cache', None)
+        for src_id, path in paths.items():
+            if len(path) < 2:
+                continue
+            nw.nodes[src_id].routing_table[dest_id] = path[1]
+            if path_cache is not None:
+                path_cache[(src_id, dest_id)] = path
 
 class HopCountRouting(RoutingProtocol):
     def compute_routing_tb(self, nw, src_id, dest_id):
@@ -23,41 +69,28 @@ class HopCountRouting(RoutingProtocol):
         routing_tb = hc.shortest_path(nw, src_id, dest_id)
         return routing_tb[1]
     
+    def compute_routing_tables(self, nw, dest_ids):
+        for dest_id in dest_ids:
+            self.install_paths(nw, dest_id, hc.shortest_paths_to(nw, dest_id))
+    
 class WCETTRouting(RoutingProtocol):
     def __init__(self, packet_sz=1024, beta=0.5):
         self.packet_sz = packet_sz
         self.beta = beta
         
+    def link_cost(self, edge):
+        # WCETT's channel term is not additive, routes are repaired on their ETT sum
+        return wcett.compute_ett(edge, self.packet_sz)
+    
     def compute_routing_tb(self, nw, src_id, dest_id):
-        all_paths = find_all_paths(nw, src_id, dest_id)
-        # Filter out paths with client nodes as transit
-        all_paths = [path for path in all_paths if is_valid_path(nw, path)]
-
-        if not all_paths:
-            return None
-        
-        weights = {}
-        for path in all_paths:
-            if len(path) < 2:
-                continue
-
-            edges = []
-            for i in range(len(path) - 1):
-                edge = nw.get_edge_between_nodes(path[i], path[i+1])
-                if edge:
-                    edges.append(edge)
-                    
-            if edges:
-                wcett_temp = wcett.compute_wcett(edges, self.packet_sz, self.beta)
-                weights[tuple(path)] = wcett_temp
-
-        if not weights:
-            return None
-
-        best_path = min(weights, key=weights.get)
+        best_path = wcett.find_best_path(nw, src_id, dest_id, self.packet_sz, self.beta)
         if best_path and len(best_path) >= 2:
             return best_path[1]
         return None
+    
+    def compute_routing_tables(self, nw, dest_ids):
+        for dest_id in dest_ids:
+            self.install_paths(nw, dest_id, wcett.best_paths_to(nw, dest_id, self.packet_sz, self.beta))
 
 class WCETT_LB_POSTRouting(RoutingProtocol):
     def __init__(self, packet_sz=1024, beta=0.5):
@@ -65,6 +98,10 @@ class WCETT_LB_POSTRouting(RoutingProtocol):
         self.beta = beta
         self.path_cache = {}
         
+    def link_cost(self, edge):
+        # WCETT's channel term is not additive, routes are repaired on their ETT sum
+        return wcett.compute_ett(edge, self.packet_sz)
+    
     def compute_routing_tb(self, nw, src, dest):
         all_paths = find_all_paths(nw, src, dest)
         if not all_paths:
@@ -83,7 +120,7 @@ class WCETT_LB_POSTRouting(RoutingProtocol):
                     edges.append(edge)
                     
             if edges:
-                metric = wcett_lb_post.compute_wcett_lb(edges, self.packet_sz, nw, path)
+                metric = wcett_lb.compute_wcett_lb(edges, self.packet_sz, nw, path)
                 path_metrics.append((path, metric))
 
         if not path_metrics:
@@ -98,6 +135,19 @@ class WCETT_LB_POSTRouting(RoutingProtocol):
         if best_path and len(best_path) >= 2:
             return best_path[1]
         return None
+    
+    def compute_routing_tables(self, nw, dest_ids):
+        """Clear and rebuild all routing tables with one WCETT-LB search per destination
+        
+        The load penalties are taken from the network state before the tables are
+        cleared, so the result does not depend on the order nodes are visited in.
+        """
+        penalties = compute_load_penalties(nw)
+        for node in nw.nodes.values():
+            node.routing_table = {}
+        for dest_id in dest_ids:
+            paths = wcett.best_paths_to(nw, dest_id, self.packet_sz, self.beta, penalties)
+            self.install_paths(nw, dest_id, paths)
 
 class WCETT_LB_PRERouting(RoutingProtocol):
     def __init__(self, packet_sz=1024, beta=0.5):
@@ -105,6 +155,10 @@ class WCETT_LB_PRERouting(RoutingProtocol):
         self.beta = beta
         self.path_cache = {}
         
+    def link_cost(self, edge):
+        # WCETT's channel term is not additive, routes are repaired on their ETT sum
+        return wcett.compute_ett(edge, self.packet_sz)
+    
     def compute_routing_tb(self, nw, src, dest):
         all_paths = find_all_paths(nw, src, dest)
         # Filter out paths with client nodes as transit
@@ -125,7 +179,7 @@ class WCETT_LB_PRERouting(RoutingProtocol):
                     edges.append(edge)
                     
             if edges:
-                metric = wcett_lb_pre.compute_wcett_lb(edges, self.packet_sz, nw, path)
+                metric = wcett_lb.compute_wcett_lb(edges, self.packet_sz, nw, path)
                 path_metrics.append((path, metric))
 
         if not path_metrics:
@@ -139,4 +193,17 @@ class WCETT_LB_PRERouting(RoutingProtocol):
         
         if best_path and len(best_path) >= 2:
             return best_path[1]
-        return None
\ No newline at end of file
+        return None
+    
+    def compute_routing_tables(self, nw, dest_ids):
+        """Clear and rebuild all routing tables with one WCETT-LB search per destination
+        
+        The load penalties are taken from the network state before the tables are
+        cleared, so the result does not depend on the order nodes are visited in.
+        """
+        penalties = compute_load_penalties(nw)
+        for node in nw.nodes.values():
+            node.routing_table = {}
+        for dest_id in dest_ids:
+            paths = wcett.best_paths_to(nw, dest_id, self.packet_sz, self.beta, penalties)
+            self.install_paths(nw, dest_id, paths)
\ No newline at end of file
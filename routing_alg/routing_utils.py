@@ -75,6 +75,8 @@ def is_valid_path(nw, path):
 
 def calculate_traffic_concentration(nw):
     """Calculate traffic concentration at each node based on routing tables
+    
+    Read from the network's next-hop index, which tracks every routing table entry.
 
     Args:
         nw (NetworkGraph): The network graph object with routing tables
@@ -82,14 +84,7 @@ def calculate_traffic_concentration(nw):
     Returns:
         dict: Dictionary mapping node IDs to their traffic concentration values
     """
-    traffic_concentration = {node_id: 0 for node_id in nw.nodes}
-    
-    for node_id, node in nw.nodes.items():
-        for dest_id, next_hop in node.routing_table.items():
-            if next_hop in traffic_concentration:
-                traffic_concentration[next_hop] += 1
-                
-    return traffic_concentration
+    return {node_id: nw.next_hop_count(node_id) for node_id in nw.nodes}
 
 def get_min_ett(nw):
     """Find the smallest ETT value in the network
@@ -122,9 +117,8 @@ def compute_ql_b_term(node, nw):
     """
     total_bw = 0
     count = 0
-    for neighbor_id in node.neighbors:
-        edge = nw.get_edge_between_nodes(node.id, neighbor_id)
-        if edge and edge.active:
+    for edge in nw.get_incident_edges(node.id):
+        if edge.active:
             total_bw += edge.bandwidth
             count += 1
     # Calculate average bandwidth in bits per second
@@ -137,8 +131,30 @@ def compute_ql_b_term(node, nw):
     ql_b_term = queue_length / avg_tx_rate  # bits / (bits/second) = seconds
     return ql_b_term
 
+def compute_load_penalties(nw):
+    """Calculate the WCETT-LB load penalty each node adds as an intermediate hop
+
+    The penalty is the queue-length to bandwidth term plus the traffic concentration
+    term, evaluated on the current state of the network.
+
+    Args:
+        nw (NetworkGraph): The network graph object
+
+    Returns:
+        dict: Dictionary mapping node IDs to their load penalty
+    """
+    traffic_concentration = calculate_traffic_concentration(nw)
+    min_ett = get_min_ett(nw)
+    
+    return {
+        node_id: compute_ql_b_term(node, nw) + min_ett * traffic_concentration[node_id]
+        for node_id, node in nw.nodes.items()
+    }
+
 def get_child_nodes(node, nw):
     """Identify nodes that use the given node as their next hop
+    
+    Read from the network's next-hop index instead of scanning every routing table.
 
     Args:
         node (Node): The node to find children for
@@ -147,15 +163,4 @@ def get_child_nodes(node, nw):
     Returns:
         list: List of node IDs that use this node as next hop
     """
-    child_nodes = []
-    
-    for potential_child_id in nw.nodes:
-        potential_child = nw.nodes[potential_child_id]
-        if potential_child_id != node.id and hasattr(potential_child, 'routing_table'):
-            for dest_id, next_hop in potential_child.routing_table.items():
-                if next_hop == node.id:
-                    if potential_child_id not in child_nodes:
-                        child_nodes.append(potential_child_id)
-                    break
-    
-    return child_nodes
\ No newline at end of file
+    return [child_id for child_id in nw.get_children(node.id) if child_id != node.id]
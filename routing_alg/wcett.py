@@ -1,3 +1,5 @@
+import heapq
+
 def compute_ett(edge, packet_sz):
     """Calculates Expected Transmission Time (ETT) for a given edge and packet size
 
@@ -42,4 +44,207 @@ def compute_wcett(edges, packet_sz, beta = 0.5):
     max_channel_ett = max(max_ett_channel.values())
     
     wcett = (1 - beta) * ett_sum + beta * max_channel_ett
-    return wcett
\ No newline at end of file
+    return wcett
+
+def find_best_path(nw, src, dest, packet_sz, beta=0.5, max_depth=None):
+    """Finds the path with the lowest WCETT using a label-setting search
+
+    Each label holds the accumulated ETT per channel of a partial path. Labels are
+    expanded in order of a lower bound on the WCETT of any completion, built from the
+    smallest remaining ETT sum to the destination, so the first label to reach the
+    destination is optimal. A label is pruned when another label at the same node can
+    never lead to a worse WCETT, whatever the rest of the path looks like (see _is_dominated).
+
+    Args:
+        nw (NetworkGraph): The network graph object
+        src (int): ID of the source node
+        dest (int): ID of the destination node
+        packet_sz (int): Size of the packet in bytes
+        beta (float, optional): Weighting parameter balancing channel diversity. Defaults to 0.5.
+        max_depth (int, optional): Maximum number of hops, as in find_all_paths. Defaults to None (unbounded).
+
+    Returns:
+        list: Ordered list of node IDs of the best path, or None if no path exists
+    """
+    if src not in nw.nodes or dest not in nw.nodes:
+        return None
+    if src == dest:
+        return [src]
+
+    channels = sorted({edge.channel for edge in nw.edges.values()})
+    channel_index = {channel: i for i, channel in enumerate(channels)}
+    ett_cache = {}
+    remaining = _ett_distances(nw, dest, packet_sz, ett_cache)
+    if src not in remaining:
+        return None
+
+    def lower_bound(vector, node_id):
+        total = sum(vector) + remaining[node_id]
+        return (1 - beta) * total + beta * max(max(vector), total / len(channels))
+
+    start = (0.0,) * len(channels)
+    heap = [(lower_bound(start, src), 0, src, start, 0, (src,))]
+    permanent = {}
+    seq = 1
+
+    while heap:
+        _, _, node_id, vector, hops, path = heapq.heappop(heap)
+        settled = permanent.setdefault(node_id, [])
+        if _is_dominated(vector, hops, 0.0, settled, beta):
+            continue
+        settled.append((vector, hops, 0.0))
+
+        if node_id == dest:
+            return list(path)
+        if max_depth is not None and hops >= max_depth:
+            continue
+
+        for edge in nw.get_incident_edges(node_id):
+            if not edge.active:
+                continue
+            neighbor_id = edge.dest.id if edge.src.id == node_id else edge.src.id
+            if neighbor_id not in remaining:
+                continue
+            if nw.nodes[neighbor_id].type == "C" and neighbor_id != dest:
+                continue
+
+            new_vector = list(vector)
+            new_vector[channel_index[edge.channel]] += ett_cache[edge.id]
+            new_vector = tuple(new_vector)
+            # Hop counts only matter for dominance when the depth is bounded
+            new_hops = hops + 1 if max_depth is not None else 0
+            if _is_dominated(new_vector, new_hops, 0.0, permanent.get(neighbor_id, ()), beta):
+                continue
+
+            heapq.heappush(heap, (lower_bound(new_vector, neighbor_id), seq, neighbor_id,
+                                  new_vector, new_hops, path + (neighbor_id,)))
+            seq += 1
+
+    return None
+
+def best_paths_to(nw, dest, packet_sz, beta=0.5, node_penalty=None):
+    """Finds the lowest-WCETT path from every node to a destination in a single search
+
+    WCETT does not depend on the direction a path is traversed, so a label-setting
+    search outwards from the destination settles the best path for every source. Labels
+    are expanded in order of their metric, and the first label settled at a node is
+    that node's best path.
+
+    Args:
+        nw (NetworkGraph): The network graph object
+        dest (int): ID of the destination node
+        packet_sz (int): Size of the packet in bytes
+        beta (float, optional): Weighting parameter balancing channel diversity. Defaults to 0.5.
+        node_penalty (dict, optional): Extra cost per node ID, added when the node is an
+            intermediate hop (as in WCETT-LB). Defaults to None.
+
+    Returns:
+        dict: Mapping of source node ID to its ordered list of node IDs ending in dest
+    """
+    if dest not in nw.nodes:
+        return {}
+
+    channels = sorted({edge.channel for edge in nw.edges.values()})
+    channel_index = {channel: i for i, channel in enumerate(channels)}
+    ett_cache = {}
+    node_penalty = node_penalty or {}
+
+    heap = [(0.0, 0, dest, (0.0,) * len(channels), 0.0, (dest,))]
+    permanent = {}
+    best_paths = {}
+    seq = 1
+
+    while heap:
+        _, _, node_id, vector, penalty, path = heapq.heappop(heap)
+        settled = permanent.setdefault(node_id, [])
+        if _is_dominated(vector, 0, penalty, settled, beta):
+            continue
+        settled.append((vector, 0, penalty))
+
+        if node_id not in best_paths:
+            best_paths[node_id] = list(reversed(path))
+        if node_id != dest and nw.nodes[node_id].type == "C":
+            continue # Clients are path endpoints, never transit nodes
+
+        new_penalty = penalty + (node_penalty.get(node_id, 0.0) if node_id != dest else 0.0)
+        for edge in nw.get_incident_edges(node_id):
+            if not edge.active:
+                continue
+            neighbor_id = edge.dest.id if edge.src.id == node_id else edge.src.id
+
+            ett = ett_cache.get(edge.id)
+            if ett is None:
+                ett = ett_cache[edge.id] = compute_ett(edge, packet_sz)
+            new_vector = list(vector)
+            new_vector[channel_index[edge.channel]] += ett
+            new_vector = tuple(new_vector)
+            if _is_dominated(new_vector, 0, new_penalty, permanent.get(neighbor_id, ()), beta):
+                continue
+
+            value = (1 - beta) * sum(new_vector) + beta * max(new_vector) + new_penalty
+            heapq.heappush(heap, (value, seq, neighbor_id, new_vector, new_penalty, path + (neighbor_id,)))
+            seq += 1
+
+    return best_paths
+
+def _ett_distances(nw, dest, packet_sz, ett_cache):
+    """Computes the smallest ETT sum from every node to the destination with Dijkstra
+
+    Client nodes are not expanded as transit nodes. The ETT of every visited edge is
+    stored in ett_cache keyed by edge ID.
+
+    Args:
+        nw (NetworkGraph): The network graph object
+        dest (int): ID of the destination node
+        packet_sz (int): Size of the packet in bytes
+        ett_cache (dict): Dictionary to fill with edge ID -> ETT
+
+    Returns:
+        dict: Mapping of node ID to its ETT distance, only for nodes that can reach dest
+    """
+    distances = {dest: 0.0}
+    heap = [(0.0, dest)]
+    while heap:
+        distance, node_id = heapq.heappop(heap)
+        if distance > distances[node_id]:
+            continue
+        if node_id != dest and nw.nodes[node_id].type == "C":
+            continue
+        for edge in nw.get_incident_edges(node_id):
+            if not edge.active:
+                continue
+            ett = ett_cache.get(edge.id)
+            if ett is None:
+                ett = ett_cache[edge.id] = compute_ett(edge, packet_sz)
+            neighbor_id = edge.dest.id if edge.src.id == node_id else edge.src.id
+            new_distance = distance + ett
+            if new_distance < distances.get(neighbor_id, float('inf')):
+                distances[neighbor_id] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor_id))
+    return distances
+
+def _is_dominated(vector, hops, penalty, labels, beta):
+    """Checks whether a label is dominated by any label in a set
+
+    Label y dominates label x if (1 - beta) * sum(y - x) + beta * max(0, max(y - x))
+    + (penalty_y - penalty_x) <= 0. Extending both with the same suffix z then gives
+    WCETT(y + z) <= WCETT(x + z), since max(y + z) <= max(x + z) + max(0, max(y - x)).
+    Being lower or equal on every channel is the special case where all terms are non-positive.
+
+    Args:
+        vector (tuple): Accumulated ETT per channel of the label
+        hops (int): Number of hops of the label
+        penalty (float): Accumulated additive node penalty of the label
+        labels (list): (vector, hops, penalty) tuples of settled labels at the same node
+        beta (float): Weighting parameter balancing channel diversity
+
+    Returns:
+        bool: True if some label is at least as good for every possible path continuation
+    """
+    for other_vector, other_hops, other_penalty in labels:
+        if other_hops > hops:
+            continue
+        diff = [o - v for o, v in zip(other_vector, vector)]
+        if (1 - beta) * sum(diff) + beta * max(0.0, max(diff)) + other_penalty - penalty <= 0:
+            return True
+    return False
@@ -0,0 +1,181 @@
+import sys
+import os
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from routing_alg import wcett
+from routing_alg.routing_utils import (
+    calculate_traffic_concentration,
+    compute_ql_b_term,
+    get_min_ett
+)
+
+def compute_wcett_lb(edges, packet_sz, nw, path):
+    """Calculate the WCETT-LB metric of a path from the live network state
+
+    Args:
+        edges (list): List of Edge objects along the path
+        packet_sz (int): Size of the packet in bytes
+        nw (NetworkGraph): The network graph object
+        path (list): List of node IDs of the path
+
+    Returns:
+        float: WCETT of the path plus the load penalty of every intermediate node
+    """
+    base = wcett.compute_wcett(edges, packet_sz)
+
+    traffic_concentration = calculate_traffic_concentration(nw)
+    min_ett = get_min_ett(nw)
+
+    load_penalty = 0
+
+    for node_id in path[1:-1]:
+        node = nw.nodes[node_id]
+        ql_b_term = compute_ql_b_term(node, nw)
+
+        # Traffic concentration term
+        ni_term = min_ett * traffic_concentration[node_id]
+        load_penalty += (ql_b_term + ni_term)
+
+    # Final WCETT-LB value
+    wcett_lb = base + load_penalty
+    return wcett_lb
+
+class WCETTLBMetrics:
+    def __init__(self, nw, packet_sz=1024):
+        """Shared WCETT-LB evaluation for one network, cached per monitor tick
+
+        The congestion monitor calls refresh() at the start of every tick. The
+        traffic concentration and minimum ETT are snapshotted then, queue-length
+        terms once per node per tick, and path metrics are memoised until the next
+        refresh. A lock guards the memoised terms, so the monitor may tick the nodes
+        of a level from several worker threads.
+
+        Args:
+            nw (NetworkGraph): The network graph object
+            packet_sz (int, optional): Size of the packet in bytes. Defaults to 1024.
+        """
+        self.nw = nw
+        self.packet_sz = packet_sz
+        self.lock = threading.RLock()
+        self.snapshot_time = None
+        self.traffic_concentration = {}
+        self.min_ett = 1.0
+        self.ql_b_terms = {}
+        self.path_metrics = {}
+        self.stats = {
+            'snapshots': 0,
+            'path_requests': 0,
+            'path_evaluations': 0,
+            'ql_b_requests': 0,
+            'ql_b_evaluations': 0
+        }
+
+    def refresh(self):
+        """Take a new snapshot of the network-wide terms and clear the memoised metrics
+        """
+        with self.lock:
+            self.snapshot_time = self.nw.clock()
+            self.traffic_concentration = calculate_traffic_concentration(self.nw)
+            self.min_ett = get_min_ett(self.nw)
+            self.ql_b_terms = {}
+            self.path_metrics = {}
+            self.stats['snapshots'] += 1
+
+    def ql_b_term(self, node_id):
+        """Return the queue-length to bandwidth term of a node for the current tick
+
+        Args:
+            node_id (int): ID of the node
+
+        Returns:
+            float: The queue-length to bandwidth ratio term
+        """
+        with self.lock:
+            self.stats['ql_b_requests'] += 1
+            term = self.ql_b_terms.get(node_id)
+            if term is None:
+                term = compute_ql_b_term(self.nw.nodes[node_id], self.nw)
+                self.ql_b_terms[node_id] = term
+                self.stats['ql_b_evaluations'] += 1
+            return term
+
+    def path_metric(self, path):
+        """Return the WCETT-LB metric of a path for the current tick
+
+        Args:
+            path (list): List of node IDs of the path
+
+        Returns:
+            float: The WCETT-LB metric, or None if the path has no edges
+        """
+        with self.lock:
+            # Outside the monitor (a single update_path call) there may be no snapshot yet
+            if self.snapshot_time is None:
+                self.refresh()
+            self.stats['path_requests'] += 1
+            key = tuple(path)
+            if key in self.path_metrics:
+                return self.path_metrics[key]
+
+            edges = []
+            for i in range(len(path) - 1):
+                edge = self.nw.get_edge_between_nodes(path[i], path[i+1])
+                if edge:
+                    edges.append(edge)
+            metric = None
+            if edges:
+                metric = wcett.compute_wcett(edges, self.packet_sz)
+                for node_id in path[1:-1]:
+                    metric += self.ql_b_term(node_id) + self.min_ett * self.traffic_concentration[node_id]
+
+            self.path_metrics[key] = metric
+            self.stats['path_evaluations'] += 1
+            return metric
+
+    def next_hop_changed(self, old_hop, new_hop):
+        """Update the traffic concentration snapshot after a routing table entry changed
+
+        Args:
+            old_hop (int): Previous next hop, or None
+            new_hop (int): New next hop, or None
+        """
+        if old_hop == new_hop:
+            return
+        with self.lock:
+            if old_hop in self.traffic_concentration:
+                self.traffic_concentration[old_hop] -= 1
+            if new_hop in self.traffic_concentration:
+                self.traffic_concentration[new_hop] += 1
+            self.path_metrics = {}
+
+    def report(self):
+        """Summarise how much work the cache saved
+
+        Returns:
+            dict: The raw counters plus the number of path, queue-term and
+                network-wide evaluations that were avoided
+        """
+        with self.lock:
+            report = dict(self.stats)
+        report['path_evaluations_saved'] = self.stats['path_requests'] - self.stats['path_evaluations']
+        report['ql_b_evaluations_saved'] = self.stats['ql_b_requests'] - self.stats['ql_b_evaluations']
+        # Without the snapshot every path evaluation recomputes both network-wide terms
+        report['network_evaluations_saved'] = self.stats['path_requests'] - self.stats['snapshots']
+        return report
+
+def get_metrics(routing_alg, nw):
+    """Return the shared WCETT-LB metrics cache of a routing algorithm for a network
+
+    Args:
+        routing_alg (RoutingProtocol): The routing algorithm instance owning the cache
+        nw (NetworkGraph): The network graph object
+
+    Returns:
+        WCETTLBMetrics: The cache, created on first use
+    """
+    metrics = getattr(routing_alg, 'lb_metrics', None)
+    if metrics is None or metrics.nw is not nw:
+        metrics = WCETTLBMetrics(nw, getattr(routing_alg, 'packet_sz', 1024))
+        routing_alg.lb_metrics = metrics
+    return metrics
@@ -1,16 +1,12 @@
-import time
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from log_config import get_logger
 import network as nt
-from routing_alg import wcett
+from routing_alg.wcett_lb import get_metrics
 from routing_alg.routing_utils import (
     LOAD_BALANCE_THRESHOLD,
-    calculate_traffic_concentration,
-    compute_ql_b_term,
-    get_min_ett,
     get_child_nodes,
     find_all_paths
 )
@@ -37,9 +33,9 @@ def update_congest_status(node, nw, routing_alg):
     
     # Initialize last update time if not already set
     if not hasattr(node, 'last_wcett_lb_update_time'):
-        node.last_wcett_lb_update_time = time.time()
+        node.last_wcett_lb_update_time = nw.clock()
     
-    current_time = time.time()
+    current_time = nw.clock()
     force_update = (current_time - node.last_wcett_lb_update_time) >= 3  # Force update every 3 seconds
     
     # Track whether this is an actual state change
@@ -52,19 +48,14 @@ def update_congest_status(node, nw, routing_alg):
         node.reported_congestion = node.congest_status
         
         # Calculate node's new WCETT-LB metric for all paths from this node
+        metrics = get_metrics(routing_alg, nw)
         paths = []
         for dest_id in nw.nodes:
             if dest_id != node.id:
                 current_path = routing_alg.path_cache.get((node.id, dest_id))
                 if current_path:
-                    edges = []
-                    for i in range(len(current_path) - 1):
-                        edge = nw.get_edge_between_nodes(current_path[i], current_path[i+1])
-                        if edge:
-                            edges.append(edge)
-                            
-                    if edges:
-                        metric = compute_wcett_lb(edges, 1024, nw, current_path)
+                    metric = metrics.path_metric(current_path)
+                    if metric is not None:
                         paths.append((dest_id, current_path, metric))
                         
         child_nodes = get_child_nodes(node, nw)
@@ -78,37 +69,6 @@ def update_congest_status(node, nw, routing_alg):
         
     return node.congest_status
 
-def compute_wcett_lb(edges, packet_sz, nw, path):
-    """_summary_
-
-    Args:
-        edges (_type_): _description_
-        packet_sz (_type_): _description_
-        nw (_type_): _description_
-        path (_type_): _description_
-
-    Returns:
-        _type_: _description_
-    """
-    base = wcett.compute_wcett(edges, packet_sz)
-    
-    traffic_concentration = calculate_traffic_concentration(nw)
-    min_ett = get_min_ett(nw)
-    
-    load_penalty = 0
-    
-    for node_id in path[1:-1]:
-        node = nw.nodes[node_id]
-        ql_b_term = compute_ql_b_term(node, nw)
-            
-        # Traffic concentration term
-        ni_term = min_ett * traffic_concentration[node_id]
-        load_penalty += (ql_b_term + ni_term)
-    
-    # Final WCETT-LB value
-    wcett_lb = base + load_penalty
-    return wcett_lb
-
 def update_path(node, nw, dest_id, routing_alg):
     """Update routing path based on congestion reports and WCETT-LB metrics
     from nodes in the current path and child nodes.
@@ -123,7 +83,7 @@ def update_path(node, nw, dest_id, routing_alg):
     congestion_state_changed = False
     
     if hasattr(node, 'wcett_lb_updates'):
-        current_time = time.time()
+        current_time = nw.clock()
         for sender_id, update in node.wcett_lb_updates.items():
             if current_time - update['timestamp'] < 3: # Consider updates valid for 3 seconds
                 received_wcett_lb_update = True
@@ -138,17 +98,11 @@ def update_path(node, nw, dest_id, routing_alg):
     if not current_path:
         return
     
-    current_edges = []
-    for i in range(len(current_path) - 1):
-        edge = nw.get_edge_between_nodes(current_path[i], current_path[i+1])
-        if edge:
-            current_edges.append(edge)
-    
-    if not current_edges:
+    metrics = get_metrics(routing_alg, nw)
+    current_metric = metrics.path_metric(current_path)
+    if current_metric is None:
         return
     
-    current_metric = compute_wcett_lb(current_edges, 1024, nw, current_path)
-    
     all_paths = find_all_paths(nw, node.id, dest_id)
     if not all_paths or len(all_paths) <= 1:
         logger.error(f"⚠️ Node {node.id} could not find alternative path to {dest_id}")
@@ -162,17 +116,10 @@ def update_path(node, nw, dest_id, routing_alg):
         if path == current_path:
             continue
         
-        path_edges = []
-        for i in range(len(path) - 1):
-            edge = nw.get_edge_between_nodes(path[i], path[i+1])
-            if edge:
-                path_edges.append(edge)
-        
-        if not path_edges:
+        path_metric = metrics.path_metric(path)
+        if path_metric is None:
             continue
         
-        path_metric = compute_wcett_lb(path_edges, 1024, nw, path)
-        
         if path_metric < best_metric:
             best_metric = path_metric
             best_path = path
@@ -184,6 +131,7 @@ def update_path(node, nw, dest_id, routing_alg):
     if current_metric - best_metric >= LOAD_BALANCE_THRESHOLD:
         routing_alg.path_cache[(node.id, dest_id)] = best_path
         if len(best_path) >= 2:
+            metrics.next_hop_changed(node.routing_table.get(dest_id), best_path[1])
             node.routing_table[dest_id] = best_path[1]
             logger.info(f"Switched path for node {node.id}: {current_path} → {best_path}")
     elif congestion_state_changed:
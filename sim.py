@@ -1,13 +1,19 @@
 import argparse
 import json
 import os
+import random as rnd
+import sys
 import time
-
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 
 from log_config import setup_logging, get_logger
-from main import MeshNetworkSimulator
-from network import reset_id_managers
+from main import MeshNetworkSimulator, topology_arg, topology_name as get_topology_name
+from networks.topology_file import file_hash, is_topology_file
+from latency_histogram import LatencyHistogram, PERCENTILES
+from network import reset_id_managers, BUFFER_SIZE, QUEUE_PROCESS_TIME
+from profiler import profiler
+from report import ALGORITHM_NAMES, RESULT_KEYS, render_report, main as report_main
+from result_cache import ResultCache
 from routing_alg.routing_utils import (
     CONGESTION_THRESHOLD,
     LOAD_BALANCE_THRESHOLD
@@ -15,6 +21,14 @@ from routing_alg.routing_utils import (
 
 logger = get_logger("sim")
 
+# Simulator method that builds the routing tables for each algorithm
+SIM_METHODS = {
+    'hop': 'hop_count_sim',
+    'wcett': 'wcett_sim',
+    'wcett_lb_post': 'wcett_lb_post_sim',
+    'wcett_lb_pre': 'wcett_lb_pre_sim'
+}
+
 def generate_load_series(base_load=5):
     """
     Generate a series of loads following the specified increment pattern.
@@ -33,7 +47,163 @@ def generate_load_series(base_load=5):
         base_load + 30
     ]
 
-def run_all_sims(base_load=5, duration=180, topology=0, save_dir=None, show_plots=True):
+def cell_file_name(kind, algorithm, load):
+    """
+    Args:
+        kind (str): What the file holds, e.g. 'telemetry' or 'profile'
+        algorithm (str): Routing algorithm
+        load (float): Load in packets/second
+    
+    Returns:
+        str: Name of a per-run file of a simulation cell, without extension
+    """
+    return f"{kind}_{algorithm}_{load:g}pps"
+
+def run_sim_cell(algorithm, load, duration, topology, event_driven=False, seed=None, telemetry_interval=None,
+                 profile=False, trace_hops=False, save_packets=False, output_dir=None):
+    """
+    Run a single (algorithm, load) cell of a simulation sweep on a fresh network.
+    
+    Args:
+        algorithm (str): Routing algorithm ('hop', 'wcett', 'wcett_lb_post' or 'wcett_lb_pre')
+        load (float): Load in packets/second
+        duration (int): Duration of the simulation in seconds
+        topology (int or str): Network topology to use (0=small, 1=big or a synthetic spec)
+        event_driven (bool, optional): Run on a discrete-event virtual clock. Defaults to False.
+        seed (int, optional): Seed of the simulation random streams. Defaults to None.
+        telemetry_interval (float, optional): Seconds between telemetry samples, None to disable. Defaults to None.
+        profile (bool, optional): Time the routing and forwarding hot paths. Defaults to False.
+        trace_hops (bool, optional): Record the timestamps of every hop in a binary trace file. Defaults to False.
+        save_packets (bool, optional): Save the per-packet results in a binary columnar file. Defaults to False.
+        output_dir (str, optional): Directory the telemetry, profile, trace and packet files are saved to.
+            Defaults to None.
+    
+    Returns:
+        tuple: (error_rate, throughput, avg_trans_time, latency_histogram), the histogram
+            holding the end-to-end transmission times of the delivered packets
+    """
+    logger.info(f'{ALGORITHM_NAMES[algorithm]} Sim with load {load} pkt/s')
+    reset_id_managers()
+    if profile:
+        # Worker processes instrument their own copy of the modules
+        profiler.instrument()
+        profiler.reset()
+    trace_path = os.path.join(output_dir, cell_file_name('hoptrace', algorithm, load) + '.bin') \
+        if trace_hops and output_dir else None
+    sim = MeshNetworkSimulator(topology, event_driven=event_driven, seed=seed, telemetry_interval=telemetry_interval,
+                               trace_path=trace_path)
+    getattr(sim, SIM_METHODS[algorithm])()
+    er, throughput, tx, _ = sim.simulate_traffic(duration=duration, load=load)
+    if sim.telemetry and output_dir:
+        sim.telemetry.export(os.path.join(output_dir, cell_file_name('telemetry', algorithm, load) + '.npz'))
+    if profile and output_dir:
+        profiler.dump(os.path.join(output_dir, cell_file_name('profile', algorithm, load)))
+    if save_packets and output_dir:
+        path = os.path.join(output_dir, cell_file_name('packets', algorithm, load) + '.bin')
+        sim.packets.save(path, sim.total_packets, sim.run_start)
+        logger.info(f"Per-packet results saved to: {path}")
+    return er, throughput, tx, sim.latency_histogram
+
+def cell_params(algorithm, load, duration, topology, event_driven=False, seed=None):
+    """
+    Collect everything that determines the result of a simulation cell, used as its cache key.
+    
+    Args:
+        algorithm (str): Routing algorithm
+        load (float): Load in packets/second
+        duration (int): Duration of the simulation in seconds
+        topology (int or str): Network topology
+        event_driven (bool, optional): Run on a discrete-event virtual clock. Defaults to False.
+        seed (int, optional): Seed of the simulation random streams. Defaults to None.
+    
+    Returns:
+        dict: JSON-serialisable parameters of the cell
+    """
+    params = {
+        'topology': topology,
+        'algorithm': algorithm,
+        'load': load,
+        'duration': duration,
+        'seed': seed,
+        'event_driven': event_driven,
+        'congestion_threshold': CONGESTION_THRESHOLD,
+        'load_balance_threshold': LOAD_BALANCE_THRESHOLD,
+        'buffer_size': BUFFER_SIZE,
+        'queue_process_time': QUEUE_PROCESS_TIME
+    }
+    if is_topology_file(topology):
+        # The simulator sources do not cover the topology file, a changed file must miss
+        params['topology_hash'] = file_hash(topology)
+    return params
+
+def run_sim_cells(cells, duration, topology, event_driven=False, jobs=1, pause=0, cache=None, seed=None,
+                  telemetry_interval=None, profile=False, trace_hops=False, save_packets=False, output_dir=None):
+    """
+    Run a list of (algorithm, load) cells, either one after another or in a pool of worker processes.
+    
+    Args:
+        cells (list): List of (algorithm, load) tuples
+        duration (int): Duration of each simulation in seconds
+        topology (int or str): Network topology to use (0=small, 1=big or a synthetic spec)
+        event_driven (bool, optional): Run on a discrete-event virtual clock. Defaults to False.
+        jobs (int, optional): Number of worker processes. Defaults to 1 (run in this process).
+        pause (float, optional): Seconds to wait between sequential real-time runs. Defaults to 0.
+        cache (ResultCache, optional): Cache to reuse and store cell results, only used for seeded runs.
+            Defaults to None.
+        seed (int, optional): Seed of the simulation random streams. Defaults to None.
+        telemetry_interval (float, optional): Seconds between telemetry samples, None to disable. Defaults to None.
+        profile (bool, optional): Time the routing and forwarding hot paths. Defaults to False.
+        trace_hops (bool, optional): Record the timestamps of every hop in a binary trace file. Defaults to False.
+        save_packets (bool, optional): Save the per-packet results in a binary columnar file. Defaults to False.
+        output_dir (str, optional): Directory the telemetry, profile, trace and packet files are saved to.
+            Defaults to None.
+    
+    Returns:
+        list: One (error_rate, throughput, avg_trans_time, latency_histogram) tuple per cell, in order
+    """
+    if cache and seed is None:
+        # An unseeded cell is a fresh random sample, a cached result would only replay an earlier one
+        logger.info('No seed given, simulation results are not cached')
+        cache = None
+    results = [None] * len(cells)
+    params = [cell_params(algorithm, load, duration, topology, event_driven, seed) for algorithm, load in cells]
+    pending = []
+    # Telemetry, profiles, traces and packet files need the run itself, cached results are stored but not reused
+    reuse = cache and not (telemetry_interval or profile or trace_hops or save_packets)
+    for i, (algorithm, load) in enumerate(cells):
+        cached = cache.get(params[i]) if reuse else None
+        if cached:
+            logger.info(f'{ALGORITHM_NAMES[algorithm]} Sim with load {load} pkt/s: cached')
+            results[i] = cached
+        else:
+            pending.append(i)
+    
+    def store(i, result):
+        results[i] = result
+        if cache:
+            cache.put(params[i], result)
+    
+    if jobs > 1 and len(pending) > 1:
+        logger.info(f"Running {len(pending)} simulations on {jobs} worker processes")
+        # Reseed in each worker, forked workers would otherwise share the parent's random state
+        with ProcessPoolExecutor(max_workers=jobs, initializer=rnd.seed) as pool:
+            futures = {i: pool.submit(run_sim_cell, *cells[i], duration, topology, event_driven, seed,
+                                      telemetry_interval, profile, trace_hops, save_packets, output_dir)
+                       for i in pending}
+            for i, future in futures.items():
+                store(i, future.result())
+        return results
+    
+    for i in pending:
+        store(i, run_sim_cell(*cells[i], duration, topology, event_driven, seed, telemetry_interval, profile,
+                              trace_hops, save_packets, output_dir))
+        if pause and not event_driven:
+            time.sleep(pause)
+    return results
+
+def run_all_sims(base_load=5, duration=180, topology=0, save_dir=None, show_plots=True, event_driven=False, jobs=1,
+                 use_cache=True, seed=None, telemetry_interval=None, profile=False, trace_hops=False,
+                 save_packets=False, render_plots=True):
     """
     Run simulations for all routing algorithms with configurable parameters.
     
@@ -41,15 +211,29 @@ def run_all_sims(base_load=5, duration=180, topology=0, save_dir=None, show_plot
         base_load (float, optional): Starting load in packets/second. Defaults to 5. Other loads will follow the pattern:
                                     [base_load, base_load+5, base_load+15, base_load+25, base_load+30]
         duration (int, optional): Duration for each simulation in seconds. Defaults to 180.
-        topology (int, optional): Network topology to use (0=small, 1=big). Defaults to 0.
+        topology (int or str, optional): Network topology to use (0=small, 1=big or a synthetic spec). Defaults to 0.
         save_dir (str, optional): Directory to save results and plots. Defaults to None (current directory).
         show_plots (bool, optional): Whether to display plots. Defaults to True.
+        event_driven (bool, optional): Run on a discrete-event virtual clock. Defaults to False.
+        jobs (int, optional): Number of worker processes running simulations in parallel. Defaults to 1.
+        use_cache (bool, optional): Reuse cached results of identical seeded simulations. Defaults to True.
+        seed (int, optional): Seed of every simulation, so algorithms see the same traffic. Defaults to None.
+        telemetry_interval (float, optional): Seconds between telemetry samples saved as a .npz file
+            per simulation, None to disable. Defaults to None.
+        profile (bool, optional): Time the routing and forwarding hot paths and save a ranked report
+            and collapsed stacks per simulation. Defaults to False.
+        trace_hops (bool, optional): Save the timestamps of every hop as hoptrace_<algorithm>_<load>pps.bin
+            per simulation, see hop_trace.py. Defaults to False.
+        save_packets (bool, optional): Save the per-packet results as packets_<algorithm>_<load>pps.bin
+            per simulation, see packet_table.query_packets. Defaults to False.
+        render_plots (bool, optional): Render the plots once the results are saved, see report.py.
+            Defaults to True.
     
     Returns:
         dict: Dictionary containing the simulation results for all algorithms
     """
     loads = generate_load_series(base_load)
-    topology_name = "small" if topology == 0 else "big"
+    topology_name = get_topology_name(topology)
     
     # Generate timestamp in MMDDHHMM format
     timestamp = time.strftime("%m%d%H%M")
@@ -62,150 +246,39 @@ def run_all_sims(base_load=5, duration=180, topology=0, save_dir=None, show_plot
     os.makedirs(base_results_dir, exist_ok=True)
     results_dir = os.path.join(base_results_dir, f'results_{timestamp}')
     os.makedirs(results_dir, exist_ok=True)
+    cache = ResultCache(os.path.join(base_results_dir, "cache")) if use_cache else None
     
     # Initialize results dictionaries
-    hop_count_results = {'er': [], 'throughput': [], 'tx': []}
-    wcett_results = {'er': [], 'throughput': [], 'tx': []}
-    wcett_lb_post_results = {'er': [], 'throughput': [], 'tx': []}
-    wcett_lb_pre_results = {'er': [], 'throughput': [], 'tx': []}
-    
-    # Track highest tx runs for each algorithm
-    highest_tx_runs = {
-        'hop_count': {'load': 0, 'tx': 0, 'all_tx': []},
-        'wcett': {'load': 0, 'tx': 0, 'all_tx': []},
-        'wcett_lb_post': {'load': 0, 'tx': 0, 'all_tx': []},
-        'wcett_lb_pre': {'load': 0, 'tx': 0, 'all_tx': []}
-    }
+    hop_count_results = new_results()
+    wcett_results = new_results()
+    wcett_lb_post_results = new_results()
+    wcett_lb_pre_results = new_results()
+    
+    # Transmission times of all loads, merged per algorithm
+    merged_histograms = {key: LatencyHistogram() for key in RESULT_KEYS.values()}
     
     # Run all simulations
     logger.info(f"=== Running simulations with {topology_name} topology, duration={duration}s ===")
     logger.info(f"Load series: {loads} packets/second")
     
-    # Hop Count simulations
-    for load in loads:
-        logger.info(f'Hop Count Sim with load {load} pkt/s')
-        reset_id_managers()
-        sim = MeshNetworkSimulator(topology)
-        sim.hop_count_sim()
-        er, throughput, tx, all_tx = sim.simulate_traffic(duration=duration, load=load)
-        hop_count_results['er'].append(er)
-        hop_count_results['throughput'].append(throughput)
-        hop_count_results['tx'].append(tx)
-        
-        # Check if this run has higher average transmission time
-        if tx > highest_tx_runs['hop_count']['tx']:
-            highest_tx_runs['hop_count']['load'] = load
-            highest_tx_runs['hop_count']['tx'] = tx
-            highest_tx_runs['hop_count']['all_tx'] = all_tx
-        
-        del sim # forcing python garbage collection
-        time.sleep(2)
-    
-    # WCETT simulations
-    for load in loads:
-        logger.info(f'WCETT Sim with load {load} pkt/s')
-        reset_id_managers()
-        sim = MeshNetworkSimulator(topology)
-        sim.wcett_sim()
-        er, throughput, tx, all_tx = sim.simulate_traffic(duration=duration, load=load)
-        wcett_results['er'].append(er)
-        wcett_results['throughput'].append(throughput)
-        wcett_results['tx'].append(tx)
-        
-        # Check if this run has higher average transmission time
-        if tx > highest_tx_runs['wcett']['tx']:
-            highest_tx_runs['wcett']['load'] = load
-            highest_tx_runs['wcett']['tx'] = tx
-            highest_tx_runs['wcett']['all_tx'] = all_tx
-        
-        del sim
-        time.sleep(2)
-    
-    # WCETT-LB Post simulations
-    for load in loads:
-        logger.info(f'WCETT-LB Post Sim with load {load} pkt/s')
-        reset_id_managers()
-        sim = MeshNetworkSimulator(topology)
-        sim.wcett_lb_post_sim()
-        er, throughput, tx, all_tx = sim.simulate_traffic(duration=duration, load=load)
-        wcett_lb_post_results['er'].append(er)
-        wcett_lb_post_results['throughput'].append(throughput)
-        wcett_lb_post_results['tx'].append(tx)
-        
-        # Check if this run has higher average transmission time
-        if tx > highest_tx_runs['wcett_lb_post']['tx']:
-            highest_tx_runs['wcett_lb_post']['load'] = load
-            highest_tx_runs['wcett_lb_post']['tx'] = tx
-            highest_tx_runs['wcett_lb_post']['all_tx'] = all_tx
-        
-        del sim
-        time.sleep(2)
-    
-    # WCETT-LB Pre simulations
-    for load in loads:
-        logger.info(f'WCETT-LB Pre Sim with load {load} pkt/s')
-        reset_id_managers()
-        sim = MeshNetworkSimulator(topology)
-        sim.wcett_lb_pre_sim()
-        er, throughput, tx, all_tx = sim.simulate_traffic(duration=duration, load=load)
-        wcett_lb_pre_results['er'].append(er)
-        wcett_lb_pre_results['throughput'].append(throughput)
-        wcett_lb_pre_results['tx'].append(tx)
-        
-        # Check if this run has higher average transmission time
-        if tx > highest_tx_runs['wcett_lb_pre']['tx']:
-            highest_tx_runs['wcett_lb_pre']['load'] = load
-            highest_tx_runs['wcett_lb_pre']['tx'] = tx
-            highest_tx_runs['wcett_lb_pre']['all_tx'] = all_tx
-        
-        del sim
-        time.sleep(2)
-    
-    # Create plots
-    # Plot Error Rate
-    plt.figure(figsize=(10, 6))
-    plt.plot(loads, hop_count_results['er'], marker='o', label='Hop Count')
-    plt.plot(loads, wcett_results['er'], marker='s', label='WCETT')
-    plt.plot(loads, wcett_lb_post_results['er'], marker='^', label='WCETT-LB Post')
-    plt.plot(loads, wcett_lb_pre_results['er'], marker='P', label='WCETT-LB Pre')
-    plt.xlabel("Load (pkts/sec)")
-    plt.ylabel("Error rate (%)")
-    plt.title(f"Error Rate Comparison ({topology_name} topology, {duration}s)")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig(os.path.join(results_dir, "error_rate_comparison.png"))
-    
-    # Plot Throughput
-    plt.figure(figsize=(10, 6))
-    plt.plot(loads, hop_count_results['throughput'], marker='o', label='Hop Count')
-    plt.plot(loads, wcett_results['throughput'], marker='s', label='WCETT')
-    plt.plot(loads, wcett_lb_post_results['throughput'], marker='^', label='WCETT-LB Post')
-    plt.plot(loads, wcett_lb_pre_results['throughput'], marker='P', label='WCETT-LB Pre')
-    plt.xlabel("Load (pkts/sec)")
-    plt.ylabel("Throughput (Kbps)")
-    plt.title(f"Throughput Comparison ({topology_name} topology, {duration}s)")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig(os.path.join(results_dir, "throughput_comparison.png"))
-    
-    # Plot End-to-End Transmission time
-    plt.figure(figsize=(10, 6))
-    plt.plot(loads, hop_count_results['tx'], marker='o', label='Hop Count')
-    plt.plot(loads, wcett_results['tx'], marker='s', label='WCETT')
-    plt.plot(loads, wcett_lb_post_results['tx'], marker='^', label='WCETT-LB Post')
-    plt.plot(loads, wcett_lb_pre_results['tx'], marker='P', label='WCETT-LB Pre')
-    plt.xlabel("Load (pkts/sec)")
-    plt.ylabel("Transmission Time (s)")
-    plt.title(f"Transmission Time Comparison ({topology_name} topology, {duration}s)")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig(os.path.join(results_dir, "tx_comparison.png"))
-    
-    if show_plots:
-        plt.show()
+    results_by_key = {
+        'hop_count': hop_count_results,
+        'wcett': wcett_results,
+        'wcett_lb_post': wcett_lb_post_results,
+        'wcett_lb_pre': wcett_lb_pre_results
+    }
+    cells = [(algorithm, load) for algorithm in SIM_METHODS for load in loads]
+    cell_results = run_sim_cells(cells, duration, topology, event_driven, jobs, pause=2, cache=cache, seed=seed,
+                                 telemetry_interval=telemetry_interval, profile=profile,
+                                 trace_hops=trace_hops, save_packets=save_packets, output_dir=results_dir)
+    
+    for (algorithm, _), (er, throughput, tx, histogram) in zip(cells, cell_results):
+        key = RESULT_KEYS[algorithm]
+        add_cell_result(results_by_key[key], er, throughput, tx, histogram)
+        merged_histograms[key].merge(histogram)
+    
+    for key, histogram in merged_histograms.items():
+        results_by_key[key]['latency_histogram'] = histogram.to_dict()
     
     # Gather all results
     all_results = {
@@ -213,9 +286,16 @@ def run_all_sims(base_load=5, duration=180, topology=0, save_dir=None, show_plot
             'timestamp': timestamp,
             'topology': topology_name,
             'duration': duration,
+            'event_driven': event_driven,
+            'seed': seed,
             'Congestion threshold': CONGESTION_THRESHOLD,
             'Load-balancing threshold': LOAD_BALANCE_THRESHOLD,
-            'loads': loads
+            'loads': loads,
+            'telemetry_interval': telemetry_interval,
+            'profile': profile,
+            'trace_hops': trace_hops,
+            'save_packets': save_packets,
+            'cache': cache.report() if cache else None
         },
         'hop_count': hop_count_results,
         'wcett': wcett_results,
@@ -235,31 +315,14 @@ def run_all_sims(base_load=5, duration=180, topology=0, save_dir=None, show_plot
     logger.info(f"Duration: {duration} seconds per simulation")
     logger.info(f"Loads tested: {loads}")
     
-    # Generate histograms for the runs with highest average transmission time
-    for alg, data in highest_tx_runs.items():
-        if alg in ['hop_count', 'wcett']:
-            continue
-        if data['all_tx']:
-            alg_name = {
-                'hop_count': 'Hop Count',
-                'wcett': 'WCETT',
-                'wcett_lb_post': 'WCETT-LB Post',
-                'wcett_lb_pre': 'WCETT-LB Pre'
-            }[alg]
-            
-            logger.info(f"Generating transmission time histogram for {alg_name} with load {data['load']} pkt/s")
-            generate_trans_histogram(
-                data['all_tx'],
-                alg_name,
-                data['load'],
-                topology_name,
-                duration,
-                results_dir
-            )
-
+    if render_plots:
+        render_report([results_dir], jobs=jobs, show=show_plots)
+    
     return all_results
 
-def run_single_algorithm_sim(algorithm, base_load=5, duration=180, topology=0, save_dir=None, show_plots=True, hist_path=None):
+def run_single_algorithm_sim(algorithm, base_load=5, duration=180, topology=0, save_dir=None, show_plots=True, hist_path=None,
+                             event_driven=False, jobs=1, use_cache=True, seed=None, telemetry_interval=None,
+                             profile=False, trace_hops=False, save_packets=False, render_plots=True):
     """
     Run simulations for a single routing algorithm.
     
@@ -267,17 +330,31 @@ def run_single_algorithm_sim(algorithm, base_load=5, duration=180, topology=0, s
         algorithm (str): Routing algorithm to use ('hop', 'wcett', 'wcett_lb_post', or 'wcett_lb_pre')
         base_load (float, optional): Starting load in packets/second. Defaults to 5.
         duration (int, optional): Duration for each simulation in seconds. Defaults to 180.
-        topology (int, optional): Network topology to use (0=small, 1=big). Defaults to 0.
+        topology (int or str, optional): Network topology to use (0=small, 1=big or a synthetic spec). Defaults to 0.
         save_dir (str, optional): Directory to save results and plots. Defaults to None.
         show_plots (bool, optional): Whether to display plots. Defaults to True.
         hist_path (str, optional): Path to save the transmission time histogram. Defaults to None.
+        event_driven (bool, optional): Run on a discrete-event virtual clock. Defaults to False.
+        jobs (int, optional): Number of worker processes running simulations in parallel. Defaults to 1.
+        use_cache (bool, optional): Reuse cached results of identical seeded simulations. Defaults to True.
+        seed (int, optional): Seed of every simulation, so algorithms see the same traffic. Defaults to None.
+        telemetry_interval (float, optional): Seconds between telemetry samples saved as a .npz file
+            per simulation, None to disable. Defaults to None.
+        profile (bool, optional): Time the routing and forwarding hot paths and save a ranked report
+            and collapsed stacks per simulation. Defaults to False.
+        trace_hops (bool, optional): Save the timestamps of every hop as hoptrace_<algorithm>_<load>pps.bin
+            per simulation, see hop_trace.py. Defaults to False.
+        save_packets (bool, optional): Save the per-packet results as packets_<algorithm>_<load>pps.bin
+            per simulation, see packet_table.query_packets. Defaults to False.
+        render_plots (bool, optional): Render the plots once the results are saved, see report.py.
+            Defaults to True.
         
     Returns:
         dict: Dictionary containing the results for the algorithm
     """
     # Generate loads based on the base_load parameter
     loads = generate_load_series(base_load)
-    topology_name = "small" if topology == 0 else "big"
+    topology_name = get_topology_name(topology)
     
     # Generate timestamp in MMDDHHMM format
     timestamp = time.strftime("%m%d%H%M")
@@ -290,98 +367,33 @@ def run_single_algorithm_sim(algorithm, base_load=5, duration=180, topology=0, s
     os.makedirs(base_results_dir, exist_ok=True)
     results_dir = os.path.join(base_results_dir, f'results_{timestamp}')
     os.makedirs(results_dir, exist_ok=True)
+    cache = ResultCache(os.path.join(base_results_dir, "cache")) if use_cache else None
     
     # Initialize results
-    results = {'er': [], 'throughput': [], 'tx': []}
+    results = new_results()
     
-    # Map algorithm name to method
-    algorithm_methods = {
-        'hop': lambda sim: sim.hop_count_sim(),
-        'wcett': lambda sim: sim.wcett_sim(),
-        'wcett_lb_post': lambda sim: sim.wcett_lb_post_sim(),
-        'wcett_lb_pre': lambda sim: sim.wcett_lb_pre_sim()
-    }
+    algorithm_names = ALGORITHM_NAMES
     
-    algorithm_names = {
-        'hop': 'Hop Count',
-        'wcett': 'WCETT',
-        'wcett_lb_post': 'WCETT-LB Post',
-        'wcett_lb_pre': 'WCETT-LB Pre'
-    }
-    
-    if algorithm not in algorithm_methods:
+    if algorithm not in SIM_METHODS:
         logger.debug(f"Unknown algorithm: {algorithm}")
-        logger.debug(f"Valid options are: {', '.join(algorithm_methods.keys())}")
+        logger.debug(f"Valid options are: {', '.join(SIM_METHODS.keys())}")
         return None
     
     logger.info(f"=== Running {algorithm_names[algorithm]} simulation with {topology_name} topology ===")
     logger.info(f"Load series: {loads} packets/second")
     
-    # Track the run with highest average transmission time
-    highest_tx_run = {
-        'load': 0,
-        'tx': 0,
-        'all_tx': []
-    }
+    merged_histogram = LatencyHistogram()
     
-    for load in loads:
-        logger.info(f"{algorithm_names[algorithm]} Sim with load {load} pkt/s")
-        reset_id_managers()
-        sim = MeshNetworkSimulator(topology)
-        algorithm_methods[algorithm](sim)
-        er, throughput, tx, all_tx = sim.simulate_traffic(duration=duration, load=load)
-        results['er'].append(er)
-        results['throughput'].append(throughput)
-        results['tx'].append(tx)
-        
-        # Check if this run has higher average transmission time
-        if tx > highest_tx_run['tx']:
-            highest_tx_run['load'] = load
-            highest_tx_run['tx'] = tx
-            highest_tx_run['all_tx'] = all_tx
-        
-        del sim
-        time.sleep(1)
-    
-    # Create plots
-    plt.figure(figsize=(10, 6))
-    plt.plot(loads, results['er'], marker='o')
-    plt.xlabel("Load (pkts/sec)")
-    plt.ylabel("Error rate (%)")
-    plt.title(f"{algorithm_names[algorithm]} Error Rate ({topology_name} topology, {duration}s)")
-    plt.grid(True)
-    plt.savefig(os.path.join(results_dir, f"{algorithm}_error_rate.png"))
-    
-    plt.figure(figsize=(10, 6))
-    plt.plot(loads, results['throughput'], marker='s')
-    plt.xlabel("Load (pkts/sec)")
-    plt.ylabel("Throughput (Kbps)")
-    plt.title(f"{algorithm_names[algorithm]} Throughput ({topology_name} topology, {duration}s)")
-    plt.grid(True)
-    plt.savefig(os.path.join(results_dir, f"{algorithm}_throughput.png"))
-    
-    plt.figure(figsize=(10, 6))
-    plt.plot(loads, results['tx'], marker='^')
-    plt.xlabel("Load (pkts/sec)")
-    plt.ylabel("Transmission time (s)")
-    plt.title(f"{algorithm_names[algorithm]} Transmission time ({topology_name} topology, {duration}s)")
-    plt.grid(True)
-    plt.savefig(os.path.join(results_dir, f"{algorithm}_tx.png"))
-    
-    if show_plots:
-        plt.show()
-    
-    # Generate histogram for the run with highest average transmission time
-    if highest_tx_run['all_tx'] and algorithm in ['wcett_lb_post', 'wcett_lb_pre']:
-        logger.info(f"Generating Transmission Time histogram for {algorithm_names[algorithm]} with load {highest_tx_run['load']} pkt/s")
-        generate_trans_histogram(
-            highest_tx_run['all_tx'],
-            algorithm_names[algorithm],
-            highest_tx_run['load'],
-            topology_name,
-            duration,
-            results_dir
-        )
+    cells = [(algorithm, load) for load in loads]
+    cell_results = run_sim_cells(cells, duration, topology, event_driven, jobs, pause=1, cache=cache, seed=seed,
+                                 telemetry_interval=telemetry_interval, profile=profile,
+                                 trace_hops=trace_hops, save_packets=save_packets, output_dir=results_dir)
+    
+    for er, throughput, tx, histogram in cell_results:
+        add_cell_result(results, er, throughput, tx, histogram)
+        merged_histogram.merge(histogram)
+    
+    results['latency_histogram'] = merged_histogram.to_dict()
     
     # Save results
     all_results = {
@@ -390,9 +402,16 @@ def run_single_algorithm_sim(algorithm, base_load=5, duration=180, topology=0, s
             'algorithm': algorithm,
             'topology': topology_name,
             'duration': duration,
+            'event_driven': event_driven,
+            'seed': seed,
             'Congestion threshold': CONGESTION_THRESHOLD,
             'Load-balancing threshold': LOAD_BALANCE_THRESHOLD,
-            'loads': loads
+            'loads': loads,
+            'telemetry_interval': telemetry_interval,
+            'profile': profile,
+            'trace_hops': trace_hops,
+            'save_packets': save_packets,
+            'cache': cache.report() if cache else None
         },
         'results': results
     }
@@ -404,71 +423,55 @@ def run_single_algorithm_sim(algorithm, base_load=5, duration=180, topology=0, s
     logger.info(f"Results saved to: {results_dir}")
     logger.info(f"Timestamp: {timestamp}")
     
+    if render_plots:
+        render_report([results_dir], jobs=jobs, show=show_plots)
+    
     return results
 
-def generate_trans_histogram(all_tx, algorithm, load, topology_name, duration, output_path):
+def new_results():
     """
-    Generate a histogram of end-to-end packet transmission time.
-    
-    Args:
-        all_tx (list): List of packet transmission times in seconds
-        algorithm (str): Name of the routing algorithm
-        load (float): Network load in packets per second
-        topology_name (str): Name of the network topology
-        duration (int): Simulation duration in seconds
-        output_path (str): Directory to save the histogram
+    Create the empty per-load results of one algorithm.
     
     Returns:
-        str: Path to the saved histogram file
+        dict: Lists of error rate, throughput, mean transmission time, its percentiles
+            and the per-load transmission time histograms
     """
-    if not all_tx:
-        logger.warning("No transmission time data available to generate histogram")
-        return None
-    
-    # Convert algorithm name to consistent filename format (lowercase with underscores)
-    alg_filename = algorithm.lower().replace(' ', '_').replace('-', '_')
-    
-    # Save raw data to CSV file
-    os.makedirs(output_path, exist_ok=True)
-    csv_filename = f"{alg_filename}_tx_data_{int(load)}pps.csv"
-    csv_filepath = os.path.join(output_path, csv_filename)
-    
-    # Write raw transmission time data
-    with open(csv_filepath, 'w') as f:
-        f.write("packet_id,transmission_time_seconds\n")
-        for i, tx_time in enumerate(all_tx):
-            f.write(f"{i},{tx_time}\n")
+    results = {'er': [], 'throughput': [], 'tx': []}
+    for percent in PERCENTILES:
+        results[f'p{percent}'] = []
+    results['latency_histograms'] = []
+    return results
+
+def add_cell_result(results, er, throughput, tx, histogram):
+    """
+    Append the outcome of one simulation run to the per-load results of an algorithm.
     
-    logger.info(f"Raw transmission time data saved to: {csv_filepath}")
-        
-    plt.figure(figsize=(10, 6))
-    plt.hist(all_tx, bins=50, alpha=0.75, edgecolor='black')
-    
-    # Add mean and median lines
-    mean_tx = sum(all_tx) / len(all_tx)
-    
-    plt.axvline(mean_tx, color='r', linestyle='dashed', linewidth=1, label=f'Mean: {mean_tx:.3f}s')
-    
-    plt.xlabel("Transmission Time (seconds)")
-    plt.ylabel("Number of Packets")
-    plt.title(f"{algorithm} Transmission Distribution\n(Load: {load} pkt/s, {topology_name} topology, {duration}s)")
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    
-    # Make sure the directory exists
-    histogram_filename = f"{alg_filename}_tx_histogram_{int(load)}pps.png"
-    histogram_filepath = os.path.join(output_path, histogram_filename)
-    plt.savefig(histogram_filepath)
-    logger.info(f"Transmission Time histogram saved to: {histogram_filepath}")
-    return histogram_filepath
-        
+    Args:
+        results (dict): Results created by new_results
+        er (float): Error rate in percent
+        throughput (float): Throughput in Kbps
+        tx (float): Average transmission time in seconds
+        histogram (LatencyHistogram): Transmission times of the delivered packets
+    """
+    results['er'].append(er)
+    results['throughput'].append(throughput)
+    results['tx'].append(tx)
+    for percent in PERCENTILES:
+        results[f'p{percent}'].append(histogram.percentile(percent))
+    results['latency_histograms'].append(histogram.to_dict())
 
 def main():
     """
     Main entry point for the simulation script.
-    Parses command-line arguments and runs the specified simulation.
+    Parses command-line arguments and runs the specified simulation,
+    or renders the plots of saved results with "sim.py report <directories>".
     """
-    parser = argparse.ArgumentParser(description='Wireless Mesh Network Performance Comparison')
+    if sys.argv[1:2] == ['report']:
+        report_main(sys.argv[2:], prog='sim.py report')
+        return
+    
+    parser = argparse.ArgumentParser(description='Wireless Mesh Network Performance Comparison',
+                                     epilog='Run "sim.py report -h" to render the plots of saved results.')
     
     parser.add_argument('-a', '--algorithm', type=str,
                         choices=['hop', 'wcett', 'wcett_lb_post', 'wcett_lb_pre', 'all'],
@@ -478,25 +481,53 @@ def main():
                              'base_load, base_load+5, base_load+15, base_load+25, base_load+30')
     parser.add_argument('-d', '--duration', type=int, default=180,
                         help='Simulation duration in seconds (default: 180)')
-    parser.add_argument('-t', '--topology', type=int, choices=[0, 1], default=0,
-                        help='Network topology: 0=small, 1=big (default: 0)')
+    parser.add_argument('-t', '--topology', type=topology_arg, default=0,
+                        help='Network topology: 0=small, 1=big, a synthetic spec such as '
+                             'grid:30x30,igw=4 or a .json/.csv topology file (default: 0)')
     parser.add_argument('-o', '--output', type=str, help='Directory to save results')
     parser.add_argument('--no-show', action='store_true',
                         help='Do not display plots (just save them)')
+    parser.add_argument('--no-plots', action='store_true',
+                        help='Only save the results, render the plots later with "sim.py report"')
+    parser.add_argument('-e', '--event-driven', action='store_true',
+                        help='Run on a discrete-event virtual clock instead of real time')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='Seed for reproducible topology channels, link losses and traffic')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Run every simulation even if a cached result exists')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes to run simulations in parallel (default: 1)')
+    parser.add_argument('--telemetry', type=float, default=None, metavar='SECONDS',
+                        help='Sample node queues and edge traffic every SECONDS and save them as '
+                             'telemetry_<algorithm>_<load>pps.npz next to the results')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time the routing and forwarding hot paths and save profile_<algorithm>_<load>pps.txt '
+                             '(ranked report) and .folded (collapsed stacks) next to the results')
+    parser.add_argument('--trace-hops', action='store_true',
+                        help='Record enqueue, dequeue, transmission, ACK and retry times of every hop in '
+                             'hoptrace_<algorithm>_<load>pps.bin next to the results (see hop_trace.py)')
+    parser.add_argument('--save-packets', action='store_true',
+                        help='Save the id, endpoints, times, hops and outcome of every packet in '
+                             'packets_<algorithm>_<load>pps.bin next to the results')
     
     args = parser.parse_args()
     
     if args.algorithm == 'all':
         run_all_sims(base_load=args.base_load, duration=args.duration, topology=args.topology,
-                     save_dir=args.output, show_plots=not args.no_show)
+                     save_dir=args.output, show_plots=not args.no_show, event_driven=args.event_driven,
+                     jobs=args.jobs, use_cache=not args.no_cache, seed=args.seed, telemetry_interval=args.telemetry,
+                     profile=args.profile, trace_hops=args.trace_hops, save_packets=args.save_packets,
+                     render_plots=not args.no_plots)
     else:
         run_single_algorithm_sim(args.algorithm, base_load=args.base_load, duration=args.duration,
                                  topology=args.topology, save_dir=args.output, 
-                                 show_plots=not args.no_show)
+                                 show_plots=not args.no_show, event_driven=args.event_driven, jobs=args.jobs,
+                                 use_cache=not args.no_cache, seed=args.seed, telemetry_interval=args.telemetry,
+                                 profile=args.profile, trace_hops=args.trace_hops, save_packets=args.save_packets,
+                                 render_plots=not args.no_plots)
 
 if __name__ == "__main__":
     # If run directly without arguments, use the default settings
-    import sys
     if len(sys.argv) == 1:
         setup_logging()
         run_all_sims()
@@ -0,0 +1,177 @@
+import threading
+import time
+
+import numpy as np
+
+from log_config import get_logger
+
+logger = get_logger("telemetry")
+
+TELEMETRY_INTERVAL = 1.0 # seconds between telemetry samples
+TELEMETRY_CAPACITY = 4096 # samples kept per run, the oldest are overwritten once full
+
+class Telemetry:
+    """
+    Time series of the queue depths, drops and congestion flags of every node and
+    the traffic of every edge of a network.
+
+    Samples go into NumPy ring buffers allocated up front, one row per sample and
+    one column per node or edge, so sampling a run of any length costs constant
+    memory. Drops and edge traffic are cumulative counters; their per-interval
+    rates are the differences between consecutive rows.
+    """
+    def __init__(self, network, interval=TELEMETRY_INTERVAL, capacity=TELEMETRY_CAPACITY):
+        """
+        Args:
+            network (Graph): The network to sample.
+            interval (float, optional): Seconds between samples. Defaults to TELEMETRY_INTERVAL.
+            capacity (int, optional): Number of samples kept. Defaults to TELEMETRY_CAPACITY.
+        """
+        if interval <= 0:
+            raise ValueError("Telemetry interval must be positive")
+        self.network = network
+        self.interval = interval
+        self.capacity = capacity
+        self.nodes = [network.nodes[node_id] for node_id in sorted(network.nodes)]
+        self.edges = [network.edges[edge_id] for edge_id in sorted(network.edges)]
+        node_count = len(self.nodes)
+        edge_count = len(self.edges)
+
+        self.time = np.zeros(capacity)
+        self.queue_depth = np.zeros((capacity, node_count), dtype=np.int32)
+        self.drops = np.zeros((capacity, node_count), dtype=np.int64)
+        self.congested = np.zeros((capacity, node_count), dtype=bool) # WCETT-LB Post congestion status
+        self.predicted = np.zeros((capacity, node_count), dtype=bool) # WCETT-LB Pre predicted congestion
+        self.edge_bytes = np.zeros((capacity, edge_count), dtype=np.int64)
+        self.edge_packets = np.zeros((capacity, edge_count), dtype=np.int64)
+        self.samples = 0 # samples taken, row samples % capacity is written next
+
+        self.running = False
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def sample(self):
+        """
+        Record the current state of every node and edge.
+        """
+        row = self.samples % self.capacity
+        self.time[row] = self.network.clock()
+        for column, node in enumerate(self.nodes):
+            self.queue_depth[row, column] = node.queue.qsize()
+            self.drops[row, column] = node.stats.dropped_total
+            self.congested[row, column] = node.congest_status
+            self.predicted[row, column] = getattr(node, 'predicted_congestion', False)
+        for column, edge in enumerate(self.edges):
+            self.edge_bytes[row, column] = edge.bytes_sent
+            self.edge_packets[row, column] = edge.packets_sent
+        self.samples += 1
+
+    def event_sample(self, until):
+        """
+        Take a sample and reschedule (discrete-event mode).
+
+        Args:
+            until (float): Virtual time after which no further samples are scheduled.
+        """
+        self.sample()
+        if self.network.clock() + self.interval < until:
+            self.network.scheduler.schedule(self.interval, self.event_sample, until)
+
+    def run(self):
+        """
+        Sample every interval until stopped (real-time mode).
+        """
+        while self.running:
+            start = time.monotonic()
+            self.sample()
+            self.stop_event.wait(max(0.0, self.interval - (time.monotonic() - start)))
+
+    def start(self):
+        """
+        Start the sampling thread (real-time mode).
+        """
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the sampling thread and take a final sample, so the counters cover the whole run.
+        """
+        self.running = False
+        self.stop_event.set()
+        if self.thread is not None and self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+        self.sample()
+
+    def series(self):
+        """
+        Return the kept samples in chronological order.
+
+        Returns:
+            dict: Node and edge IDs, node types, edge endpoints and one array per
+                sampled quantity, rows ordered by time
+        """
+        count = min(self.samples, self.capacity)
+        # Once the ring has wrapped the oldest kept sample is the next row to be written
+        start = self.samples % self.capacity if self.samples > self.capacity else 0
+        order = (np.arange(count) + start) % self.capacity
+        return {
+            'interval': np.float64(self.interval),
+            'node_id': np.array([node.id for node in self.nodes], dtype=np.int32),
+            'node_type': np.array([node.type for node in self.nodes]),
+            'edge_id': np.array([edge.id for edge in self.edges], dtype=np.int32),
+            'edge_src': np.array([edge.src.id for edge in self.edges], dtype=np.int32),
+            'edge_dest': np.array([edge.dest.id for edge in self.edges], dtype=np.int32),
+            'time': self.time[order],
+            'queue_depth': self.queue_depth[order],
+            'drops': self.drops[order],
+            'congested': self.congested[order],
+            'predicted': self.predicted[order],
+            'edge_bytes': self.edge_bytes[order],
+            'edge_packets': self.edge_packets[order]
+        }
+
+    def export(self, path):
+        """
+        Save the samples as a compressed .npz file, readable with numpy.load.
+
+        Args:
+            path (str): File to write.
+        """
+        np.savez_compressed(path, **self.series())
+        logger.info(f"Telemetry: {min(self.samples, self.capacity)} samples of {len(self.nodes)} nodes "
+                    f"and {len(self.edges)} edges saved to {path}")
+
+def bottlenecks(series, top=3):
+    """
+    Rank the nodes by their mean queue depth over a run.
+
+    Args:
+        series (dict): Telemetry.series() or the contents of an exported .npz file.
+        top (int, optional): Number of nodes to return. Defaults to 3.
+
+    Returns:
+        list: One dict per node, the most loaded first, with the node ID and type,
+            mean and max queue depth, drops during the kept samples and the
+            fraction of samples the node was congested or predicted to be
+    """
+    queue_depth = series['queue_depth']
+    if not len(queue_depth):
+        return []
+    mean_depth = queue_depth.mean(axis=0)
+    drops = series['drops'][-1] - series['drops'][0]
+    flagged = (series['congested'] | series['predicted']).mean(axis=0)
+    # Sort by mean depth, then drops, most loaded first
+    order = np.lexsort((-drops, -mean_depth))[:top]
+    return [{
+        'node_id': int(series['node_id'][column]),
+        'type': str(series['node_type'][column]),
+        'mean_queue': float(mean_depth[column]),
+        'max_queue': int(queue_depth[:, column].max()),
+        'drops': int(drops[column]),
+        'congested': float(flagged[column])
+    } for column in order]
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark import run_benchmarks, compare, scaling_exponent, all_cases
+
+class TestBenchmark(unittest.TestCase):
+    def test_report_covers_every_case_and_size(self):
+        report = run_benchmarks(sizes=(9, 16), repeat=1)
+        self.assertEqual(set(report['results']), {case.name for case in all_cases()})
+        for case, results in report['results'].items():
+            self.assertEqual(set(results), {'9', '16'})
+            for result in results.values():
+                self.assertGreater(result['seconds'], 0)
+                self.assertGreater(result['ops_per_sec'], 0)
+                self.assertGreaterEqual(result['peak_kib'], 0)
+        self.assertIn('wcett_lb_pre/update_path_tick', report['scaling'])
+
+    def test_budget_skips_larger_sizes(self):
+        report = run_benchmarks(sizes=(9, 16, 10000), repeat=1, budget=1e-6, cases=['hop/tables'])
+        self.assertEqual(set(report['results']['hop/tables']), {'9'})
+
+    def test_compare_flags_regressions(self):
+        baseline = {'results': {'hop/tables': {'9': {'seconds': 1.0, 'peak_kib': 10.0}}}}
+        report = {'results': {'hop/tables': {'9': {'seconds': 1.2, 'peak_kib': 20.0}},
+                              'wcett/tables': {'9': {'seconds': 5.0, 'peak_kib': 1.0}}}}
+        regressions = compare(report, baseline, tolerance=0.25)
+        self.assertEqual([(r['case'], r['metric']) for r in regressions], [('hop/tables', 'peak_kib')])
+
+    def test_compare_refuses_other_settings(self):
+        grid = run_benchmarks(sizes=(9,), kind='grid', repeat=1, cases=['hop/tables'])
+        scalefree = run_benchmarks(sizes=(9,), kind='scalefree', repeat=1, cases=['hop/tables'])
+        self.assertEqual(compare(grid, grid), [])
+        with self.assertRaisesRegex(ValueError, 'kind'):
+            compare(scalefree, grid)
+        for key, value in (('seed', 2), ('igw_count', 1), ('tick_nodes', 4), ('repeat', 3)):
+            with self.subTest(key=key):
+                with self.assertRaisesRegex(ValueError, key):
+                    compare(grid, dict(grid, meta=dict(grid['meta'], **{key: value})))
+
+    def test_scaling_exponent(self):
+        self.assertAlmostEqual(scaling_exponent([(10, 1.0), (100, 100.0), (1000, 10000.0)]), 2.0)
+        self.assertIsNone(scaling_exponent([(10, 1.0)]))
+
+if __name__ == '__main__':
+    unittest.main()
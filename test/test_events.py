@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routing_alg.routing as routing
+from events import EventScheduler
+from network import Graph, ACK_TIMEOUT, PACKET_SIZE
+from packet_table import PacketTable, OUTCOMES
+
+class TestEventScheduler(unittest.TestCase):
+    def test_events_run_in_time_order(self):
+        scheduler = EventScheduler()
+        fired = []
+        scheduler.schedule(2.0, fired.append, "b")
+        scheduler.schedule(1.0, fired.append, "a")
+        scheduler.schedule(2.0, fired.append, "c")
+
+        scheduler.run()
+
+        self.assertEqual(fired, ["a", "b", "c"])
+        self.assertEqual(scheduler.now(), 2.0)
+
+    def test_cancel_and_run_until(self):
+        scheduler = EventScheduler()
+        fired = []
+        event = scheduler.schedule(1.0, fired.append, "cancelled")
+        scheduler.schedule(5.0, fired.append, "late")
+        event.cancel()
+
+        scheduler.run(until=3.0)
+
+        self.assertEqual(fired, [])
+        self.assertEqual(scheduler.now(), 3.0)
+        self.assertEqual(len(scheduler), 1)
+
+class TestEventDrivenNetwork(unittest.TestCase):
+    def setUp(self):
+        # a -- b -- c
+        self.graph = Graph()
+        self.node_a = self.graph.create_node("IGW")
+        self.node_b = self.graph.create_node("MR")
+        self.node_c = self.graph.create_node("C")
+        self.graph.add_edge(self.node_a, self.node_b, 100, 0)
+        self.graph.add_edge(self.node_b, self.node_c, 100, 0)
+
+        for node_id, node in self.graph.nodes.items():
+            next_hop = routing.HopCountRouting().compute_routing_tb(self.graph, node_id, self.node_a.id)
+            if next_hop is not None:
+                node.routing_table[self.node_a.id] = next_hop
+
+        self.scheduler = EventScheduler()
+        self.graph.attach_scheduler(self.scheduler)
+
+    def test_packet_route_and_virtual_time(self):
+        results = []
+        self.graph.send_packet_event(self.node_c.id, self.node_a.id, results.append)
+        self.scheduler.run()
+
+        self.assertEqual(len(results), 1)
+        packet = results[0]["packet"]
+        self.assertEqual(list(packet.route_taken), [self.node_c.id, self.node_b.id, self.node_a.id])
+        # Each hop moves on as soon as its ACK arrives instead of waiting for the timeout
+        self.assertLess(packet.delivered_time - packet.created_time, 2 * ACK_TIMEOUT)
+        self.assertFalse(self.node_a.running)
+        
+        ack = self.graph.ack_report()
+        self.assertEqual((ack['acked'], ack['timeouts']), (2, 0))
+        self.assertGreater(ack['mean_latency'], 0)
+        self.assertEqual(self.graph.ack_waiters, {})
+
+    def test_queues_drain_and_acks_are_serviced(self):
+        results = []
+        for _ in range(5):
+            self.graph.send_packet_event(self.node_c.id, self.node_a.id, results.append)
+        self.scheduler.run()
+
+        self.assertTrue(all(result["success"] for result in results))
+        for node in self.graph.nodes.values():
+            self.assertTrue(node.queue.empty())
+            self.assertFalse(node.busy)
+        self.assertEqual(self.node_c.stats.acks_received, 5)
+        self.assertEqual(self.graph.packet_counters()['acked'], 10)
+
+    def test_buffer_full_drops_packet(self):
+        while not self.node_b.queue.full():
+            self.node_b.queue.put_nowait((None, None))
+
+        results = []
+        self.graph.send_packet_event(self.node_c.id, self.node_a.id, results.append)
+        self.scheduler.run(until=ACK_TIMEOUT)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual((results[0]['success'], results[0]['reason']), (False, 'buffer_full'))
+        self.assertEqual(list(results[0]['packet'].route_taken), [self.node_c.id])
+
+    def test_dropped_packet_row_keeps_id_and_hops(self):
+        # The packet crosses c-b and is dropped on the inactive b-a link
+        self.graph.set_edge_active(self.graph.get_edge_between_nodes(self.node_b.id, self.node_a.id), False)
+        table = PacketTable(1)
+        self.graph.send_packet_event(self.node_c.id, self.node_a.id,
+                                     lambda result: table.record(0, self.node_c.id, self.node_a.id, result, 0.0))
+        self.scheduler.run()
+
+        self.assertNotEqual(table.id[0], -1)
+        self.assertEqual((table.hops[0], table.size[0]), (1, PACKET_SIZE))
+        self.assertFalse(table.success[0])
+        self.assertEqual(OUTCOMES[table.outcome[0]], 'edge_inactive')
+
+if __name__ == '__main__':
+    unittest.main()
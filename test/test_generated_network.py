@@ -0,0 +1,93 @@
+import unittest
+import argparse
+import random
+import time
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from networks.generated_network import grid_network, random_geometric_network, scale_free_network, build_topology, parse_spec
+from main import MeshNetworkSimulator, topology_arg
+from network import reset_id_managers
+
+def reachable(network, start_id):
+    seen = {start_id}
+    frontier = [start_id]
+    while frontier:
+        node_id = frontier.pop()
+        for neighbor in network.nodes[node_id].neighbors:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                frontier.append(neighbor)
+    return seen
+
+class TestGeneratedNetwork(unittest.TestCase):
+    def test_grid_roles_and_links(self):
+        network = grid_network(4, 5, igw_count=2, client_count=6, rng=random.Random(1))
+        types = [node.type for node in network.nodes.values()]
+        self.assertEqual((types.count("IGW"), types.count("MR"), types.count("C")), (2, 18, 6))
+        # 31 grid links plus one or two links per client
+        self.assertGreaterEqual(len(network.edges), 31 + 6)
+        for node in network.nodes.values():
+            if node.type == "C":
+                self.assertTrue(all(network.nodes[n].type == "MR" for n in node.neighbors))
+
+    def test_generators_are_connected(self):
+        for network in (grid_network(10, 10, rng=random.Random(2)),
+                        random_geometric_network(500, mean_degree=3, rng=random.Random(2)),
+                        scale_free_network(500, rng=random.Random(2))):
+            first = next(iter(network.nodes))
+            self.assertEqual(len(reachable(network, first)), len(network.nodes))
+
+    def test_greedy_channel_assignment(self):
+        network = scale_free_network(200, channel_assignment='greedy', channels=4, rng=random.Random(3))
+        channels = {edge.channel for edge in network.edges.values()}
+        self.assertEqual(channels, {1, 2, 3, 4})
+
+    def test_same_rng_gives_same_network(self):
+        def layout(seed):
+            reset_id_managers()
+            network = build_topology("geometric:300,igw=3", random.Random(seed), random.Random(seed))
+            return [(e.src.id, e.dest.id, e.bandwidth, e.channel) for e in network.edges.values()]
+        self.assertEqual(layout(4), layout(4))
+
+    def test_parse_spec(self):
+        generator, args, kwargs = parse_spec("grid:30x40,igw=4,clients=100,assign=greedy")
+        self.assertIs(generator, grid_network)
+        self.assertEqual(args, (30, 40))
+        self.assertEqual(kwargs, {'igw_count': 4, 'client_count': 100, 'channel_assignment': 'greedy'})
+        for spec in ("grid:30", "ring:10", "geometric:10,foo=1", "scalefree", "grid:4x4,degree=3",
+                     "geometric:100,links=3", "scalefree:100,degree=2", "grid:5x5,assign=bogus",
+                     "grid:5x5,igw=100", "grid:5x5,igw=0", "grid:0x0", "geometric:0", "geometric:10,clients=-1",
+                     "geometric:10,degree=0", "scalefree:10,links=x"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    parse_spec(spec)
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    topology_arg(spec)
+        self.assertEqual(parse_spec("geometric:10,degree=0.5,clients=0")[2], {'mean_degree': 0.5, 'client_count': 0})
+
+    def test_ten_thousand_nodes_build_quickly(self):
+        for assignment in ('random', 'greedy'):
+            with self.subTest(assignment=assignment):
+                # Best of two builds, so a single scheduling hiccup does not fail the target
+                elapsed = []
+                for _ in range(2):
+                    reset_id_managers()
+                    start = time.perf_counter()
+                    network = random_geometric_network(6667, igw_count=8, channel_assignment=assignment,
+                                                       rng=random.Random(5))
+                    elapsed.append(time.perf_counter() - start)
+                self.assertEqual(len(network.nodes), 10000)
+                self.assertLess(min(elapsed), 1.0)
+
+    def test_simulator_accepts_spec(self):
+        sim = MeshNetworkSimulator("grid:4x4,igw=2", event_driven=True, seed=1)
+        self.assertEqual(sim.topology_name, "grid:4x4,igw=2")
+        sim.hop_count_sim()
+        er, throughput, tx, all_tx = sim.simulate_traffic(duration=5, load=10)
+        self.assertGreater(len(all_tx), 0)
+
+if __name__ == '__main__':
+    unittest.main()
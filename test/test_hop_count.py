@@ -4,7 +4,7 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from routing_alg.hop_count import shortest_path
+from routing_alg.hop_count import shortest_path, shortest_paths_to
 from network import Graph
 
 class TestNetwork(unittest.TestCase):
@@ -35,6 +35,34 @@ class TestNetwork(unittest.TestCase):
         non_existing_id = 3
         path_a_non = shortest_path(self.graph, node_a.id, non_existing_id)
         self.assertEqual(path_a_non, [])
+    
+    def test_shortest_paths_to(self):
+        # a -- b -- c -- d
+        #      |         |
+        #      e(C) ---- f
+        node_a = self.graph.create_node("IGW")
+        node_b = self.graph.create_node("MR")
+        node_c = self.graph.create_node("MR")
+        node_d = self.graph.create_node("MR")
+        node_e = self.graph.create_node("C")
+        node_f = self.graph.create_node("MR")
+        
+        self.graph.add_edge(node_a, node_b, 100, 0.01)
+        self.graph.add_edge(node_b, node_c, 100, 0.01)
+        self.graph.add_edge(node_c, node_d, 100, 0.01)
+        self.graph.add_edge(node_b, node_e, 100, 0.01)
+        self.graph.add_edge(node_e, node_f, 100, 0.01)
+        self.graph.add_edge(node_d, node_f, 100, 0.01)
+        
+        paths = shortest_paths_to(self.graph, node_a.id)
+        
+        for node_id, path in paths.items():
+            self.assertEqual(path[0], node_id)
+            self.assertEqual(path[-1], node_a.id)
+            self.assertEqual(path, shortest_path(self.graph, node_id, node_a.id))
+        # The client must not be used as transit, so f goes round through d
+        self.assertEqual(paths[node_f.id], [node_f.id, node_d.id, node_c.id, node_b.id, node_a.id])
+        self.assertEqual(shortest_paths_to(self.graph, 99), {})
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
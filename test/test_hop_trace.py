@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MeshNetworkSimulator
+from network import reset_id_managers
+from hop_trace import read_trace, stage_times, breakdown, aggregate, STAGES
+
+class TestHopTrace(unittest.TestCase):
+    def setUp(self):
+        reset_id_managers()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def traced_run(self, algorithm):
+        path = os.path.join(self.directory.name, f"hoptrace_{algorithm}_30pps.bin")
+        sim = MeshNetworkSimulator(0, event_driven=True, seed=7, trace_path=path)
+        getattr(sim, f"{algorithm}_sim")()
+        sim.simulate_traffic(duration=10, load=30)
+        return sim, path
+
+    def test_records_cover_every_hop(self):
+        sim, path = self.traced_run('hop_count')
+        records = read_trace(path)
+        counters = sim.network.packet_counters()
+        self.assertEqual(int(records['delivered'].sum()), counters['sent'])
+        self.assertEqual(int(records['losses'].sum()), counters['dropped'].get('packet_loss', 0))
+
+        delivered = records[records['delivered']]
+        self.assertTrue(np.all(delivered['attempt'] <= delivered['tx_start']))
+        self.assertTrue(np.all(delivered['tx_start'] < delivered['tx_end']))
+        self.assertTrue(np.all(delivered['tx_end'] <= delivered['done']))
+        # The stages split the whole hop
+        stages = stage_times(records)
+        np.testing.assert_allclose(sum(stages[stage] for stage in STAGES),
+                                   delivered['done'] - delivered['attempt'], atol=1e-9)
+
+        result = breakdown(records)
+        self.assertEqual(result['hops'], len(delivered))
+        self.assertIn(result['dominant'], STAGES)
+        self.assertAlmostEqual(sum(result['share'].values()), 1.0)
+
+    def test_aggregate_groups_by_algorithm(self):
+        self.traced_run('hop_count')
+        reset_id_managers()
+        self.traced_run('wcett')
+        paths = [os.path.join(self.directory.name, name) for name in sorted(os.listdir(self.directory.name))]
+        results = aggregate(paths)
+        self.assertEqual(set(results), {'hop_count', 'wcett'})
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory.name, "other.bin")
+        with open(path, 'wb') as f:
+            f.write(b'not a trace file')
+        with self.assertRaises(ValueError):
+            read_trace(path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import subprocess
+import sys
+import os
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds allowed to import a module in a fresh interpreter, matplotlib alone takes about as long
+IMPORT_BUDGET = 0.75
+
+def import_in_subprocess(module):
+    """Import module in a fresh interpreter
+
+    Returns:
+        tuple: Import time in seconds and the names of the loaded top-level packages
+    """
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+        "print(' '.join(sorted({name.split('.')[0] for name in sys.modules})))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_DIR, capture_output=True,
+                            text=True, check=True).stdout.splitlines()
+    return float(output[0]), set(output[1].split())
+
+class TestImportTime(unittest.TestCase):
+    def test_core_modules_import_within_budget(self):
+        for module in ('main', 'network', 'routing_alg.routing'):
+            with self.subTest(module=module):
+                # Best of three, so a busy machine does not fail the test
+                seconds = min(import_in_subprocess(module)[0] for _ in range(3))
+                self.assertLess(seconds, IMPORT_BUDGET)
+
+    def test_plotting_libraries_load_lazily(self):
+        for module in ('main', 'sim', 'networks.complex_network', 'networks.generated_network'):
+            with self.subTest(module=module):
+                _, loaded = import_in_subprocess(module)
+                self.assertNotIn('matplotlib', loaded)
+                self.assertNotIn('pyvis', loaded)
+
+    def test_plots_use_headless_backend(self):
+        code = ("import os\nos.environ.pop('MPLBACKEND', None)\nos.environ.pop('DISPLAY', None)\n"
+                "os.environ.pop('WAYLAND_DISPLAY', None)\nimport sys\nsys.platform = 'linux'\n"
+                "from plotting import pyplot\nprint(pyplot(show=True).get_backend())")
+        output = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        self.assertEqual(output.lower(), 'agg')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routing_alg.routing as routing
+from routing_alg import hop_count, incremental, wcett
+from main import MeshNetworkSimulator
+from network import reset_id_managers
+from networks.generated_network import grid_network
+
+class TestIncrementalRouting(unittest.TestCase):
+    def setUp(self):
+        reset_id_managers()
+        self.rng = random.Random(11)
+        self.nw = grid_network(6, 6, igw_count=2, client_count=10, rng=self.rng)
+        self.igws = [node_id for node_id, node in self.nw.nodes.items() if node.type == "IGW"]
+
+    def route(self, node_id, dest_id):
+        path = [node_id]
+        while path[-1] != dest_id:
+            next_hop = self.nw.nodes[path[-1]].routing_table.get(dest_id)
+            if next_hop is None:
+                return None
+            edge = self.nw.get_edge_between_nodes(path[-1], next_hop)
+            self.assertTrue(edge is not None and edge.active)
+            path.append(next_hop)
+            self.assertLessEqual(len(path), len(self.nw.nodes))
+        return path
+
+    def random_events(self, count):
+        edges = list(self.nw.edges.values())
+        for _ in range(count):
+            edge = self.rng.choice(edges)
+            choice = self.rng.random()
+            if choice < 0.4:
+                yield self.nw.link_down(edge)
+            elif choice < 0.8:
+                yield self.nw.link_up(edge)
+            else:
+                yield self.nw.set_link_quality(edge, bandwidth=self.rng.uniform(25, 200),
+                                               loss_rate=self.rng.uniform(0.01, 0.2))
+
+    def test_hop_count_repair_matches_rebuild(self):
+        self.nw.routing_algorithm = routing.HopCountRouting()
+        self.nw.routing_algorithm.compute_routing_tables(self.nw, self.igws)
+
+        touched = 0
+        for report in self.random_events(60):
+            touched += report['routing_entries']
+            for dest_id in self.igws:
+                shortest = hop_count.shortest_paths_to(self.nw, dest_id)
+                for node_id in self.nw.nodes:
+                    if node_id == dest_id:
+                        continue
+                    path = self.route(node_id, dest_id)
+                    if node_id in shortest:
+                        self.assertEqual(len(path), len(shortest[node_id]), (node_id, dest_id))
+                    else:
+                        self.assertIsNone(path)
+        self.assertGreater(touched, 0)
+        self.assertEqual(self.nw.link_event_stats['events'], 60)
+        self.assertEqual(self.nw.link_event_stats['routing_entries'], touched)
+
+    def test_unused_link_touches_nothing(self):
+        self.nw.routing_algorithm = routing.HopCountRouting()
+        self.nw.routing_algorithm.compute_routing_tables(self.nw, self.igws)
+
+        used = {(node_id, next_hop) for node_id, node in self.nw.nodes.items()
+                for next_hop in node.routing_table.values()}
+        edge = next(e for e in self.nw.edges.values()
+                    if (e.src.id, e.dest.id) not in used and (e.dest.id, e.src.id) not in used)
+        report = self.nw.link_down(edge)
+        self.assertEqual((report['event'], report['routing_entries'], report['paths']), ('down', 0, 0))
+
+    def test_link_down_repairs_only_subtree(self):
+        self.nw.routing_algorithm = routing.HopCountRouting()
+        self.nw.routing_algorithm.compute_routing_tables(self.nw, self.igws)
+        dest_id = self.igws[0]
+        node_id = next(n for n, node in self.nw.nodes.items()
+                       if node.type == "MR" and node.routing_table.get(dest_id) == dest_id)
+        before = {n: dict(node.routing_table) for n, node in self.nw.nodes.items()}
+
+        report = self.nw.link_down(self.nw.get_edge_between_nodes(node_id, dest_id))
+
+        changed = sum(1 for n, node in self.nw.nodes.items() for d in set(before[n]) | set(node.routing_table)
+                      if before[n].get(d) != node.routing_table.get(d))
+        self.assertEqual(report['routing_entries'], changed)
+        self.assertNotEqual(self.nw.nodes[node_id].routing_table[dest_id], dest_id)
+
+    def test_wcett_lb_path_cache_follows_tables(self):
+        algorithm = routing.WCETT_LB_PRERouting()
+        self.nw.routing_algorithm = algorithm
+        algorithm.compute_routing_tables(self.nw, self.igws)
+        built = dict(algorithm.path_cache)
+
+        updated = 0
+        for report in self.random_events(40):
+            updated += report['paths']
+        self.assertGreater(updated, 0)
+        # WCETT paths are not subpath-optimal, so untouched entries may still differ from the walked route
+        for (node_id, dest_id), path in algorithm.path_cache.items():
+            if path != built.get((node_id, dest_id)):
+                self.assertEqual(path, self.route(node_id, dest_id))
+
+class TestSimulatorLinkEvents(unittest.TestCase):
+    def wcett_network(self):
+        sim = MeshNetworkSimulator(0, event_driven=True, seed=3)
+        sim.wcett_sim()
+        return sim.network
+
+    def repaired_tables(self, edge_id, link_cost):
+        """Tables after taking a link down and repairing them with the given cost"""
+        nw = self.wcett_network()
+        edge = nw.edges[edge_id]
+        old_cost = link_cost(edge)
+        nw.set_edge_active(edge, False)
+        incremental.repair_routes(nw, edge, old_cost, link_cost)
+        return {node_id: dict(node.routing_table) for node_id, node in nw.nodes.items()}
+
+    def test_wcett_sim_repairs_on_ett(self):
+        nw = self.wcett_network()
+        edge = next(iter(nw.edges.values()))
+        self.assertEqual(nw.link_cost(edge), wcett.compute_ett(edge, nw.routing_algorithm.packet_sz))
+
+        ett_cost = routing.WCETTRouting().link_cost
+        used = sorted({nw.get_edge_between_nodes(node_id, next_hop).id for node_id, node in nw.nodes.items()
+                       for next_hop in node.routing_table.values()})
+        # A used link whose ETT repair differs from a hop count repair
+        edge_id = next(edge_id for edge_id in used
+                       if self.repaired_tables(edge_id, ett_cost) != self.repaired_tables(edge_id, lambda e: 1))
+
+        nw = self.wcett_network()
+        report = nw.link_down(nw.edges[edge_id])
+        self.assertGreater(report['routing_entries'], 0)
+        self.assertEqual({node_id: dict(node.routing_table) for node_id, node in nw.nodes.items()},
+                         self.repaired_tables(edge_id, ett_cost))
+
+if __name__ == '__main__':
+    unittest.main()
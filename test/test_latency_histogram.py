@@ -0,0 +1,60 @@
+import unittest
+import random
+import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from latency_histogram import LatencyHistogram
+
+class TestLatencyHistogram(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.values = [rng.lognormvariate(0, 1) for _ in range(5000)]
+
+    def test_percentiles_within_bucket_error(self):
+        histogram = LatencyHistogram()
+        for value in self.values:
+            histogram.record(value)
+
+        ordered = sorted(self.values)
+        for percent in (50, 95, 99):
+            exact = ordered[int(percent / 100 * len(ordered)) - 1]
+            # One bucket spans a factor of 2 ** (1/32), about 2.2%
+            self.assertAlmostEqual(histogram.percentile(percent) / exact, 1, delta=0.025)
+        self.assertEqual(histogram.percentile(100), max(self.values))
+        self.assertAlmostEqual(histogram.mean(), sum(self.values) / len(self.values))
+
+    def test_merge_equals_single_histogram(self):
+        whole = LatencyHistogram()
+        parts = [LatencyHistogram() for _ in range(3)]
+        for i, value in enumerate(self.values):
+            whole.record(value)
+            parts[i % 3].record(value)
+
+        merged = LatencyHistogram()
+        for part in parts:
+            merged.merge(part)
+
+        self.assertEqual(merged.counts, whole.counts)
+        for percent in (50, 95, 99):
+            self.assertEqual(merged.percentile(percent), whole.percentile(percent))
+        self.assertAlmostEqual(merged.mean(), whole.mean())
+        self.assertEqual((merged.min, merged.max), (whole.min, whole.max))
+        with self.assertRaises(ValueError):
+            merged.merge(LatencyHistogram(buckets_per_octave=8))
+
+    def test_dict_round_trip(self):
+        histogram = LatencyHistogram()
+        for value in self.values[:100] + [1e-6, 1e6]:
+            histogram.record(value)
+
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+
+        self.assertEqual(restored.counts, histogram.counts)
+        self.assertEqual(restored.summary(), histogram.summary())
+        self.assertEqual(len(histogram.counts), histogram.bucket_count)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,80 +2,74 @@ import unittest
 import sys
 import os
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-import main
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MeshNetworkSimulator, rng_streams
 
 class TestPacketRate(unittest.TestCase):
     def setUp(self):
-        self.simulator = main.MeshNetworkSimulator(0)
+        self.simulator = MeshNetworkSimulator(0)
         self.simulator.hop_count_sim()
 
-    def test_packet_rate(self):
-        """Test if the simulator correctly sends packets at the configured rate"""
-        
-        def count_packets(duration, load):
-            """Run simulation for specified duration and load, return packet count"""
-            # Reset packet tracking
-            self.simulator.network.start_network()
-            
-            # Track packets sent
-            original_send_packet = self.simulator.network.send_packet_graph
-            packet_count = [0]
-            
-            def counting_send_packet(*args, **kwargs):
-                packet_count[0] += 1
-                return original_send_packet(*args, **kwargs)
-            
-            # Replace with counting version
-            self.simulator.network.send_packet_graph = counting_send_packet
-            
-            # Run simulation for short duration
+    def count_packets(self, duration, load):
+        """Run the real-time simulation and count the packets handed to the network"""
+        network = self.simulator.network
+        original_send_packet = network.send_packet_graph
+        packet_count = [0]
+
+        def counting_send_packet(*args, **kwargs):
+            packet_count[0] += 1
+            return original_send_packet(*args, **kwargs)
+
+        network.send_packet_graph = counting_send_packet
+        try:
             self.simulator.simulate_traffic(duration=duration, load=load)
-            
-            # Restore original function
-            self.simulator.network.send_packet_graph = original_send_packet
-            
-            return packet_count[0]
-        
-        # Test cases
-        test_duration = 20  # seconds
-        
-        # Case 1: Below 20 packets per second
-        load_below = 10
-        expected_below = test_duration * load_below
-        packets_below = count_packets(test_duration, load_below)
-        
-        # Allow for small variation (±10%)
-        self.assertGreaterEqual(packets_below, expected_below * 0.9, 
-                               f"Expected ~{expected_below} packets at {load_below} pps, but got {packets_below}")
-        self.assertLessEqual(packets_below, expected_below * 1.1,
-                            f"Expected ~{expected_below} packets at {load_below} pps, but got {packets_below}")
-        
-        # Case 2: Exactly 20 packets per second
-        load_exact = 20
-        expected_exact = test_duration * load_exact
-        packets_exact = count_packets(test_duration, load_exact)
-        
-        self.assertGreaterEqual(packets_exact, expected_exact * 0.9,
-                               f"Expected ~{expected_exact} packets at {load_exact} pps, but got {packets_exact}")
-        self.assertLessEqual(packets_exact, expected_exact * 1.1,
-                            f"Expected ~{expected_exact} packets at {load_exact} pps, but got {packets_exact}")
-        
-        # Case 3: Above 20 packets per second
-        load_above = 30
-        expected_above = test_duration * load_above
-        packets_above = count_packets(test_duration, load_above)
-        
-        self.assertGreaterEqual(packets_above, expected_above * 0.9,
-                               f"Expected ~{expected_above} packets at {load_above} pps, but got {packets_above}")
-        self.assertLessEqual(packets_above, expected_above * 1.1,
-                            f"Expected ~{expected_above} packets at {load_above} pps, but got {packets_above}")
-        
-        # Verify rates increase as expected
-        self.assertLess(packets_below, packets_exact, 
-                       "Higher packet rate should result in more packets sent")
-        self.assertLess(packets_exact, packets_above, 
-                       "Higher packet rate should result in more packets sent")
+        finally:
+            del network.send_packet_graph
+        return packet_count[0]
+
+    def test_packet_rate(self):
+        """The injector pool holds every configured load, below, at and above 20 pps"""
+        test_duration = 20 # seconds
+        counts = []
+        for load in (10, 20, 30):
+            expected = test_duration * load
+            packets = self.count_packets(test_duration, load)
+            counts.append(packets)
+            # Allow for small variation (±10%)
+            self.assertGreaterEqual(packets, expected * 0.9, f"Expected ~{expected} packets at {load} pps, but got {packets}")
+            self.assertLessEqual(packets, expected * 1.1, f"Expected ~{expected} packets at {load} pps, but got {packets}")
+
+            stats = self.simulator.injection_stats
+            self.assertEqual(stats['configured_load'], load)
+            self.assertAlmostEqual(stats['offered_load'], load, delta=load * 0.1)
+
+        # Higher packet rate should result in more packets sent
+        self.assertLess(counts[0], counts[1])
+        self.assertLess(counts[1], counts[2])
+
+class TestSeededSimulation(unittest.TestCase):
+    def run_sim(self, seed):
+        sim = MeshNetworkSimulator(0, event_driven=True, seed=seed)
+        sim.wcett_lb_pre_sim()
+        er, throughput, tx, all_tx = sim.simulate_traffic(duration=20, load=20)
+        channels = [edge.channel for edge in sim.network.edges.values()]
+        return er, throughput, tx, all_tx, channels
+
+    def test_same_seed_gives_identical_run(self):
+        self.assertEqual(self.run_sim(7), self.run_sim(7))
+        self.assertNotEqual(self.run_sim(7)[4], self.run_sim(8)[4])
+
+    def test_streams_are_independent(self):
+        streams = rng_streams(7)
+        traffic = [streams['traffic'].random() for _ in range(5)]
+
+        # Drawing from the other streams does not shift the traffic stream
+        streams = rng_streams(7)
+        streams['link_loss'].random()
+        streams['topology'].randint(1, 3)
+        self.assertEqual([streams['traffic'].random() for _ in range(5)], traffic)
+        self.assertNotEqual(rng_streams(7)['link_loss'].random(), rng_streams(7)['traffic'].random())
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
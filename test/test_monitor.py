@@ -0,0 +1,79 @@
+import unittest
+import random
+import threading
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routing_alg.routing as routing
+from network import reset_id_managers, CongestionMonitor
+from networks.generated_network import grid_network
+
+class TestCongestionMonitor(unittest.TestCase):
+    def setUp(self):
+        reset_id_managers()
+        self.nw = grid_network(4, 4, igw_count=2, client_count=6, rng=random.Random(5))
+        self.igws = [node_id for node_id, node in self.nw.nodes.items() if node.type == "IGW"]
+        self.nw.routing_algorithm = routing.HopCountRouting()
+        self.nw.routing_algorithm.compute_routing_tables(self.nw, self.igws)
+
+    def level_of(self):
+        levels = self.nw.monitor.levels()
+        level_of = {node.id: index for index, level in enumerate(levels) for node in level}
+        self.assertEqual(sum(len(level) for level in levels), len(self.nw.nodes))
+        self.assertEqual(set(level_of), set(self.nw.nodes))
+        return level_of
+
+    def test_levels_put_next_hops_first(self):
+        dest_id = self.igws[0]
+        self.nw.routing_algorithm.compute_routing_tables(self.nw, [dest_id])
+        level_of = self.level_of()
+        for node_id, node in self.nw.nodes.items():
+            if dest_id in node.routing_table:
+                self.assertLess(level_of[node.routing_table[dest_id]], level_of[node_id])
+
+    def test_levels_break_cycles_between_gateways(self):
+        # Each gateway routes to the other through nodes routing back to it
+        level_of = self.level_of()
+        first = min(level_of, key=level_of.get)
+        self.assertIn(first, self.igws)
+
+    def test_tick_visits_every_node_and_reports_cpu(self):
+        ticked = []
+        for node in self.nw.nodes.values():
+            node.monitor_tick = lambda node_id=node.id: ticked.append(node_id)
+        result = self.nw.monitor.tick()
+        self.assertEqual(sorted(ticked), sorted(self.nw.nodes))
+        self.assertEqual(result['nodes'], len(self.nw.nodes))
+        self.assertGreaterEqual(result['cpu'], 0)
+        report = self.nw.monitor.report()
+        self.assertEqual((report['ticks'], report['nodes_per_tick'], report['errors']), (1, len(self.nw.nodes), 0))
+
+    def test_pool_tick_and_errors(self):
+        monitor = CongestionMonitor(self.nw, interval=0.01, workers=3)
+        failing = next(iter(self.nw.nodes.values()))
+        failing.monitor_tick = lambda: 1 / 0
+        monitor.start()
+        try:
+            self.assertIsNotNone(monitor.pool)
+            monitor.stop_event.wait(0.1)
+        finally:
+            monitor.stop()
+        report = monitor.report()
+        self.assertGreater(report['ticks'], 0)
+        self.assertEqual(report['errors'], report['ticks'])
+        self.assertIsNone(monitor.pool)
+
+    def test_realtime_uses_one_monitor_thread(self):
+        before = threading.active_count()
+        self.nw.start_network()
+        try:
+            # One packet processing thread per node plus the shared monitor
+            self.assertEqual(threading.active_count() - before, len(self.nw.nodes) + 1)
+        finally:
+            self.nw.stop_network()
+        self.assertFalse(self.nw.monitor.thread.is_alive())
+
+if __name__ == '__main__':
+    unittest.main()
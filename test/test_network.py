@@ -5,7 +5,8 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from network import Node, Edge, Graph, node_id_manager, edge_id_manager, packet_id_manager
+from network import Node, Edge, Graph, node_id_manager, edge_id_manager, packet_id_manager, STATS_HISTORY
+from packet import Packet
 
 class TestNetwork(unittest.TestCase):
     def setUp(self):
@@ -41,6 +42,70 @@ class TestNetwork(unittest.TestCase):
         node_c = self.graph.create_node("host")
         not_found = self.graph.get_edge_between_nodes(node_a.id, node_c.id)
         self.assertIsNone(not_found)
+
+        # Lookup is symmetric
+        self.assertEqual(self.graph.get_edge_between_nodes(node_b.id, node_a.id), edge)
+
+    def test_incident_edges_and_remove_edge(self):
+        node_a = self.graph.create_node("router")
+        node_b = self.graph.create_node("router")
+        node_c = self.graph.create_node("router")
+        edge_ab = self.graph.add_edge(node_a, node_b, 100, 0.01)
+        edge_bc = self.graph.add_edge(node_b, node_c, 100, 0.01)
+
+        self.assertIsNone(self.graph.add_edge(node_b, node_a, 50, 0.01))
+        self.assertEqual(self.graph.get_incident_edges(node_b.id), [edge_ab, edge_bc])
+
+        self.graph.set_edge_active(edge_bc, False)
+        self.assertEqual(self.graph.get_edge_between_nodes(node_b.id, node_c.id), edge_bc)
+
+        self.assertTrue(self.graph.remove_edge(edge_ab))
+        self.assertFalse(self.graph.remove_edge(edge_ab))
+        self.assertIsNone(self.graph.get_edge_between_nodes(node_a.id, node_b.id))
+        self.assertEqual(self.graph.get_incident_edges(node_a.id), [])
+        self.assertEqual(self.graph.get_incident_edges(node_b.id), [edge_bc])
+        self.assertNotIn(node_b.id, node_a.neighbors)
+        self.assertNotIn(edge_ab.id, self.graph.edges)
+
+    def test_next_hop_index(self):
+        node_a = self.graph.create_node("IGW")
+        node_b = self.graph.create_node("MR")
+        node_c = self.graph.create_node("MR")
+        
+        node_b.routing_table[node_a.id] = node_a.id
+        node_c.routing_table[node_a.id] = node_b.id
+        node_c.routing_table[node_b.id] = node_b.id
+        self.assertEqual(self.graph.get_children(node_b.id), [node_c.id])
+        self.assertEqual(self.graph.next_hop_count(node_b.id), 2)
+        
+        node_c.routing_table[node_a.id] = node_a.id
+        self.assertEqual(sorted(self.graph.get_children(node_a.id)), [node_b.id, node_c.id])
+        self.assertEqual(self.graph.next_hop_count(node_b.id), 1)
+        
+        del node_c.routing_table[node_b.id]
+        self.assertEqual(self.graph.get_children(node_b.id), [])
+        
+        node_b.routing_table = {}
+        self.assertEqual(self.graph.get_children(node_a.id), [node_c.id])
+        self.assertEqual(self.graph.next_hop_count(node_a.id), 1)
+        self.assertEqual(node_c.routing_table, {node_a.id: node_a.id})
+    
+    def test_node_stats_are_bounded(self):
+        node_a = self.graph.create_node("MR")
+        node_b = self.graph.create_node("MR")
+        self.graph.add_edge(node_a, node_b, 100, 0)
+        
+        # Overflow the buffer so more drops happen than the ring buffer holds
+        total = node_b.queue.maxsize + STATS_HISTORY + 10
+        for i in range(total):
+            packet = Packet(i, node_a.id, node_b.id, 1024)
+            node_b.receive_message(packet, node_a)
+        
+        counters = node_b.stats.counters()
+        self.assertEqual(counters['dropped'], {'buffer_full': STATS_HISTORY + 10})
+        self.assertEqual(len(node_b.stats.recent), STATS_HISTORY)
+        self.assertEqual(node_b.stats.recent[-1][1:], ('dropped', total - 1, 'buffer_full'))
+        self.assertEqual(self.graph.packet_counters()['dropped'], counters['dropped'])
     
     def test_id_managers(self):
         node_id1 = node_id_manager()
@@ -1,10 +1,15 @@
 import unittest
 import sys
 import os
+import tempfile
+
+import numpy as np
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import routing_alg.routing as routing
 from network import Graph
+from packet import Packet
+from packet_table import PacketTable, OUTCOMES, open_packet_file, query_packets, read_latency
 
 
 class TestPacket(unittest.TestCase):
@@ -43,7 +48,7 @@ class TestPacket(unittest.TestCase):
         expected_path = [node_e.id, node_d.id, node_a.id]
         result = self.graph.send_packet_graph(node_e.id, node_a.id)
         packet = result["packet"]
-        self.assertEqual(packet.route_taken, expected_path)
+        self.assertEqual(list(packet.route_taken), expected_path)
         
         self.graph.stop_network()
         
@@ -79,9 +84,102 @@ class TestPacket(unittest.TestCase):
         
         result = self.graph.send_packet_graph(node_e.id, node_a.id)
         packet = result["packet"]
-        self.assertEqual(packet.route_taken, expected_path)
+        self.assertEqual(list(packet.route_taken), expected_path)
         
         self.graph.stop_network()
         
+    def test_packet_is_slotted(self):
+        packet = Packet(1, 2, 3, 1024)
+        packet.add_hop(2)
+        
+        self.assertFalse(hasattr(packet, '__dict__'))
+        self.assertEqual(packet.time, packet.created_time)
+        self.assertEqual(list(packet.route_taken), [2])
+        
+        ack = packet.create_ack(2, 5)
+        self.assertEqual((ack.type, ack.src_id, ack.dest_id, ack.ack_for), ("ACK", 5, 2, 1))
+
+class TestPacketTable(unittest.TestCase):
+    def test_metrics_match_result_dicts(self):
+        table = PacketTable(4)
+        for row, tx in enumerate([0.5, 1.5]):
+            packet = Packet(row, 1, 2, 1024)
+            packet.route_taken.extend([1, 3, 2])
+            packet.created_time = 10.0
+            packet.delivered_time = 10.0 + tx
+            table.record(row, 1, 2, {'success': True, 'packet': packet})
+        table.record(2, 1, 2, {'success': False, 'reason': 'buffer_full'})
+        
+        error_rate, throughput, avg_tx, all_tx = table.metrics(total_packets=4, elapsed=2.0)
+        
+        self.assertEqual(error_rate, 50.0)
+        self.assertEqual(throughput, 2 * 1024 * 8 / 1000 / 2.0)
+        self.assertEqual(avg_tx, 1.0)
+        self.assertEqual(all_tx, [0.5, 1.5])
+        self.assertEqual(list(table.hops[:3]), [2, 2, 0])
+        self.assertEqual(list(table.src[:4]), [1, 1, 1, -1])
+        self.assertEqual([OUTCOMES[code] for code in table.outcome[:4]],
+                         ['delivered', 'delivered', 'buffer_full', 'pending'])
+    
+    def filled_table(self, start, count):
+        table = PacketTable(count + 2)
+        for row in range(count):
+            created = start + row
+            if row % 3:
+                packet = Packet(row + 1, 1, 2, 1024)
+                packet.route_taken.extend([1, 2])
+                packet.created_time = created
+                packet.delivered_time = created + 0.25
+                table.record(row, 1, 2, {'success': True, 'packet': packet})
+            else:
+                table.record(row, 1, 2, {'success': False, 'reason': 'packet_loss'}, created)
+        return table
+    
+    def test_packet_file_round_trip(self):
+        table = self.filled_table(100.0, 10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "packets_hop_5pps.bin")
+            table.save(path, 10, start=100.0)
+            packets = open_packet_file(path)
+            self.assertEqual((packets['rows'], packets['start']), (10, 100.0))
+            self.assertIsInstance(packets['created'], np.memmap)
+            for name in ('id', 'src', 'dest', 'size', 'created', 'delivered', 'hops', 'success', 'outcome'):
+                np.testing.assert_array_equal(packets[name], getattr(table, name)[:10])
+            del packets
+    
+    def test_read_latency_matches_recorded_histogram(self):
+        table = PacketTable(50)
+        for row in range(50):
+            packet = Packet(row + 1, 1, 2, 1024)
+            packet.created_time = float(row)
+            packet.delivered_time = row + 0.01 * 1.3 ** (row % 20)
+            table.record(row, 1, 2, {'success': row % 7 != 0, 'packet': packet})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "packets_hop_5pps.bin")
+            table.save(path, 50)
+            # Chunks smaller than the file, so the histogram is built in several passes
+            histogram = read_latency(path, chunk_rows=16)
+        self.assertEqual(histogram.counts, table.latency.counts)
+        self.assertEqual((histogram.count, histogram.min, histogram.max),
+                         (table.latency.count, table.latency.min, table.latency.max))
+        self.assertAlmostEqual(histogram.total, table.latency.total)
+    
+    def test_query_by_algorithm_load_and_window(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.filled_table(50.0, 10).save(os.path.join(directory, "packets_hop_5pps.bin"), 10, start=50.0)
+            self.filled_table(0.0, 20).save(os.path.join(directory, "packets_hop_10pps.bin"), 20)
+            self.filled_table(0.0, 5).save(os.path.join(directory, "packets_wcett_5pps.bin"), 5)
+            
+            self.assertEqual(set(query_packets(directory)), {('hop', 5.0), ('hop', 10.0), ('wcett', 5.0)})
+            self.assertEqual(set(query_packets(directory, algorithm='hop')), {('hop', 5.0), ('hop', 10.0)})
+            
+            selected = query_packets(directory, algorithm='hop', load=5, start=2, end=6, columns=['created', 'outcome'])
+            self.assertEqual(list(selected), [('hop', 5.0)])
+            columns = selected[('hop', 5.0)]
+            self.assertEqual(set(columns), {'created', 'outcome'})
+            self.assertEqual(columns['created'].tolist(), [52.0, 53.0, 54.0, 55.0])
+            self.assertEqual([OUTCOMES[code] for code in columns['outcome']],
+                             ['delivered', 'packet_loss', 'delivered', 'delivered'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
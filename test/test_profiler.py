@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routing_alg.routing as routing
+from routing_alg import routing_utils
+from network import reset_id_managers
+from networks import complex_network
+from profiler import Profiler
+
+TARGETS = ('routing_alg.routing_utils:find_all_paths', 'network:Graph.get_edge_between_nodes')
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        reset_id_managers()
+        self.nw = complex_network.initialize_network()
+        self.profiler = Profiler()
+        self.original = routing_utils.find_all_paths
+
+    def tearDown(self):
+        self.profiler.restore()
+
+    def test_instrument_and_restore_every_binding(self):
+        self.profiler.instrument(TARGETS)
+        self.assertIsNot(routing_utils.find_all_paths, self.original)
+        # Imported by name into routing, that binding is wrapped as well
+        self.assertIs(routing.find_all_paths, routing_utils.find_all_paths)
+        self.profiler.restore()
+        self.assertIs(routing_utils.find_all_paths, self.original)
+        self.assertIs(routing.find_all_paths, self.original)
+
+    def test_recursive_calls_and_collapsed_stacks(self):
+        self.profiler.instrument(TARGETS)
+        igw = next(node_id for node_id, node in self.nw.nodes.items() if node.type == "IGW")
+        src = next(node_id for node_id, node in self.nw.nodes.items() if node.type == "C")
+        start = time.perf_counter()
+        paths = routing.find_all_paths(self.nw, src, igw)
+        wall = time.perf_counter() - start
+        self.assertTrue(paths)
+
+        row = next(row for row in self.profiler.report() if row['name'] == 'routing_utils.find_all_paths')
+        self.assertGreater(row['calls'], 1)
+        # Recursive calls are not added to the total twice
+        self.assertLessEqual(row['total'], wall)
+        stacks = self.profiler.collapsed_stacks()
+        self.assertIn(('routing_utils.find_all_paths', 'routing_utils.find_all_paths'), stacks)
+        self.assertAlmostEqual(sum(stacks.values()), row['total'], places=6)
+
+        with tempfile.TemporaryDirectory() as directory:
+            report_path, stacks_path = self.profiler.dump(os.path.join(directory, "profile"))
+            with open(stacks_path) as f:
+                for line in f:
+                    frames, microseconds = line.rsplit(' ', 1)
+                    self.assertTrue(frames.startswith('routing_utils.find_all_paths'))
+                    self.assertGreater(int(microseconds), 0)
+            with open(report_path) as f:
+                self.assertIn('routing_utils.find_all_paths', f.read())
+
+    def test_stats_are_kept_per_thread(self):
+        self.profiler.instrument(TARGETS)
+        edge = next(iter(self.nw.edges.values()))
+        def lookup(count):
+            for _ in range(count):
+                self.nw.get_edge_between_nodes(edge.src.id, edge.dest.id)
+        threads = [threading.Thread(target=lookup, args=(count,), name=f"worker{count}") for count in (3, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = self.profiler.stats()
+        self.assertEqual(stats['worker3']['network.Graph.get_edge_between_nodes'][0], 3)
+        self.assertEqual(stats['worker5']['network.Graph.get_edge_between_nodes'][0], 5)
+        row = self.profiler.report()[0]
+        self.assertEqual((row['calls'], row['threads']), (8, 2))
+        self.profiler.reset()
+        self.assertEqual(self.profiler.report(), [])
+
+if __name__ == '__main__':
+    unittest.main()
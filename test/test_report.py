@@ -0,0 +1,62 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from latency_histogram import LatencyHistogram
+from packet import Packet
+from packet_table import PacketTable
+from report import find_results_dirs, render_report
+from sim import new_results, add_cell_result
+
+LOADS = [5, 10]
+
+class TestReport(unittest.TestCase):
+    def write_results(self, results_dir, algorithms):
+        """Save a results file with two loads per algorithm, the second the slower"""
+        data = {'parameters': {'topology': 'small', 'duration': 5, 'loads': LOADS}}
+        for algorithm in algorithms:
+            results = new_results()
+            for load in LOADS:
+                histogram = LatencyHistogram()
+                for i in range(load):
+                    histogram.record(0.01 * load * (1 + i % 3))
+                add_cell_result(results, 0.0, 10.0, histogram.mean(), histogram)
+            data[algorithm] = results
+        with open(os.path.join(results_dir, "simulation_results.json"), 'w') as f:
+            json.dump(data, f)
+
+    def test_render_report_from_saved_results(self):
+        with tempfile.TemporaryDirectory() as base:
+            results_dir = os.path.join(base, "results_01010000")
+            os.makedirs(results_dir)
+            self.write_results(results_dir, ['hop_count', 'wcett_lb_post', 'wcett_lb_pre'])
+            # A packet file of the slowest WCETT-LB Post run replaces its stored histogram
+            table = PacketTable(3)
+            for row in range(3):
+                packet = Packet(row + 1, 1, 2, 1024)
+                packet.created_time = 0.0
+                packet.delivered_time = 0.5
+                table.record(row, 1, 2, {'success': True, 'packet': packet})
+            table.save(os.path.join(results_dir, "packets_wcett_lb_post_10pps.bin"), 3)
+
+            self.assertEqual(find_results_dirs(base), [results_dir])
+            paths = render_report([results_dir], jobs=2)
+
+            self.assertEqual(sorted(os.path.basename(path) for path in paths), [
+                'error_rate_comparison.png', 'throughput_comparison.png', 'tx_comparison.png',
+                'tx_percentiles_comparison.png', 'wcett_lb_post_tx_histogram_10pps.png',
+                'wcett_lb_pre_tx_histogram_10pps.png'
+            ])
+            for path in paths:
+                self.assertTrue(os.path.exists(path))
+            with open(os.path.join(results_dir, "wcett_lb_post_tx_data_10pps.csv")) as f:
+                self.assertEqual([line.split(',')[2] for line in f.read().split()[1:]], ['3'])
+            with open(os.path.join(results_dir, "wcett_lb_pre_tx_data_10pps.csv")) as f:
+                self.assertEqual(sum(int(line.split(',')[2]) for line in f.read().split()[1:]), 10)
+
+if __name__ == '__main__':
+    unittest.main()
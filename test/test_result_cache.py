@@ -0,0 +1,49 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import result_cache
+from result_cache import ResultCache
+from latency_histogram import LatencyHistogram
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmp.name)
+        self.params = {'topology': 0, 'algorithm': 'hop', 'load': 5, 'duration': 10}
+        self.histogram = LatencyHistogram()
+        for value in (0.4, 0.5, 1.2):
+            self.histogram.record(value)
+
+    def tearDown(self):
+        result_cache._source_hash = None
+        self.tmp.cleanup()
+
+    def test_round_trip_and_counts(self):
+        self.assertIsNone(self.cache.get(self.params))
+        self.cache.put(self.params, (10.0, 120.5, 0.7, self.histogram))
+
+        er, throughput, tx, histogram = self.cache.get(self.params)
+
+        self.assertEqual((er, throughput, tx), (10.0, 120.5, 0.7))
+        self.assertEqual(histogram.counts, self.histogram.counts)
+        self.assertIsNone(self.cache.get(dict(self.params, load=10)))
+        self.assertEqual(self.cache.report(), {'hits': 1, 'misses': 2})
+
+    def test_source_change_invalidates(self):
+        self.cache.put(self.params, (10.0, 120.5, 0.7, self.histogram))
+        result_cache._source_hash = 'changed'
+
+        self.assertIsNone(self.cache.get(self.params))
+
+    def test_failed_write_leaves_no_files(self):
+        with self.assertRaises(TypeError):
+            self.cache.put(self.params, (object(), 120.5, 0.7, self.histogram))
+
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sim import run_sim_cells
+from result_cache import ResultCache
+
+class TestSimCells(unittest.TestCase):
+    def test_parallel_cells_return_results_in_order(self):
+        cells = [('hop', 5), ('wcett', 10), ('hop', 20)]
+        results = run_sim_cells(cells, duration=5, topology=0, event_driven=True, jobs=2)
+
+        self.assertEqual(len(results), len(cells))
+        for er, throughput, tx, histogram in results:
+            self.assertGreaterEqual(er, 0)
+            self.assertGreater(histogram.count, 0)
+            self.assertAlmostEqual(histogram.mean(), tx)
+        # Higher load delivers more packets in the same duration
+        self.assertGreater(results[2][3].count, results[0][3].count)
+
+    def test_only_seeded_cells_are_cached(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory)
+            run_sim_cells([('hop', 5)], duration=5, topology=0, event_driven=True, cache=cache)
+            self.assertEqual(cache.report(), {'hits': 0, 'misses': 0})
+            self.assertEqual(os.listdir(directory), [])
+
+            first = run_sim_cells([('hop', 5)], duration=5, topology=0, event_driven=True, cache=cache, seed=1)
+            second = run_sim_cells([('hop', 5)], duration=5, topology=0, event_driven=True, cache=cache, seed=1)
+            self.assertEqual(cache.report(), {'hits': 1, 'misses': 1})
+            self.assertEqual(second[0][:3], first[0][:3])
+
+if __name__ == '__main__':
+    unittest.main()
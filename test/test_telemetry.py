@@ -0,0 +1,55 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MeshNetworkSimulator
+from network import reset_id_managers, PACKET_SIZE
+from telemetry import Telemetry, bottlenecks
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        reset_id_managers()
+
+    def test_event_driven_run_exports_series(self):
+        sim = MeshNetworkSimulator(0, event_driven=True, seed=3, telemetry_interval=0.5)
+        sim.hop_count_sim()
+        sim.simulate_traffic(duration=10, load=20)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "telemetry.npz")
+            sim.telemetry.export(path)
+            with np.load(path) as data:
+                series = dict(data)
+
+        node_count = len(sim.network.nodes)
+        edge_count = len(sim.network.edges)
+        # Samples at 0, 0.5, ..., 9.5 plus the final one
+        self.assertEqual(series['queue_depth'].shape, (21, node_count))
+        self.assertEqual(series['edge_bytes'].shape, (21, edge_count))
+        self.assertTrue(np.all(np.diff(series['time']) >= 0))
+        self.assertTrue(np.all(np.diff(series['edge_packets'], axis=0) >= 0))
+
+        # The last sample holds the totals of the whole run
+        self.assertEqual(int(series['edge_packets'][-1].sum()), sim.network.packet_counters()['sent'])
+        self.assertEqual(int(series['drops'][-1].sum()), sum(sim.network.packet_counters()['dropped'].values()))
+        np.testing.assert_array_equal(series['edge_bytes'], series['edge_packets'] * PACKET_SIZE)
+
+        ranked = bottlenecks(series, top=2)
+        self.assertEqual(len(ranked), 2)
+        self.assertGreaterEqual(ranked[0]['mean_queue'], ranked[1]['mean_queue'])
+
+    def test_ring_buffer_keeps_latest_samples(self):
+        sim = MeshNetworkSimulator(0)
+        telemetry = Telemetry(sim.network, capacity=4)
+        clock = iter(range(10))
+        sim.network.clock = lambda: next(clock)
+        for _ in range(10):
+            telemetry.sample()
+        self.assertEqual(telemetry.series()['time'].tolist(), [6, 7, 8, 9])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import tempfile
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from networks import complex_network
+from networks.generated_network import grid_network
+from networks.topology_file import load_topology, compile_topology, save_topology, CACHE_DIR_NAME
+from main import MeshNetworkSimulator, topology_arg
+from network import reset_id_managers
+
+SMALL_TOPOLOGY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              "networks", "topologies", "small.json")
+
+def layout(network):
+    """Node types and edge endpoints, characteristics and channels of a network"""
+    nodes = [(node.id, node.type, node.neighbors) for node in network.nodes.values()]
+    edges = [(edge.id, edge.src.id, edge.dest.id, edge.bandwidth, edge.loss_rate, edge.channel)
+             for edge in network.edges.values()]
+    return nodes, edges
+
+def links(network):
+    """Edges by endpoint types, independent of node numbering"""
+    return sorted((edge.src.type, edge.dest.type, edge.bandwidth, edge.loss_rate, edge.channel)
+                  for edge in network.edges.values())
+
+class TestTopologyFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        reset_id_managers()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_file_matches_hand_built_topology(self):
+        expected = complex_network.initialize_network(random.Random(3), random.Random(4))
+        reset_id_managers()
+        loaded = load_topology(SMALL_TOPOLOGY, random.Random(3), random.Random(4),
+                               cache_dir=self.path(CACHE_DIR_NAME))
+        self.assertEqual(layout(loaded), layout(expected))
+
+    def test_json_and_csv_round_trip(self):
+        network = grid_network(6, 6, igw_count=2, client_count=10, rng=random.Random(1))
+        for name in ("mesh.json", "mesh.csv"):
+            save_topology(network, self.path(name))
+            reset_id_managers()
+            loaded = load_topology(self.path(name), cache_dir=self.path(CACHE_DIR_NAME))
+            self.assertEqual(len(loaded.nodes), len(network.nodes))
+            self.assertEqual(links(loaded), links(network))
+            if name.endswith('.json'):
+                self.assertEqual(layout(loaded), layout(network))
+
+    def test_compiled_form_is_cached_by_file_hash(self):
+        path = self.path("line.csv")
+        cache_dir = self.path(CACHE_DIR_NAME)
+        with open(path, 'w') as f:
+            f.write("src,src_type,dest,dest_type,bandwidth,loss,channel\ng,IGW,r,MR,100,0.01,2\nc,C,r,MR,40,0.1,\n")
+        first = compile_topology(path, cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        cached = compile_topology(path, cache_dir)
+        for name, array in first.items():
+            self.assertEqual(cached[name].tolist(), array.tolist())
+        self.assertEqual(first['channel'].tolist(), [2, 0])
+
+        with open(path, 'a') as f:
+            f.write("c,C,g,IGW,30,0.2,1\n")
+        changed = compile_topology(path, cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+        self.assertEqual(len(changed['edge_src']), 3)
+
+    def test_invalid_files_are_rejected(self):
+        cases = {
+            "loss.json": '{"nodes": [{"type": "IGW"}, {"type": "MR"}], '
+                         '"edges": [{"src": 0, "dest": 1, "bandwidth": 10, "loss": 1.5}]}',
+            "unknown.json": '{"nodes": [{"name": "a", "type": "MR"}], '
+                            '"edges": [{"src": "a", "dest": "b", "bandwidth": 10, "loss": 0.1}]}',
+            "types.csv": "src,src_type,dest,dest_type,bandwidth,loss\na,MR,b,C,10,0.1\nb,MR,c,C,10,0.1\n",
+            "columns.csv": "src,dest,bandwidth\na,b,10\n",
+            "node_type.csv": "src,src_type,dest,dest_type,bandwidth,loss\na,igw,b,Router,10,0.1\n",
+            "node_type.json": '{"nodes": [{"type": "IGW"}, {"type": "router"}], '
+                              '"edges": [{"src": 0, "dest": 1, "bandwidth": 10, "loss": 0.1}]}'
+        }
+        for name, content in cases.items():
+            with self.subTest(name=name):
+                with open(self.path(name), 'w') as f:
+                    f.write(content)
+                with self.assertRaises(ValueError):
+                    compile_topology(self.path(name), use_cache=False)
+
+    def test_simulator_accepts_topology_file(self):
+        self.assertEqual(topology_arg(SMALL_TOPOLOGY), SMALL_TOPOLOGY)
+        cache_dir = self.path(CACHE_DIR_NAME)
+        sim = MeshNetworkSimulator(SMALL_TOPOLOGY, event_driven=True, seed=1, topology_cache_dir=cache_dir)
+        self.assertEqual(sim.topology_name, "small")
+        sim.hop_count_sim()
+        er, throughput, tx, all_tx = sim.simulate_traffic(duration=5, load=10)
+        self.assertGreater(len(all_tx), 0)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,14 @@ import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from routing_alg.wcett import compute_ett, compute_wcett
-from network import Graph
+import random
+
+from routing_alg.wcett import compute_ett, compute_wcett, find_best_path, best_paths_to
+from routing_alg.wcett_lb import compute_wcett_lb
+from routing_alg.routing_utils import find_all_paths, is_valid_path, compute_load_penalties
+import routing_alg.routing as routing
+from network import Graph, reset_id_managers
+from networks import complex_network, advanced_network
 
 class TestWCETT(unittest.TestCase):
     def setUp(self):
@@ -94,5 +100,77 @@ class TestWCETT(unittest.TestCase):
         
         self.assertAlmostEqual(wcett_value, expected_wcett, places=10)
     
+    def test_find_best_path_matches_exhaustive_search(self):
+        for seed in range(5):
+            for topology in (complex_network, advanced_network):
+                random.seed(seed)
+                reset_id_managers()
+                nw = topology.initialize_network()
+                igw_nodes = [node_id for node_id, node in nw.nodes.items() if node.type == "IGW"]
+                
+                for node_id in nw.nodes:
+                    for igw_id in igw_nodes:
+                        if node_id == igw_id:
+                            continue
+                        weights = {}
+                        for path in find_all_paths(nw, node_id, igw_id):
+                            if is_valid_path(nw, path):
+                                edges = [nw.get_edge_between_nodes(a, b) for a, b in zip(path, path[1:])]
+                                weights[tuple(path)] = compute_wcett(edges, 1024)
+                        expected = min(weights, key=weights.get)
+                        
+                        best_path = find_best_path(nw, node_id, igw_id, 1024)
+                        self.assertEqual(best_path[1], expected[1])
+                        self.assertAlmostEqual(weights[tuple(best_path)], weights[expected], places=12)
+    
+    def test_best_paths_to_matches_exhaustive_wcett_lb(self):
+        for seed in range(3):
+            random.seed(seed)
+            reset_id_managers()
+            nw = advanced_network.initialize_network()
+            igw_nodes = [node_id for node_id, node in nw.nodes.items() if node.type == "IGW"]
+            # Give the traffic concentration term something to work with
+            routing.HopCountRouting().compute_routing_tables(nw, igw_nodes)
+            penalties = compute_load_penalties(nw)
+            
+            for igw_id in igw_nodes:
+                wcett_paths = best_paths_to(nw, igw_id, 1024)
+                lb_paths = best_paths_to(nw, igw_id, 1024, node_penalty=penalties)
+                for node_id in nw.nodes:
+                    if node_id == igw_id:
+                        continue
+                    metrics = {}
+                    for path in find_all_paths(nw, node_id, igw_id):
+                        edges = [nw.get_edge_between_nodes(a, b) for a, b in zip(path, path[1:])]
+                        metrics[tuple(path)] = compute_wcett_lb(edges, 1024, nw, path)
+                    best = min(metrics.values())
+                    self.assertAlmostEqual(metrics[tuple(lb_paths[node_id])], best, places=12)
+                    
+                    expected = find_best_path(nw, node_id, igw_id, 1024)
+                    self.assertEqual(wcett_paths[node_id][1], expected[1])
+    
+    def test_find_best_path_large_grid(self):
+        # 30x30 grid of routers, far beyond what path enumeration can handle
+        size = 30
+        rng = random.Random(0)
+        nodes = [[self.graph.create_node("MR") for _ in range(size)] for _ in range(size)]
+        for row in range(size):
+            for col in range(size):
+                if col + 1 < size:
+                    self.graph.add_edge(nodes[row][col], nodes[row][col + 1], rng.uniform(20, 200), rng.uniform(0, 0.2))
+                if row + 1 < size:
+                    self.graph.add_edge(nodes[row][col], nodes[row + 1][col], rng.uniform(20, 200), rng.uniform(0, 0.2))
+        
+        src = nodes[0][0].id
+        dest = nodes[size - 1][size - 1].id
+        path = find_best_path(self.graph, src, dest, 1024)
+        
+        self.assertEqual(path[0], src)
+        self.assertEqual(path[-1], dest)
+        self.assertGreaterEqual(len(path), 2 * (size - 1) + 1)
+        edges = [self.graph.get_edge_between_nodes(a, b) for a, b in zip(path, path[1:])]
+        self.assertTrue(all(edges))
+        self.assertIsNone(find_best_path(self.graph, src, dest, 1024, max_depth=10))
+    
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import unittest
+import random
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routing_alg.routing as routing
+from routing_alg.wcett_lb import WCETTLBMetrics, compute_wcett_lb, get_metrics
+from routing_alg.routing_utils import find_all_paths
+from network import CongestionMonitor, reset_id_managers
+from networks import complex_network
+
+class TestWCETTLBMetrics(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        reset_id_managers()
+        self.network = complex_network.initialize_network()
+        self.igw_id = next(node_id for node_id, node in self.network.nodes.items() if node.type == "IGW")
+        routing.HopCountRouting().compute_routing_tables(self.network, [self.igw_id])
+        self.now = [0.0]
+        self.network.clock = lambda: self.now[0]
+
+    def edges_of(self, path):
+        return [self.network.get_edge_between_nodes(a, b) for a, b in zip(path, path[1:])]
+
+    def test_cached_metric_matches_live_metric(self):
+        # Put some packets in the queues so the queue-length term is non-zero
+        for node in list(self.network.nodes.values())[:4]:
+            for _ in range(3):
+                node.queue.put("packet")
+        metrics = WCETTLBMetrics(self.network)
+
+        for node_id in self.network.nodes:
+            for path in find_all_paths(self.network, node_id, self.igw_id):
+                if len(path) < 2:
+                    continue
+                expected = compute_wcett_lb(self.edges_of(path), 1024, self.network, path)
+                self.assertAlmostEqual(metrics.path_metric(path), expected, places=12)
+
+    def test_memoised_within_tick_and_refreshed_after(self):
+        metrics = WCETTLBMetrics(self.network)
+        path = find_all_paths(self.network, 7, self.igw_id)[0]
+
+        first = metrics.path_metric(path)
+        self.network.nodes[path[1]].queue.put("packet")
+        self.assertEqual(metrics.path_metric(path), first)
+        self.assertEqual(metrics.stats['path_evaluations'], 1)
+        self.assertEqual(metrics.report()['path_evaluations_saved'], 1)
+
+        # Time alone does not invalidate the snapshot, only the next monitor tick does
+        self.now[0] += 10.0
+        self.assertEqual(metrics.path_metric(path), first)
+        metrics.refresh()
+        self.assertGreater(metrics.path_metric(path), first)
+        self.assertEqual(metrics.stats['snapshots'], 2)
+
+    def test_monitor_tick_refreshes_snapshot_once(self):
+        algorithm = routing.WCETT_LB_POSTRouting()
+        algorithm.compute_routing_tables(self.network, [self.igw_id])
+        self.network.routing_algorithm = algorithm
+        monitor = CongestionMonitor(self.network)
+        for tick in range(1, 3):
+            monitor.tick()
+            metrics = get_metrics(algorithm, self.network)
+            self.assertEqual(metrics.stats['snapshots'], tick)
+
+    def test_next_hop_change_updates_traffic_concentration(self):
+        metrics = WCETTLBMetrics(self.network)
+        path = next(p for p in find_all_paths(self.network, 7, self.igw_id) if len(p) > 2)
+        before = metrics.path_metric(path)
+
+        metrics.next_hop_changed(None, path[1])
+        self.assertAlmostEqual(metrics.path_metric(path) - before, metrics.min_ett, places=12)
+
+    def test_get_metrics_is_shared_per_algorithm(self):
+        algorithm = routing.WCETT_LB_POSTRouting()
+        metrics = get_metrics(algorithm, self.network)
+        self.assertIs(get_metrics(algorithm, self.network), metrics)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import contextlib
+import gc
+import os
+
+@contextlib.contextmanager
+def gc_paused():
+    """Disable the cyclic garbage collector for the duration of the block
+
+    Building a network allocates many long-lived objects, collection passes
+    would only slow it down. The collector is re-enabled afterwards only if it
+    was enabled before.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+@contextlib.contextmanager
+def atomic_write(path, mode='w'):
+    """Open a temporary file that replaces path once the block completes
+
+    An interrupted or failed write never leaves a partial file at path, and the
+    temporary file is removed if the block raises.
+
+    Args:
+        path (str): Path of the file to write
+        mode (str, optional): Mode the temporary file is opened in. Defaults to 'w'.
+
+    Yields:
+        file: The open temporary file
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
@@ -1,4 +1,3 @@
-from pyvis.network import Network as pyNT
 import os
 
 def visualize_network(network, network_type="graph"):
@@ -14,6 +13,9 @@ def visualize_network(network, network_type="graph"):
         network (Graph): A network graph object containing nodes and edges.
         network_type (str): Type of network for the output filename (default: "graph")
     """
+    # Imported here, pyvis pulls in IPython and networkx and is only needed to draw
+    from pyvis.network import Network as pyNT
+    
     net = pyNT(height='750px', width='100%', bgcolor='#272A32', font_color='white')
 
     node_colors = {